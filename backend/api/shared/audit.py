@@ -1,12 +1,167 @@
-"""Ayudantes para registrar auditorías (placeholder sin persistencia)."""
+"""Auditoría persistente con escritura diferida por lotes.
+
+`record_audit` no inserta en la ruta crítica: encola el registro cuando la
+transacción actual confirma (una mutación revertida no deja rastro) y un hilo
+de fondo lo persiste con `bulk_create` al juntar `STAFFLINK_AUDIT_BATCH_SIZE`
+registros o cada `STAFFLINK_AUDIT_FLUSH_SECONDS`. El búfer se vacía al cerrar
+el proceso. Con `STAFFLINK_AUDIT_SYNC` (tests, scripts) se escribe en línea.
+El modelo destino lo define `STAFFLINK_AUDIT_MODEL`.
+"""
 
 from __future__ import annotations
 
+import atexit
+import json
 import logging
-from typing import Any
+import os
+import threading
+from typing import Any, Iterable
+
+from django.apps import apps
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, models, transaction
+from django.utils import timezone
 
 logger = logging.getLogger(__name__)
 
+# Tope de registros retenidos si la base no acepta escrituras
+MAX_PENDING = 50_000
+
+
+class _PayloadEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        if isinstance(o, models.Model):
+            return str(o.pk)
+        try:
+            return super().default(o)
+        except TypeError:
+            # Archivos u otros objetos: basta con su representación
+            return str(o)
+
+
+def snapshot_payload(payload: dict[str, Any] | None) -> dict[str, Any]:
+    """Copia serializable del payload tomada al momento de la mutación."""
+
+    return json.loads(json.dumps(payload or {}, cls=_PayloadEncoder))
+
+
+def _write(entries: list[dict[str, Any]]) -> None:
+    model = apps.get_model(settings.STAFFLINK_AUDIT_MODEL)
+    model.objects.bulk_create(
+        [model(**entry) for entry in entries],
+        batch_size=settings.STAFFLINK_AUDIT_BATCH_SIZE,
+    )
+
+
+class AuditBuffer:
+    """Búfer en memoria compartido por los hilos del proceso."""
+
+    def __init__(self) -> None:
+        self._reset()
+
+    def _reset(self) -> None:
+        self._lock = threading.Lock()
+        self._pending: list[dict[str, Any]] = []
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def add(self, entries: list[dict[str, Any]]) -> None:
+        with self._lock:
+            self._pending.extend(entries)
+            full = len(self._pending) >= settings.STAFFLINK_AUDIT_BATCH_SIZE
+            if self._thread is None or not self._thread.is_alive():
+                self._start()
+        if full:
+            self._wake.set()
+
+    def _start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="audit-writer", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(settings.STAFFLINK_AUDIT_FLUSH_SECONDS)
+            self._wake.clear()
+            self.flush()
+            # La conexión de este hilo no la cierra ningún request
+            connections.close_all()
+
+    def flush(self) -> int:
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return 0
+        try:
+            _write(batch)
+        except Exception:
+            logger.exception("No se pudo persistir %s auditorías", len(batch))
+            with self._lock:
+                # Reintentar en el siguiente ciclo sin crecer sin límite
+                self._pending[:0] = batch[: max(MAX_PENDING - len(self._pending), 0)]
+            return 0
+        return len(batch)
+
+    def close(self) -> None:
+        """Detiene el hilo y escribe lo pendiente (apagado ordenado)."""
+
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._stop.set()
+            self._wake.set()
+            thread.join(timeout=10)
+        self.flush()
+
+
+_buffer = AuditBuffer()
+atexit.register(_buffer.close)
+# Un worker hijo de fork no hereda el hilo: empezar con un búfer limpio
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_buffer._reset)
+
+
+def flush_audit() -> int:
+    """Fuerza la escritura de lo pendiente; devuelve cuántos registros escribió."""
+
+    return _buffer.flush()
+
+
+def _enqueue(entries: list[dict[str, Any]]) -> None:
+    if not entries:
+        return
+    if settings.STAFFLINK_AUDIT_SYNC:
+        transaction.on_commit(lambda: _write(entries))
+    else:
+        transaction.on_commit(lambda: _buffer.add(entries))
+
+
+def _entry(
+    *,
+    entity_type: str,
+    entity_id: str,
+    action: str,
+    actor_id: str | None = None,
+    actor_name: str = "",
+    payload: dict[str, Any] | None = None,
+    ip_address: str | None = None,
+    user_agent: str | None = None,
+) -> dict[str, Any]:
+    return {
+        "entity_type": entity_type,
+        "entity_id": str(entity_id),
+        "action": action,
+        "actor_id": str(actor_id or ""),
+        "actor_name": actor_name or "",
+        "payload": snapshot_payload(payload),
+        "ip_address": ip_address,
+        "user_agent": (user_agent or "")[:255],
+        "created_at": timezone.now(),
+    }
+
 
 def record_audit(
     *,
@@ -19,21 +174,23 @@ def record_audit(
     ip_address: str | None = None,
     user_agent: str | None = None,
 ) -> None:
-    """Registra auditoría en log (sin DB).
-
-    Si se requiere persistir, este helper se puede redirigir a un modelo/servicio.
-    """
-
-    logger.info(
-        "audit",
-        extra={
-            "entity_type": entity_type,
-            "entity_id": entity_id,
-            "action": action,
-            "actor_id": actor_id,
-            "actor_name": actor_name,
-            "payload": payload or {},
-            "ip_address": ip_address,
-            "user_agent": user_agent or "",
-        },
+    """Registra una mutación en la bitácora al confirmar la transacción."""
+
+    entry = _entry(
+        entity_type=entity_type,
+        entity_id=entity_id,
+        action=action,
+        actor_id=actor_id,
+        actor_name=actor_name,
+        payload=payload,
+        ip_address=ip_address,
+        user_agent=user_agent,
     )
+    logger.info("audit", extra={k: v for k, v in entry.items() if k != "created_at"})
+    _enqueue([entry])
+
+
+def record_audit_many(entries: Iterable[dict[str, Any]]) -> None:
+    """Registra varias auditorías de una vez (mismos campos que `record_audit`)."""
+
+    _enqueue([_entry(**entry) for entry in entries])
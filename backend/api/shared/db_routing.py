@@ -0,0 +1,107 @@
+"""Ruteo de lecturas pesadas a una réplica de PostgreSQL.
+
+Las lecturas van al primario salvo que el código lo pida explícitamente:
+
+- `with read_replica():` envuelve una lectura que se evalúa completa dentro
+  del bloque (listados paginados).
+- `qs.using(read_db())` fija el alias en querysets que se evalúan después
+  de salir del view, como las respuestas en streaming.
+
+`ReplicaStickinessMiddleware` fija al primario, durante unos segundos, al
+usuario que acaba de escribir (cookie de vida corta), para que no vea datos
+viejos por el retraso de la réplica justo después de un PATCH. Sin la base
+`replica` configurada todo sigue yendo al primario.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_ALIAS = "replica"
+STICKY_HEADER = "X-Stafflink-Read-Primary"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+_reading: ContextVar[bool] = ContextVar("stafflink_read_replica", default=False)
+_pinned: ContextVar[bool] = ContextVar("stafflink_pinned_primary", default=False)
+
+
+def replica_configured() -> bool:
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def read_db() -> str:
+    """Alias para una lectura que tolera el retraso de la réplica."""
+
+    if not replica_configured() or _pinned.get():
+        return DEFAULT_DB_ALIAS
+    # Dentro de una transacción se lee lo que la propia transacción escribió
+    if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+        return DEFAULT_DB_ALIAS
+    return REPLICA_ALIAS
+
+
+@contextmanager
+def read_replica() -> Iterator[str]:
+    """Manda a la réplica las lecturas del ORM hechas dentro del bloque."""
+
+    token = _reading.set(True)
+    try:
+        yield read_db()
+    finally:
+        _reading.reset(token)
+
+
+@contextmanager
+def pin_primary(pinned: bool = True) -> Iterator[None]:
+    token = _pinned.set(pinned)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+class ReplicaRouter:
+    """Router de Django: escrituras y migraciones siempre al primario."""
+
+    def db_for_read(self, model, **hints) -> str | None:
+        if _reading.get():
+            return read_db()
+        return None
+
+    def db_for_write(self, model, **hints) -> str:
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool:
+        # La réplica es una copia del primario: las relaciones son válidas
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints) -> bool | None:
+        return False if db == REPLICA_ALIAS else None
+
+
+class ReplicaStickinessMiddleware:
+    """Lee del primario durante unos segundos después de una escritura."""
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request):
+        cookie = settings.STAFFLINK_REPLICA_STICKY_COOKIE
+        pinned = cookie in request.COOKIES or bool(request.headers.get(STICKY_HEADER))
+        with pin_primary(pinned):
+            response = self.get_response(request)
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            response.set_cookie(
+                cookie,
+                "1",
+                max_age=settings.STAFFLINK_REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite="Lax",
+                secure=settings.SESSION_COOKIE_SECURE,
+            )
+        return response
@@ -0,0 +1,40 @@
+"""Locks distribuidos apoyados en la base de datos."""
+
+from __future__ import annotations
+
+import hashlib
+from contextlib import contextmanager
+from typing import Iterator
+
+from django.db import connections
+
+
+def _lock_key(name: str) -> int:
+    digest = hashlib.sha256(name.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big", signed=True)
+
+
+@contextmanager
+def advisory_lock(name: str, *, using: str = "default") -> Iterator[bool]:
+    """Intenta tomar un advisory lock de PostgreSQL sin bloquear.
+
+    Entrega True si el lock quedó tomado por esta conexión y False si otro
+    nodo lo tiene. En motores sin advisory locks (SQLite en desarrollo) se
+    asume un único nodo y siempre entrega True.
+    """
+
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        yield True
+        return
+
+    key = _lock_key(name)
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_try_advisory_lock(%s)", [key])
+        acquired = bool(cursor.fetchone()[0])
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_unlock(%s)", [key])
@@ -0,0 +1,291 @@
+"""Lectura y escritura de XLSX en streaming sin dependencias externas.
+
+La escritura genera un libro con una sola hoja usando celdas `inlineStr`, de
+modo que no hace falta mantener una tabla de strings compartidos en memoria.
+El ZIP se escribe sobre un buffer no posicionable que se vacía tras cada
+bloque de filas: la memoria se mantiene constante sin importar cuántas filas
+haya.
+
+La lectura recorre la primera hoja con `iterparse` y libera cada fila tras
+emitirla; solo la tabla de strings compartidos se carga completa.
+"""
+
+from __future__ import annotations
+
+import io
+import re
+import zipfile
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Iterable, Iterator, Sequence
+from xml.etree.ElementTree import iterparse
+from xml.sax.saxutils import escape
+
+XLSX_CONTENT_TYPE = (
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+)
+FLUSH_EVERY_ROWS = 500
+
+_MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+# Excel admite hasta la columna XFD (índice 16383): tres letras como máximo
+_CELL_REF = re.compile(r"([A-Z]{1,3})[0-9]+$")
+MAX_COLUMN_INDEX = 16383
+# La tabla de strings compartidos se carga completa: se acota su tamaño
+MAX_SHARED_STRINGS = 1_000_000
+MAX_SHARED_STRINGS_CHARS = 64 * 1024 * 1024
+
+_ILLEGAL_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" '
+    'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    "</Types>"
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    "</Relationships>"
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    "</Relationships>"
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    "</workbook>"
+)
+_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    "<sheetData>"
+)
+_SHEET_TAIL = "</sheetData></worksheet>"
+
+
+class _Sink(io.RawIOBase):
+    """Buffer de solo escritura y no posicionable que se vacía bajo demanda."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:  # type: ignore[override]
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _column_letter(index: int) -> str:
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _cell(ref: str, value: Any) -> str:
+    if value is None or value == "":
+        return ""
+    if isinstance(value, bool):
+        return f'<c r="{ref}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float, Decimal)):
+        return f'<c r="{ref}"><v>{value}</v></c>'
+    if isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    text = escape(_ILLEGAL_XML_CHARS.sub("", str(value)))
+    return (
+        f'<c r="{ref}" t="inlineStr">'
+        f'<is><t xml:space="preserve">{text}</t></is></c>'
+    )
+
+
+def _row(number: int, values: Sequence[Any], letters: list[str]) -> str:
+    while len(letters) < len(values):
+        letters.append(_column_letter(len(letters)))
+    cells = "".join(
+        _cell(f"{letters[idx]}{number}", value) for idx, value in enumerate(values)
+    )
+    return f'<row r="{number}">{cells}</row>'
+
+
+def iter_xlsx(
+    rows: Iterable[Sequence[Any]], *, sheet_name: str = "Hoja1"
+) -> Iterator[bytes]:
+    """Devuelve el archivo XLSX como una secuencia de bloques de bytes."""
+
+    sink = _Sink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        archive.writestr("_rels/.rels", _ROOT_RELS)
+        archive.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        archive.writestr(
+            "xl/workbook.xml", _WORKBOOK.format(name=escape(sheet_name[:31]))
+        )
+        yield sink.drain()
+
+        letters: list[str] = []
+        with archive.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write(_SHEET_HEAD.encode("utf-8"))
+            pending: list[str] = []
+            for number, values in enumerate(rows, start=1):
+                pending.append(_row(number, values, letters))
+                if len(pending) >= FLUSH_EVERY_ROWS:
+                    sheet.write("".join(pending).encode("utf-8"))
+                    pending.clear()
+                    yield sink.drain()
+            sheet.write(("".join(pending) + _SHEET_TAIL).encode("utf-8"))
+        yield sink.drain()
+    yield sink.drain()
+
+
+class XlsxReadError(ValueError):
+    """El archivo no es un XLSX legible."""
+
+
+def _column_index(ref: str) -> int:
+    """Índice de columna de una referencia `A1`; -1 si la celda no la trae."""
+
+    if not ref:
+        return -1
+    match = _CELL_REF.match(ref)
+    if not match:
+        raise XlsxReadError(f"Referencia de celda inválida: {ref[:20]}")
+    index = 0
+    for char in match.group(1):
+        index = index * 26 + (ord(char) - 64)
+    if index - 1 > MAX_COLUMN_INDEX:
+        raise XlsxReadError(f"Referencia de celda fuera de rango: {ref[:20]}")
+    return index - 1
+
+
+def _text(element) -> str:
+    """Concatena los `<t>` de un `<si>`/`<is>` (texto enriquecido incluido)."""
+
+    return "".join(node.text or "" for node in element.iter(f"{_MAIN_NS}t"))
+
+
+def _shared_strings(archive: zipfile.ZipFile) -> list[str]:
+    if "xl/sharedStrings.xml" not in archive.namelist():
+        return []
+    strings: list[str] = []
+    chars = 0
+    with archive.open("xl/sharedStrings.xml") as handle:
+        for _, element in iterparse(handle):
+            if element.tag == f"{_MAIN_NS}si":
+                strings.append(_text(element))
+                chars += len(strings[-1])
+                element.clear()
+                if (
+                    len(strings) > MAX_SHARED_STRINGS
+                    or chars > MAX_SHARED_STRINGS_CHARS
+                ):
+                    raise XlsxReadError("El libro tiene demasiados textos.")
+    return strings
+
+
+def _first_sheet_path(archive: zipfile.ZipFile) -> str:
+    try:
+        with archive.open("xl/workbook.xml") as handle:
+            sheet = next(
+                element
+                for _, element in iterparse(handle)
+                if element.tag == f"{_MAIN_NS}sheet"
+            )
+        rel_id = sheet.get(f"{_REL_NS}id")
+        with archive.open("xl/_rels/workbook.xml.rels") as handle:
+            for _, element in iterparse(handle):
+                if element.tag == f"{_PKG_REL_NS}Relationship" and (
+                    element.get("Id") == rel_id
+                ):
+                    target = element.get("Target", "").lstrip("/")
+                    return target if target.startswith("xl/") else f"xl/{target}"
+    except (KeyError, StopIteration):
+        pass
+    return "xl/worksheets/sheet1.xml"
+
+
+def _cell_value(cell, shared: list[str]) -> Any:
+    kind = cell.get("t", "n")
+    if kind == "inlineStr":
+        inline = cell.find(f"{_MAIN_NS}is")
+        return _text(inline) if inline is not None else ""
+    raw = cell.findtext(f"{_MAIN_NS}v")
+    if raw is None:
+        return None
+    if kind == "s":
+        try:
+            return shared[int(raw)]
+        except (IndexError, ValueError) as exc:
+            raise XlsxReadError("Texto compartido inexistente.") from exc
+    if kind == "b":
+        return raw == "1"
+    if kind in {"str", "e"}:
+        return raw
+    number = float(raw)
+    return int(number) if number.is_integer() else number
+
+
+def iter_xlsx_rows(file_obj) -> Iterator[list[Any]]:
+    """Devuelve las filas de la primera hoja como listas de valores.
+
+    Las celdas vacías intermedias se rellenan con None según su referencia;
+    los números se devuelven como int/float (las fechas llegan como número
+    serial de Excel).
+    """
+
+    try:
+        archive = zipfile.ZipFile(file_obj)
+    except zipfile.BadZipFile as exc:
+        raise XlsxReadError("El archivo no es un XLSX válido.") from exc
+    with archive:
+        shared = _shared_strings(archive)
+        try:
+            handle = archive.open(_first_sheet_path(archive))
+        except KeyError as exc:
+            raise XlsxReadError("El libro no tiene hojas.") from exc
+        with handle:
+            sheet_data = None
+            for event, element in iterparse(handle, events=("start", "end")):
+                if event == "start":
+                    if element.tag == f"{_MAIN_NS}sheetData":
+                        sheet_data = element
+                    continue
+                if element.tag != f"{_MAIN_NS}row":
+                    continue
+                values: list[Any] = []
+                for cell in element.iter(f"{_MAIN_NS}c"):
+                    index = _column_index(cell.get("r", ""))
+                    if index < 0:
+                        index = len(values)
+                    values.extend([None] * (index - len(values)))
+                    values.append(_cell_value(cell, shared))
+                # Soltar la fila ya emitida para no acumular el árbol
+                if sheet_data is not None:
+                    sheet_data.remove(element)
+                yield values
@@ -49,6 +49,13 @@ class CandidateDocumentsInline(admin.StackedInline):
     extra = 0
 
 
+class CandidateDocumentFileInline(admin.TabularInline):
+    model = models.CandidateDocumentFile
+    extra = 0
+    can_delete = False
+    readonly_fields = ("kind", "filename", "content_type", "size", "blob", "created_at")
+
+
 class CandidateProcessInline(admin.StackedInline):
     model = models.CandidateProcess
     extra = 0
@@ -81,6 +88,29 @@ class CandidateAdmin(admin.ModelAdmin):
     autocomplete_fields = ("link",)
     inlines = [
         CandidateDocumentsInline,
+        CandidateDocumentFileInline,
         CandidateProcessInline,
         CandidateAssignmentInline,
     ]
+
+
+@admin.register(models.AuditLog)
+class AuditLogAdmin(admin.ModelAdmin):
+    list_display = ("created_at", "entity_type", "entity_id", "action", "actor_id")
+    list_filter = ("entity_type", "action")
+    search_fields = ("entity_id", "actor_id", "actor_name")
+    readonly_fields = [field.name for field in models.AuditLog._meta.fields]
+
+
+@admin.register(models.OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = ("id", "event_type", "aggregate_id", "status", "attempts")
+    list_filter = ("status", "event_type")
+    search_fields = ("aggregate_id",)
+
+
+@admin.register(models.ConvocatoriaArchive)
+class ConvocatoriaArchiveAdmin(admin.ModelAdmin):
+    list_display = ("link", "candidates", "size", "archived_at")
+    search_fields = ("link__slug", "link__titulo")
+    readonly_fields = [field.name for field in models.ConvocatoriaArchive._meta.fields]
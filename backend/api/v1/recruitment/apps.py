@@ -6,3 +6,8 @@ class RecruitmentConfig(AppConfig):
     name = "api.v1.recruitment"
     label = "recruitment"
     verbose_name = "Recruitment"
+
+    def ready(self):
+        from . import signals
+
+        signals.load_handler_modules()
@@ -0,0 +1 @@
+"""Comandos de administración del dominio de reclutamiento."""
@@ -0,0 +1,81 @@
+"""Pasa al almacenamiento frío los postulantes de convocatorias cerradas."""
+
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework import serializers
+
+from api.shared.locks import advisory_lock
+from api.v1.recruitment import models
+from api.v1.recruitment.services import archive_service
+
+LOCK_NAME = "recruitment:archive_convocatorias"
+
+
+class Command(BaseCommand):
+    help = (
+        "Archiva (JSON Lines comprimido en el storage) los postulantes de las "
+        "convocatorias expiradas o revocadas sin cambios recientes, o los "
+        "restaura con --restore."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-days",
+            type=int,
+            default=settings.STAFFLINK_ARCHIVE_AFTER_DAYS,
+        )
+        parser.add_argument(
+            "--limit", type=int, default=None, help="Máximo de convocatorias."
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Solo lista las convocatorias que se archivarían.",
+        )
+        parser.add_argument(
+            "--restore",
+            metavar="LINK_ID",
+            help="Devuelve a las tablas los postulantes de esta convocatoria.",
+        )
+
+    def handle(self, *args, **options):
+        if options["restore"]:
+            self._restore(options["restore"])
+            return
+        pending = archive_service.archivable(older_than_days=options["older_than_days"])
+        if options["limit"]:
+            pending = pending[: options["limit"]]
+        if options["dry_run"]:
+            for link in pending:
+                self.stdout.write(f"{link.pk} {link.slug} ({link.estado})")
+            return
+        with advisory_lock(LOCK_NAME) as acquired:
+            if not acquired:
+                self.stdout.write("Otro nodo está archivando convocatorias; se omite.")
+                return
+            archived = candidates = 0
+            for link in list(pending):
+                try:
+                    archive = archive_service.archive_convocatoria(convocatoria=link)
+                except serializers.ValidationError as exc:
+                    self.stderr.write(f"{link.pk}: {exc.detail}")
+                    continue
+                archived += 1
+                candidates += archive.candidates
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Convocatorias archivadas: {archived}, postulantes: {candidates}"
+            )
+        )
+
+    def _restore(self, link_id: str) -> None:
+        link = models.Link.objects.filter(pk=link_id).first()
+        if link is None:
+            raise CommandError(f"No existe la convocatoria {link_id}.")
+        try:
+            restored = archive_service.restore_convocatoria(convocatoria=link)
+        except serializers.ValidationError as exc:
+            raise CommandError(str(exc.detail)) from exc
+        self.stdout.write(self.style.SUCCESS(f"Postulantes restaurados: {restored}"))
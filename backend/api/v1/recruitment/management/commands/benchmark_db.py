@@ -0,0 +1,194 @@
+"""Benchmark de carga de la configuración de conexiones a la base.
+
+Ejecuta en proceso, con varios hilos y el cliente de pruebas de Django, dos
+escenarios que dependen del costo de conexión: la grilla de postulantes
+(`GET /candidates/`) y la postulación pública (`POST /public/candidates`).
+Cada request pasa por el ciclo completo (middlewares y `request_finished`),
+así que una conexión nueva por request, una persistente (`CONN_MAX_AGE`) o
+una prestada del pool (`POSTGRES_POOL`) se notan en el resultado.
+
+Comparar corriendo el comando con cada configuración, por ejemplo:
+
+    POSTGRES_CONN_MAX_AGE=0 python manage.py benchmark_db
+    POSTGRES_CONN_MAX_AGE=60 python manage.py benchmark_db
+    POSTGRES_POOL=1 python manage.py benchmark_db
+
+Crea una campaña y una convocatoria propias y las borra al terminar (la
+auditoría de las postulaciones se conserva).
+Pensado para staging: escribe en la base configurada.
+"""
+
+from __future__ import annotations
+
+import statistics
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from itertools import count
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from api.v1.recruitment import models
+
+SCENARIOS = ("list", "submit")
+
+
+class Command(BaseCommand):
+    help = "Mide throughput y latencia de la grilla y la postulación pública."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scenario", choices=[*SCENARIOS, "all"], default="all")
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=200,
+            help="Postulantes creados antes de medir la grilla.",
+        )
+
+    def handle(self, *args, **options):
+        db = settings.DATABASES["default"]
+        pool = db.get("OPTIONS", {}).get("pool")
+        self.stdout.write(
+            f"Base: {db['ENGINE'].rsplit('.', 1)[-1]}, "
+            f"pool={'max_size=%s' % pool['max_size'] if pool else 'no'}, "
+            f"CONN_MAX_AGE={db.get('CONN_MAX_AGE', 0)}, "
+            f"hilos={options['concurrency']}"
+        )
+        link = self._create_link()
+        documents = count(70_000_000)
+        try:
+            # Las cabeceras de prueba y el host del cliente solo valen aquí
+            with override_settings(
+                STAFFLINK_ALLOW_DEBUG_HEADERS=True,
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+            ):
+                scenarios = (
+                    SCENARIOS if options["scenario"] == "all" else [options["scenario"]]
+                )
+                if "list" in scenarios:
+                    self._seed(link, options["seed"], documents)
+                for scenario in scenarios:
+                    request = self._build(scenario, link, documents)
+                    self._report(scenario, self._run(request, options))
+        finally:
+            self._cleanup(link)
+
+    def _create_link(self) -> models.Link:
+        code = f"BENCH{uuid.uuid4().hex[:6].upper()}"
+        campaign = models.Campaign.objects.create(codigo=code, nombre=code)
+        return models.Link.objects.create(
+            campaign=campaign,
+            slug=code.lower(),
+            titulo="Benchmark",
+            estado=models.Link.Estado.ACTIVO,
+            expires_at=timezone.now() + timedelta(hours=1),
+        )
+
+    def _cleanup(self, link: models.Link) -> None:
+        candidates = models.Candidate.objects.filter(link=link)
+        ids = [str(pk) for pk in candidates.values_list("pk", flat=True)]
+        # Los eventos del benchmark no deben llegar a los handlers
+        models.OutboxEvent.objects.filter(
+            aggregate_type="candidate", aggregate_id__in=ids
+        ).delete()
+        candidates.delete()
+        models.Link.objects.filter(pk=link.pk).delete()
+        models.Campaign.objects.filter(pk=link.campaign_id).delete()
+
+    def _seed(self, link: models.Link, total: int, documents) -> None:
+        models.Candidate.objects.bulk_create(
+            [
+                models.Candidate(link=link, **self._applicant(documents))
+                for _ in range(total)
+            ],
+            batch_size=500,
+        )
+
+    def _applicant(self, documents) -> dict:
+        return {
+            "tipo_documento": models.Candidate.DocumentType.DNI,
+            "numero_documento": str(next(documents)),
+            "apellido_paterno": "BENCH",
+            "apellido_materno": "BENCH",
+            "nombres_completos": "POSTULANTE BENCH",
+            "telefono": "999000111",
+            "email": "bench@example.com",
+        }
+
+    def _build(self, scenario: str, link: models.Link, documents):
+        lock = threading.Lock()
+        if scenario == "list":
+            url = reverse("candidates-list")
+
+            def request(client: Client) -> int:
+                return client.get(
+                    url,
+                    {"convocatoria_id": str(link.pk)},
+                    HTTP_X_STAFFLINK_PERMISSIONS="candidates.read",
+                ).status_code
+
+            return request
+
+        url = reverse("public:public-candidate")
+
+        def request(client: Client) -> int:
+            with lock:
+                payload = {"convocatoria_slug": link.slug, **self._applicant(documents)}
+            return client.post(
+                url, payload, content_type="application/json"
+            ).status_code
+
+        return request
+
+    def _run(self, request, options) -> dict:
+        total = options["requests"]
+        workers = options["concurrency"]
+        latencies: list[float] = []
+        errors = 0
+        lock = threading.Lock()
+
+        def worker(quota: int) -> None:
+            nonlocal errors
+            client = Client(raise_request_exception=False)
+            try:
+                for _ in range(quota):
+                    started = time.perf_counter()
+                    status = request(client)
+                    elapsed = time.perf_counter() - started
+                    with lock:
+                        latencies.append(elapsed)
+                        errors += status >= 400
+            finally:
+                # Devuelve/cierra la conexión del hilo antes de que termine
+                connections.close_all()
+
+        quotas = [total // workers + (i < total % workers) for i in range(workers)]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(worker, quotas))
+        wall = time.perf_counter() - started
+        return {"latencies": sorted(latencies), "errors": errors, "wall": wall}
+
+    def _report(self, scenario: str, result: dict) -> None:
+        latencies = result["latencies"]
+        if not latencies:
+            return
+
+        def pct(p: float) -> float:
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+        self.stdout.write(
+            f"{scenario:>6}: {len(latencies) / result['wall']:.1f} req/s, "
+            f"p50 {statistics.median(latencies) * 1000:.1f} ms, "
+            f"p95 {pct(0.95):.1f} ms, p99 {pct(0.99):.1f} ms, "
+            f"errores {result['errors']}"
+        )
@@ -0,0 +1,30 @@
+"""Expira en bloque las convocatorias cuyo `expires_at` ya pasó."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from api.shared.locks import advisory_lock
+from api.v1.recruitment.services import convocatoria_service
+
+LOCK_NAME = "recruitment:expire_convocatorias"
+
+
+class Command(BaseCommand):
+    help = (
+        "Marca como expiradas las convocatorias activas vencidas. Pensado para "
+        "ejecutarse desde cron en varios nodos: solo uno trabaja a la vez."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        with advisory_lock(LOCK_NAME) as acquired:
+            if not acquired:
+                self.stdout.write("Otro nodo está expirando convocatorias; se omite.")
+                return
+            expired = convocatoria_service.expire_due(
+                batch_size=options["batch_size"]
+            )
+        self.stdout.write(self.style.SUCCESS(f"Convocatorias expiradas: {expired}"))
@@ -0,0 +1,41 @@
+"""Genera un lote Smart Boleta en streaming desde la base de datos."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.v1.recruitment.services import export_service
+
+
+class Command(BaseCommand):
+    help = (
+        "Exporta los postulantes de una campaña y/o periodo al formato Smart "
+        "en STAFFLINK_EXPORT_OUTPUT_DIR."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--campaign", dest="campaign_id")
+        parser.add_argument("--periodo")
+        parser.add_argument("--convocatoria", dest="convocatoria_id")
+        parser.add_argument("--batch-code")
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="Solo postulantes modificados desde el último lote del destino.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["campaign_id"] and not options["periodo"]:
+            raise CommandError("Indique --campaign o --periodo.")
+        result = export_service.export_smart_batch(
+            campaign_id=options["campaign_id"],
+            periodo=options["periodo"],
+            convocatoria_id=options["convocatoria_id"],
+            batch_code=options["batch_code"],
+            incremental=options["incremental"],
+        )
+        summary = (
+            f"{result.batch_code}: {result.rows} filas, {result.bytes} bytes "
+            f"(sha256 {result.sha256}) -> {result.file_path}"
+        )
+        self.stdout.write(self.style.SUCCESS(summary))
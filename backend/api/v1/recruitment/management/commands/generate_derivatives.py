@@ -0,0 +1,51 @@
+"""Genera miniaturas y vistas previas de blobs que aún no las tienen."""
+
+from __future__ import annotations
+
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from api.v1.recruitment import models
+from api.v1.recruitment.services import derivative_service
+from integrations.imaging.derivatives import IMAGE_TYPES, PDF_TYPE, ImagingError
+
+
+class Command(BaseCommand):
+    help = (
+        "Completa las derivadas de documentos subidos antes de activar el "
+        "pipeline o cuyo evento falló. El render corre en el pool de procesos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit", type=int, default=None, help="Máximo de blobs a procesar."
+        )
+
+    def handle(self, *args, **options):
+        pending = (
+            models.StoredBlob.objects.filter(
+                content_type__in=[*IMAGE_TYPES, PDF_TYPE],
+                document_files__isnull=False,
+            )
+            .annotate(count=Count("derivatives", distinct=True))
+            .filter(count__lt=len(derivative_service.SPECS))
+            .distinct()
+            .order_by("created_at")
+        )
+        if options["limit"]:
+            pending = pending[: options["limit"]]
+        done = failed = 0
+        try:
+            for blob in pending.iterator(chunk_size=100):
+                try:
+                    derivative_service.generate_derivatives(blob)
+                except (ImagingError, FutureTimeout) as exc:
+                    failed += 1
+                    self.stderr.write(f"{blob.sha256}: {exc}")
+                else:
+                    done += 1
+        finally:
+            derivative_service.shutdown_pool()
+        self.stdout.write(f"Blobs procesados: {done}, con error: {failed}")
@@ -0,0 +1,64 @@
+"""Importa postulantes desde el Excel operativo (CSV o XLSX)."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.v1.recruitment import models
+from api.v1.recruitment.services import candidate_import_service
+from api.v1.recruitment.services.exceptions import CandidateError
+
+
+class Command(BaseCommand):
+    help = (
+        "Carga postulantes a una convocatoria desde un CSV/XLSX. Las filas "
+        "válidas se crean por lotes; las demás se listan en el reporte."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--convocatoria", required=True, dest="convocatoria_id")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=candidate_import_service.IMPORT_BATCH_SIZE,
+        )
+        parser.add_argument("--actor", help="UUID del usuario que importa.")
+        parser.add_argument(
+            "--report", help="Ruta donde guardar el reporte completo en JSON."
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        file_format = path.suffix.lstrip(".").lower()
+        link = models.Link.objects.filter(pk=options["convocatoria_id"]).first()
+        if link is None:
+            raise CommandError("Convocatoria no encontrada.")
+        try:
+            with path.open("rb") as handle:
+                report = candidate_import_service.import_candidates(
+                    link=link,
+                    file_obj=handle,
+                    file_format=file_format,
+                    actor_id=options["actor"],
+                    batch_size=options["batch_size"],
+                )
+        except (OSError, CandidateError) as exc:
+            raise CommandError(str(exc)) from exc
+
+        for line in candidate_import_service.summarize_errors(report.errors):
+            self.stderr.write(line)
+        if options["report"]:
+            Path(options["report"]).write_text(
+                json.dumps(report.__dict__, ensure_ascii=False, indent=2),
+                encoding="utf-8",
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Filas: {report.total}, creadas: {report.created}, "
+                f"con error: {len(report.errors)}"
+            )
+        )
@@ -0,0 +1,29 @@
+"""Recalcula los contadores por convocatoria (postulantes, completos, actividad)."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from api.v1.recruitment.services import convocatoria_service
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula en bloque los contadores de link_counter a partir de los "
+        "postulantes registrados."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--link",
+            action="append",
+            dest="link_ids",
+            help="ID de convocatoria a reconciliar (se puede repetir).",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        written = convocatoria_service.reconcile_counters(
+            link_ids=options["link_ids"], batch_size=options["batch_size"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Contadores actualizados: {written}"))
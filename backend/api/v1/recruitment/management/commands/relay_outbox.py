@@ -0,0 +1,49 @@
+"""Relay del outbox de eventos de dominio."""
+
+from __future__ import annotations
+
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from api.v1.recruitment.services import outbox_service
+
+
+class Command(BaseCommand):
+    help = (
+        "Entrega los eventos del outbox a los handlers registrados. Varios "
+        "relays pueden correr en paralelo: cada lote se toma con SKIP LOCKED."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once", action="store_true", help="Vacía la cola y termina."
+        )
+        parser.add_argument(
+            "--sleep", type=float, default=1.0, help="Segundos entre sondeos."
+        )
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument(
+            "--purge-days",
+            type=int,
+            default=None,
+            help="Además, borra los eventos publicados hace más de N días.",
+        )
+
+    def handle(self, *args, **options):
+        if options["purge_days"] is not None:
+            purged = outbox_service.purge_published(
+                older_than=timedelta(days=options["purge_days"])
+            )
+            self.stdout.write(f"Eventos purgados: {purged}")
+        while True:
+            result = outbox_service.relay_pending(batch_size=options["batch_size"])
+            if result.total:
+                self.stdout.write(
+                    f"Publicados: {result.published}, reintentos: {result.retried}, "
+                    f"fallidos: {result.failed}"
+                )
+            if options["once"]:
+                break
+            time.sleep(options["sleep"])
@@ -0,0 +1,34 @@
+"""Worker de exportaciones en segundo plano."""
+
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.v1.recruitment.services import export_job_service
+
+
+class Command(BaseCommand):
+    help = (
+        "Procesa la cola de exportaciones. Varios workers pueden correr en "
+        "paralelo: cada job se toma con SKIP LOCKED y un job cuyo worker dejó "
+        "de latir se retoma desde su último checkpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once", action="store_true", help="Vacía la cola y termina."
+        )
+        parser.add_argument(
+            "--sleep", type=float, default=5.0, help="Segundos entre sondeos."
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            processed = export_job_service.run_pending()
+            if processed:
+                self.stdout.write(f"Jobs procesados: {processed}")
+            if options["once"]:
+                break
+            time.sleep(options["sleep"])
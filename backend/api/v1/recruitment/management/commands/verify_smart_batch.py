@@ -0,0 +1,35 @@
+"""Verifica un lote Smart Boleta contra su manifiesto."""
+
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from integrations.smart.client import SmartBatchError, SmartClient
+
+
+class Command(BaseCommand):
+    help = (
+        "Relee en streaming uno o más lotes de STAFFLINK_EXPORT_OUTPUT_DIR y "
+        "comprueba filas, tamaño y SHA-256 contra el manifiesto (detecta "
+        "archivos truncados antes de enviarlos a Smart)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("batch_codes", nargs="+")
+
+    def handle(self, *args, **options):
+        client = SmartClient(output_dir=settings.STAFFLINK_EXPORT_OUTPUT_DIR)
+        failed = 0
+        for batch_code in options["batch_codes"]:
+            try:
+                manifest = client.verify_batch(batch_code)
+            except SmartBatchError as exc:
+                failed += 1
+                self.stderr.write(self.style.ERROR(str(exc)))
+                continue
+            self.stdout.write(
+                self.style.SUCCESS(f"{batch_code}: OK ({manifest.rows} filas)")
+            )
+        if failed:
+            raise CommandError(f"{failed} lote(s) no superaron la verificación.")
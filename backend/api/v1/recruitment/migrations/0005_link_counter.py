@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_counters(apps, schema_editor):
+    Link = apps.get_model("recruitment", "Link")
+    LinkCounter = apps.get_model("recruitment", "LinkCounter")
+    totals = dict(
+        Link.objects.annotate(total=models.Count("candidates")).values_list(
+            "id", "total"
+        )
+    )
+    LinkCounter.objects.bulk_create(
+        [
+            LinkCounter(link_id=link_id, postulantes=total)
+            for link_id, total in totals.items()
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recruitment", "0004_convocatoria_encargados"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LinkCounter",
+            fields=[
+                (
+                    "link",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="counter",
+                        serialize=False,
+                        to="recruitment.link",
+                    ),
+                ),
+                ("postulantes", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "link_counter",
+            },
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
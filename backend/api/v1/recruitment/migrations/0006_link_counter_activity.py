@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from django.db import migrations, models
+
+
+def backfill_activity(apps, schema_editor):
+    Candidate = apps.get_model("recruitment", "Candidate")
+    LinkCounter = apps.get_model("recruitment", "LinkCounter")
+    rows = Candidate.objects.values("link_id").annotate(
+        completos=models.Count(
+            "id", filter=models.Q(documents__status="completo")
+        ),
+        ultima=models.Max("created_at"),
+    )
+    for row in rows.iterator():
+        LinkCounter.objects.filter(link_id=row["link_id"]).update(
+            completos=row["completos"], ultima_postulacion_at=row["ultima"]
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recruitment", "0005_link_counter"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="linkcounter",
+            name="completos",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="linkcounter",
+            name="ultima_postulacion_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_activity, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recruitment", "0006_link_counter_activity"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="link",
+            index=models.Index(
+                fields=["estado", "expires_at"], name="link_estado_expires_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import uuid
+
+import django.utils.timezone
+from django.db import migrations, models
+
+import api.v1.recruitment.models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recruitment", "0007_link_estado_expires_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExportJob",
+            fields=[
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, editable=False
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("smart", "Smart Boleta"),
+                            ("candidates", "Grilla de postulantes"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "filters",
+                    models.JSONField(
+                        blank=True, default=api.v1.recruitment.models._empty_dict
+                    ),
+                ),
+                ("signature", models.CharField(db_index=True, max_length=64)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pendiente", "Pendiente"),
+                            ("en_proceso", "En proceso"),
+                            ("completado", "Completado"),
+                            ("fallido", "Fallido"),
+                        ],
+                        default="pendiente",
+                        max_length=20,
+                    ),
+                ),
+                ("cursor_created_at", models.DateTimeField(blank=True, null=True)),
+                ("cursor_id", models.UUIDField(blank=True, null=True)),
+                ("rows_written", models.PositiveIntegerField(default=0)),
+                ("parts", models.PositiveIntegerField(default=0)),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+                ("heartbeat_at", models.DateTimeField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                ("error", models.TextField(blank=True, default="")),
+                ("created_by", models.UUIDField(blank=True, null=True)),
+            ],
+            options={
+                "db_table": "export_job",
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["status", "created_at"], name="export_job_queue_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        condition=models.Q(("status__in", ["pendiente", "en_proceso"])),
+                        fields=("signature",),
+                        name="unique_active_export_signature",
+                    )
+                ],
+            },
+        ),
+    ]
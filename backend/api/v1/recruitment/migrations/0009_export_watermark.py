@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recruitment", "0008_export_job"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExportWatermark",
+            fields=[
+                (
+                    "target",
+                    models.CharField(max_length=255, primary_key=True, serialize=False),
+                ),
+                ("watermark_at", models.DateTimeField()),
+                (
+                    "last_batch_code",
+                    models.CharField(blank=True, default="", max_length=120),
+                ),
+                ("last_rows", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "export_watermark",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="candidate",
+            index=models.Index(fields=["updated_at"], name="candidate_updated_at_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="candidateassignment",
+            index=models.Index(fields=["updated_at"], name="candidate_assign_upd_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="candidateprocess",
+            index=models.Index(fields=["updated_at"], name="candidate_process_upd_idx"),
+        ),
+    ]
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import api.v1.recruitment.models
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recruitment", "0009_export_watermark"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AuditLog",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("entity_type", models.CharField(max_length=50)),
+                ("entity_id", models.CharField(max_length=64)),
+                ("action", models.CharField(max_length=50)),
+                ("actor_id", models.CharField(blank=True, default="", max_length=64)),
+                (
+                    "actor_name",
+                    models.CharField(blank=True, default="", max_length=255),
+                ),
+                (
+                    "payload",
+                    models.JSONField(
+                        blank=True, default=api.v1.recruitment.models._empty_dict
+                    ),
+                ),
+                ("ip_address", models.GenericIPAddressField(blank=True, null=True)),
+                (
+                    "user_agent",
+                    models.CharField(blank=True, default="", max_length=255),
+                ),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "db_table": "audit_log",
+                "ordering": ["-created_at", "-id"],
+                "indexes": [
+                    models.Index(
+                        fields=["entity_type", "entity_id", "-created_at"],
+                        name="audit_log_entity_idx",
+                    ),
+                    models.Index(
+                        fields=["actor_id", "-created_at"], name="audit_log_actor_idx"
+                    ),
+                ],
+            },
+        ),
+    ]
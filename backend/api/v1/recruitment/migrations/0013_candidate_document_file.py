@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recruitment", "0012_stored_blob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CandidateDocumentFile",
+            fields=[
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, editable=False
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("cv", "CV"),
+                            ("dni", "DNI"),
+                            ("certificado", "Certificado"),
+                            ("recibo_servicio", "Recibo de servicio"),
+                            ("ficha_datos", "Ficha de datos"),
+                            ("autorizacion_datos", "Autorización de datos"),
+                        ],
+                        max_length=30,
+                    ),
+                ),
+                ("filename", models.CharField(blank=True, default="", max_length=255)),
+                ("content_type", models.CharField(max_length=100)),
+                ("size", models.BigIntegerField()),
+                ("uploaded_by", models.UUIDField(blank=True, null=True)),
+                (
+                    "blob",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="document_files",
+                        to="recruitment.storedblob",
+                    ),
+                ),
+                (
+                    "candidate",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="document_files",
+                        to="recruitment.candidate",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "candidate_document_file",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("candidate", "kind"),
+                        name="candidate_document_file_kind_uniq",
+                    )
+                ],
+            },
+        ),
+    ]
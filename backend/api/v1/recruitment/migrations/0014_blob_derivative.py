@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recruitment", "0013_candidate_document_file"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BlobDerivative",
+            fields=[
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, editable=False
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                (
+                    "name",
+                    models.CharField(
+                        choices=[("thumb", "Miniatura"), ("preview", "Vista previa")],
+                        max_length=20,
+                    ),
+                ),
+                ("path", models.CharField(max_length=512)),
+                ("size", models.BigIntegerField()),
+                ("content_type", models.CharField(max_length=100)),
+                ("width", models.PositiveIntegerField()),
+                ("height", models.PositiveIntegerField()),
+                (
+                    "blob",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="derivatives",
+                        to="recruitment.storedblob",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "blob_derivative",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("blob", "name"), name="blob_derivative_name_uniq"
+                    )
+                ],
+            },
+        ),
+    ]
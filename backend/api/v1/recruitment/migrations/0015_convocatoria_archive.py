@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import api.v1.recruitment.models
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recruitment", "0014_blob_derivative"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ConvocatoriaArchive",
+            fields=[
+                (
+                    "link",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="archive",
+                        serialize=False,
+                        to="recruitment.link",
+                    ),
+                ),
+                ("path", models.CharField(max_length=512)),
+                ("sha256", models.CharField(max_length=64)),
+                ("size", models.BigIntegerField()),
+                ("candidates", models.PositiveIntegerField(default=0)),
+                (
+                    "blob_shas",
+                    models.JSONField(
+                        blank=True, default=api.v1.recruitment.models._empty_list
+                    ),
+                ),
+                ("archived_by", models.UUIDField(blank=True, null=True)),
+                (
+                    "archived_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+            options={
+                "db_table": "convocatoria_archive",
+            },
+        ),
+    ]
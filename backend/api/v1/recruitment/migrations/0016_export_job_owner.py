@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recruitment", "0015_convocatoria_archive"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exportjob",
+            name="owner_id",
+            field=models.UUIDField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from django.db import migrations, models
+
+import api.v1.recruitment.models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recruitment", "0016_export_job_owner"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="link",
+            name="encargados",
+            field=models.JSONField(
+                blank=True, default=api.v1.recruitment.models._empty_list
+            ),
+        ),
+    ]
@@ -164,11 +164,42 @@ class Link(TimeStampedModel):
     class Meta:
         ordering = ["-created_at"]
         db_table = "link"
+        indexes = [
+            models.Index(
+                fields=["estado", "expires_at"], name="link_estado_expires_idx"
+            ),
+        ]
 
     def __str__(self) -> str:  # pragma: no cover
         return f"{self.titulo} ({self.slug})"
 
 
+class LinkCounter(models.Model):
+    """Contadores incrementales por convocatoria.
+
+    Se actualizan con expresiones `F()` dentro de las transacciones de
+    `candidate_service`, así el control de cuotas y el listado no dependen de
+    COUNT(*). `reconcile_link_counters` los recalcula en bloque.
+    """
+
+    link = models.OneToOneField(
+        Link,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="counter",
+    )
+    postulantes = models.PositiveIntegerField(default=0)
+    completos = models.PositiveIntegerField(default=0)
+    ultima_postulacion_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "link_counter"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"Contador {self.link_id}"
+
+
 class Candidate(TimeStampedModel):
     """Ficha declarativa del postulante."""
 
@@ -231,6 +262,10 @@ class Candidate(TimeStampedModel):
                 name="unique_document_per_link",
             )
         ]
+        # Exportes incrementales: rango por updated_at
+        indexes = [
+            models.Index(fields=["updated_at"], name="candidate_updated_at_idx")
+        ]
         db_table = "candidate"
 
     def __str__(self) -> str:  # pragma: no cover
@@ -302,6 +337,9 @@ class CandidateProcess(TimeStampedModel):
 
     class Meta:
         db_table = "candidate_process"
+        indexes = [
+            models.Index(fields=["updated_at"], name="candidate_process_upd_idx")
+        ]
 
 
 class CandidateAssignment(TimeStampedModel):
@@ -351,14 +389,297 @@ class CandidateAssignment(TimeStampedModel):
 
     class Meta:
         db_table = "candidate_assignment"
+        indexes = [
+            models.Index(fields=["updated_at"], name="candidate_assign_upd_idx")
+        ]
+
+
+class ExportJob(TimeStampedModel):
+    """Exportación en segundo plano procesada por bloques con checkpoint."""
+
+    class Kind(models.TextChoices):
+        SMART = "smart", "Smart Boleta"
+        CANDIDATES = "candidates", "Grilla de postulantes"
+
+    class Status(models.TextChoices):
+        PENDIENTE = "pendiente", "Pendiente"
+        EN_PROCESO = "en_proceso", "En proceso"
+        COMPLETADO = "completado", "Completado"
+        FALLIDO = "fallido", "Fallido"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    filters = models.JSONField(default=_empty_dict, blank=True)
+    signature = models.CharField(max_length=64, db_index=True)
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.PENDIENTE
+    )
+    # Keyset (created_at, id) del último postulante escrito
+    cursor_created_at = models.DateTimeField(null=True, blank=True)
+    cursor_id = models.UUIDField(null=True, blank=True)
+    rows_written = models.PositiveIntegerField(default=0)
+    parts = models.PositiveIntegerField(default=0)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(blank=True, default="")
+    created_by = models.UUIDField(null=True, blank=True)
+    # Dueño de las convocatorias a las que se limita el job (None = todas)
+    owner_id = models.UUIDField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        db_table = "export_job"
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="export_job_queue_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["signature"],
+                condition=models.Q(status__in=["pendiente", "en_proceso"]),
+                name="unique_active_export_signature",
+            )
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.kind} {self.id} ({self.status})"
+
+
+class ExportWatermark(models.Model):
+    """Último corte exportado con éxito para un destino de exportación."""
+
+    target = models.CharField(max_length=255, primary_key=True)
+    watermark_at = models.DateTimeField()
+    last_batch_code = models.CharField(max_length=120, blank=True, default="")
+    last_rows = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "export_watermark"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.target} @ {self.watermark_at:%Y-%m-%d %H:%M:%S}"
+
+
+class ConvocatoriaArchive(models.Model):
+    """Postulantes de una convocatoria cerrada movidos a almacenamiento frío.
+
+    El archivo (JSON Lines comprimido con gzip) guarda los postulantes con su
+    checklist, proceso, asignación y archivos; las tablas activas y sus
+    índices quedan solo con las convocatorias vigentes. Los blobs de los
+    documentos conservan su referencia mientras exista el archivo.
+    """
+
+    link = models.OneToOneField(
+        Link,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="archive",
+    )
+    path = models.CharField(max_length=512)
+    sha256 = models.CharField(max_length=64)
+    size = models.BigIntegerField()
+    candidates = models.PositiveIntegerField(default=0)
+    blob_shas = models.JSONField(default=_empty_list, blank=True)
+    archived_by = models.UUIDField(null=True, blank=True)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = "convocatoria_archive"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"Archivo {self.link_id} ({self.candidates})"
+
+
+class AuditLog(models.Model):
+    """Bitácora de mutaciones (RQ-X.1); la escribe `api.shared.audit` en lotes."""
+
+    id = models.BigAutoField(primary_key=True)
+    entity_type = models.CharField(max_length=50)
+    entity_id = models.CharField(max_length=64)
+    action = models.CharField(max_length=50)
+    actor_id = models.CharField(max_length=64, blank=True, default="")
+    actor_name = models.CharField(max_length=255, blank=True, default="")
+    payload = models.JSONField(default=_empty_dict, blank=True)
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
+    user_agent = models.CharField(max_length=255, blank=True, default="")
+    # Momento de la mutación (no el de la escritura diferida)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+        db_table = "audit_log"
+        indexes = [
+            models.Index(
+                fields=["entity_type", "entity_id", "-created_at"],
+                name="audit_log_entity_idx",
+            ),
+            models.Index(
+                fields=["actor_id", "-created_at"], name="audit_log_actor_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.entity_type}:{self.entity_id} {self.action}"
+
+
+class StoredBlob(TimeStampedModel):
+    """Archivo guardado una sola vez por contenido (SHA-256) con conteo de usos."""
+
+    sha256 = models.CharField(max_length=64, primary_key=True)
+    path = models.CharField(max_length=512)
+    size = models.BigIntegerField()
+    content_type = models.CharField(max_length=100, blank=True, default="")
+    ref_count = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        db_table = "stored_blob"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.sha256[:12]} x{self.ref_count}"
+
+
+class BlobDerivative(TimeStampedModel):
+    """Miniatura o vista previa comprimida generada a partir de un blob."""
+
+    class Name(models.TextChoices):
+        THUMB = "thumb", "Miniatura"
+        PREVIEW = "preview", "Vista previa"
+
+    id = models.BigAutoField(primary_key=True)
+    blob = models.ForeignKey(
+        StoredBlob,
+        on_delete=models.CASCADE,
+        related_name="derivatives",
+    )
+    name = models.CharField(max_length=20, choices=Name.choices)
+    path = models.CharField(max_length=512)
+    size = models.BigIntegerField()
+    content_type = models.CharField(max_length=100)
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+
+    class Meta:
+        db_table = "blob_derivative"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["blob", "name"], name="blob_derivative_name_uniq"
+            )
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.blob_id[:12]} {self.name}"
+
+
+class CandidateDocumentFile(TimeStampedModel):
+    """Archivo subido para un ítem del checklist documental.
+
+    Hay a lo sumo uno por postulante y tipo: una nueva subida reemplaza a la
+    anterior y libera su referencia en `StoredBlob`.
+    """
+
+    class Kind(models.TextChoices):
+        CV = "cv", "CV"
+        DNI = "dni", "DNI"
+        CERTIFICADO = "certificado", "Certificado"
+        RECIBO_SERVICIO = "recibo_servicio", "Recibo de servicio"
+        FICHA_DATOS = "ficha_datos", "Ficha de datos"
+        AUTORIZACION_DATOS = "autorizacion_datos", "Autorización de datos"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    candidate = models.ForeignKey(
+        Candidate,
+        on_delete=models.CASCADE,
+        related_name="document_files",
+    )
+    kind = models.CharField(max_length=30, choices=Kind.choices)
+    blob = models.ForeignKey(
+        StoredBlob,
+        on_delete=models.PROTECT,
+        related_name="document_files",
+    )
+    filename = models.CharField(max_length=255, blank=True, default="")
+    content_type = models.CharField(max_length=100)
+    size = models.BigIntegerField()
+    uploaded_by = models.UUIDField(null=True, blank=True)
+
+    class Meta:
+        db_table = "candidate_document_file"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["candidate", "kind"], name="candidate_document_file_kind_uniq"
+            )
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.candidate_id} {self.kind}"
+
+    @property
+    def checklist_field(self) -> str:
+        return f"{self.kind}_entregado"
+
+
+class OutboxEvent(models.Model):
+    """Evento de dominio escrito en la misma transacción que la mutación.
+
+    `relay_outbox` lo publica a los handlers registrados en `signals.py`.
+    """
+
+    class Status(models.TextChoices):
+        PENDIENTE = "pendiente", "Pendiente"
+        PUBLICADO = "publicado", "Publicado"
+        FALLIDO = "fallido", "Fallido"
+
+    id = models.BigAutoField(primary_key=True)
+    event_type = models.CharField(max_length=100)
+    aggregate_type = models.CharField(max_length=50)
+    aggregate_id = models.CharField(max_length=64)
+    payload = models.JSONField(default=_empty_dict, blank=True)
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.PENDIENTE
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # Reintentos con backoff: el relay ignora el evento hasta esta fecha
+    available_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(default=timezone.now)
+    published_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["id"]
+        db_table = "outbox_event"
+        indexes = [
+            # Parcial: la cola sólo recorre lo pendiente, no el histórico
+            models.Index(
+                fields=["available_at", "id"],
+                condition=models.Q(status="pendiente"),
+                name="outbox_event_pending_idx",
+            ),
+            models.Index(
+                fields=["aggregate_type", "aggregate_id"],
+                name="outbox_event_aggregate_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.event_type} {self.aggregate_id}"
 
 
 __all__ = [
     "Campaign",
     "Blacklist",
     "Link",
+    "LinkCounter",
     "Candidate",
     "CandidateDocuments",
     "CandidateProcess",
     "CandidateAssignment",
+    "ExportJob",
+    "ExportWatermark",
+    "ConvocatoriaArchive",
+    "AuditLog",
+    "OutboxEvent",
+    "StoredBlob",
+    "BlobDerivative",
+    "CandidateDocumentFile",
 ]
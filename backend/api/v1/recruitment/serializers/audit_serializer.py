@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from rest_framework import serializers
+
+from .. import models
+
+
+class AuditLogSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = models.AuditLog
+        fields = [
+            "id",
+            "entity_type",
+            "entity_id",
+            "action",
+            "actor_id",
+            "actor_name",
+            "payload",
+            "ip_address",
+            "user_agent",
+            "created_at",
+        ]
+        read_only_fields = fields
+
+
+class AuditLogFilterSerializer(serializers.Serializer):
+    entity_type = serializers.CharField(required=False, max_length=50)
+    entity_id = serializers.CharField(required=False, max_length=64)
+    actor_id = serializers.CharField(required=False, max_length=64)
+    action = serializers.CharField(required=False, max_length=50)
+    since = serializers.DateTimeField(required=False)
+    until = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs):
+        if "entity_id" in attrs and "entity_type" not in attrs:
+            raise serializers.ValidationError(
+                {"entity_type": ["Indique el tipo de entidad junto con entity_id."]}
+            )
+        return attrs
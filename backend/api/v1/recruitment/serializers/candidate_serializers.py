@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+from django.conf import settings
 from rest_framework import serializers
 
 from .. import models
 from ..request_context import get_user_id
-from ..services import candidate_service
+from ..services import candidate_import_service, candidate_service
+from ..services.exceptions import CandidateError
 
 
 class ConvocatoriaSummarySerializer(serializers.ModelSerializer):
@@ -44,6 +46,24 @@ class CandidateDocumentsSerializer(serializers.ModelSerializer):
         read_only_fields = ("id", "created_at", "updated_at")
 
 
+class CandidateDocumentFileSerializer(serializers.ModelSerializer):
+    sha256 = serializers.CharField(source="blob_id", read_only=True)
+
+    class Meta:
+        model = models.CandidateDocumentFile
+        fields = [
+            "id",
+            "kind",
+            "filename",
+            "content_type",
+            "size",
+            "sha256",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = fields
+
+
 class CandidateProcessSerializer(serializers.ModelSerializer):
     class Meta:
         model = models.CandidateProcess
@@ -153,9 +173,14 @@ class CandidateWriteSerializer(serializers.ModelSerializer):
     def update(self, instance, validated_data):
         request = self.context["request"]
         actor_id = get_user_id(request)
-        return candidate_service.update_candidate(
-            candidate=instance, data=validated_data, actor_id=actor_id
-        )
+        try:
+            return candidate_service.update_candidate(
+                candidate=instance, data=validated_data, actor_id=actor_id
+            )
+        except CandidateError as exc:
+            raise serializers.ValidationError(
+                {exc.field or "convocatoria": [str(exc)]}
+            ) from exc
 
 
 class CandidateListSerializer(serializers.ModelSerializer):
@@ -228,3 +253,68 @@ class CandidateDetailSerializer(CandidateListSerializer):
             "process",
             "assignment",
         ]
+
+
+class CandidateBulkUpdateSerializer(serializers.Serializer):
+    """Destinatarios (`ids` o `filter`) y cambios (`data`) de una edición masiva.
+
+    `data` se valida aparte con el serializer de la sección correspondiente.
+    """
+
+    ids = serializers.ListField(
+        child=serializers.UUIDField(), required=False, allow_empty=False
+    )
+    filter = serializers.DictField(
+        child=serializers.CharField(), required=False, allow_empty=False
+    )
+    data = serializers.DictField(allow_empty=False)
+
+    def validate_ids(self, value):
+        limit = settings.STAFFLINK_BULK_UPDATE_MAX_CANDIDATES
+        if len(value) > limit:
+            raise serializers.ValidationError(f"Máximo {limit} postulantes.")
+        return list(dict.fromkeys(value))
+
+    def validate_filter(self, value):
+        unknown = sorted(set(value) - set(candidate_service.CANDIDATE_FILTER_KEYS))
+        if unknown:
+            raise serializers.ValidationError(
+                f"Filtros no soportados: {', '.join(unknown)}."
+            )
+        return value
+
+    def validate(self, attrs):
+        if ("ids" in attrs) == ("filter" in attrs):
+            raise serializers.ValidationError("Envíe `ids` o `filter` (solo uno).")
+        return attrs
+
+
+class CandidateBulkUpdateResultSerializer(serializers.Serializer):
+    updated = serializers.IntegerField()
+    results = serializers.ListField(child=serializers.DictField())
+
+
+class CandidateImportSerializer(serializers.Serializer):
+    convocatoria = serializers.PrimaryKeyRelatedField(
+        queryset=models.Link.objects.all()
+    )
+    archivo = serializers.FileField()
+
+    def validate_archivo(self, value):
+        extension = value.name.rsplit(".", 1)[-1].lower() if "." in value.name else ""
+        if extension not in candidate_import_service.IMPORT_FORMATS:
+            raise serializers.ValidationError("Use un archivo .csv o .xlsx.")
+        return value
+
+
+class CandidateImportRowErrorSerializer(serializers.Serializer):
+    row = serializers.IntegerField()
+    numero_documento = serializers.CharField()
+    errors = serializers.DictField(child=serializers.ListField())
+
+
+class CandidateImportReportSerializer(serializers.Serializer):
+    total = serializers.IntegerField()
+    created = serializers.IntegerField()
+    errors = CandidateImportRowErrorSerializer(many=True)
+    ignored_columns = serializers.ListField(child=serializers.CharField())
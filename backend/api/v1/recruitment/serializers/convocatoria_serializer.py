@@ -12,6 +12,29 @@ class ConvocatoriaSerializer(serializers.ModelSerializer):
     campaign = serializers.PrimaryKeyRelatedField(
         queryset=models.Campaign.objects.all()
     )
+    postulantes = serializers.SerializerMethodField()
+    completos = serializers.SerializerMethodField()
+    ultima_postulacion_at = serializers.SerializerMethodField()
+    fill_ratio = serializers.SerializerMethodField()
+
+    def get_postulantes(self, obj) -> int:
+        counter = getattr(obj, "counter", None)
+        return counter.postulantes if counter else 0
+
+    def get_completos(self, obj) -> int:
+        counter = getattr(obj, "counter", None)
+        return counter.completos if counter else 0
+
+    def get_ultima_postulacion_at(self, obj) -> str | None:
+        counter = getattr(obj, "counter", None)
+        value = counter.ultima_postulacion_at if counter else None
+        return serializers.DateTimeField().to_representation(value) if value else None
+
+    def get_fill_ratio(self, obj) -> float | None:
+        """Proporción de cuotas cubiertas (None si la convocatoria no tiene cuotas)."""
+        if not obj.cuotas:
+            return None
+        return round(self.get_postulantes(obj) / obj.cuotas, 4)
 
     class Meta:
         model = models.Link
@@ -26,6 +49,10 @@ class ConvocatoriaSerializer(serializers.ModelSerializer):
             "slug",
             "titulo",
             "cuotas",
+            "postulantes",
+            "completos",
+            "ultima_postulacion_at",
+            "fill_ratio",
             "semana_trabajo",
             "expires_at",
             "notes",
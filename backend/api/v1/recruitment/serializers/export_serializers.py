@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from rest_framework import serializers
+
+from .. import models
+from ..services import candidate_service
+
+SMART_FILTER_KEYS = ("campaign_id", "periodo", "convocatoria_id")
+
+
+class SmartExportRequestSerializer(serializers.Serializer):
+    campaign_id = serializers.UUIDField(required=False)
+    periodo = serializers.CharField(required=False, allow_blank=False, max_length=32)
+    convocatoria_id = serializers.UUIDField(required=False)
+    incremental = serializers.BooleanField(required=False, default=False)
+
+    def validate(self, attrs):
+        if not any(attrs.get(key) for key in ("campaign_id", "periodo")):
+            raise serializers.ValidationError(
+                "Indique una campaña o un periodo para exportar."
+            )
+        return attrs
+
+
+class SmartExportResultSerializer(serializers.Serializer):
+    batch_code = serializers.CharField()
+    file_name = serializers.CharField()
+    rows = serializers.IntegerField()
+    bytes = serializers.IntegerField()
+    sha256 = serializers.CharField()
+    since = serializers.DateTimeField(allow_null=True)
+    until = serializers.DateTimeField(allow_null=True)
+
+
+class ExportJobCreateSerializer(serializers.Serializer):
+    kind = serializers.ChoiceField(choices=models.ExportJob.Kind.choices)
+    campaign_id = serializers.UUIDField(required=False)
+    convocatoria_id = serializers.UUIDField(required=False)
+    periodo = serializers.CharField(required=False, allow_blank=False, max_length=32)
+    documento = serializers.CharField(required=False, allow_blank=False, max_length=20)
+    grupo = serializers.CharField(required=False, allow_blank=False, max_length=50)
+
+    def validate(self, attrs):
+        kind = attrs.pop("kind")
+        allowed = (
+            SMART_FILTER_KEYS
+            if kind == models.ExportJob.Kind.SMART
+            else candidate_service.CANDIDATE_FILTER_KEYS
+        )
+        unexpected = sorted(set(attrs) - set(allowed))
+        if unexpected:
+            raise serializers.ValidationError(
+                {key: ["Filtro no soportado para este tipo."] for key in unexpected}
+            )
+        if kind == models.ExportJob.Kind.SMART and not any(
+            attrs.get(key) for key in ("campaign_id", "periodo")
+        ):
+            raise serializers.ValidationError(
+                "Indique una campaña o un periodo para exportar."
+            )
+        return {"kind": kind, "filters": attrs}
+
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = models.ExportJob
+        fields = [
+            "id",
+            "kind",
+            "filters",
+            "status",
+            "rows_written",
+            "parts",
+            "attempts",
+            "error",
+            "created_by",
+            "owner_id",
+            "created_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
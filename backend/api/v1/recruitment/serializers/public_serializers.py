@@ -5,8 +5,9 @@ from rest_framework import serializers
 from rest_framework.settings import api_settings
 
 from .. import models
-from ..services import candidate_service
+from ..services import candidate_service, convocatoria_cache, document_service
 from ..services.exceptions import CandidateError
+from ..validators.file_validator import allowed_content_types
 
 
 class PublicConvocatoriaSerializer(serializers.ModelSerializer):
@@ -31,6 +32,7 @@ class PublicConvocatoriaSerializer(serializers.ModelSerializer):
 
 class PublicCandidateSerializer(serializers.ModelSerializer):
     convocatoria_slug = serializers.SlugField(write_only=True)
+    upload_token = serializers.SerializerMethodField()
 
     class Meta:
         model = models.Candidate
@@ -69,6 +71,7 @@ class PublicCandidateSerializer(serializers.ModelSerializer):
             "descanso",
             "created_at",
             "updated_at",
+            "upload_token",
         ]
         read_only_fields = (
             "id",
@@ -80,6 +83,10 @@ class PublicCandidateSerializer(serializers.ModelSerializer):
             "updated_at",
         )
 
+    def get_upload_token(self, obj: models.Candidate) -> str:
+        """Token para subir los documentos desde el flujo público."""
+        return document_service.make_upload_token(obj)
+
     def validate_convocatoria_slug(self, value: str) -> str:
         convocatoria = self._get_active_convocatoria(value)
         self.context["convocatoria"] = convocatoria
@@ -102,12 +109,11 @@ class PublicCandidateSerializer(serializers.ModelSerializer):
 
     def _get_active_convocatoria(self, slug: str) -> models.Link:
         now = timezone.now()
-        try:
-            convocatoria = models.Link.objects.select_related("campaign").get(slug=slug)
-        except models.Link.DoesNotExist as exc:
+        convocatoria = convocatoria_cache.get_link_snapshot(slug)
+        if convocatoria is None:
             raise serializers.ValidationError(
                 {"convocatoria_slug": ["Convocatoria no encontrada"]}
-            ) from exc
+            )
         if convocatoria.estado != models.Link.Estado.ACTIVO:
             raise serializers.ValidationError(
                 {"convocatoria_slug": ["La convocatoria no está activa"]}
@@ -117,3 +123,19 @@ class PublicCandidateSerializer(serializers.ModelSerializer):
                 {"convocatoria_slug": ["La convocatoria ya venció"]}
             )
         return convocatoria
+
+
+class DirectUploadRequestSerializer(serializers.Serializer):
+    size = serializers.IntegerField(min_value=1)
+    sha256 = serializers.RegexField(r"^[0-9a-f]{64}$")
+    content_type = serializers.CharField()
+    filename = serializers.CharField(required=False, allow_blank=True, default="")
+
+    def validate_content_type(self, value: str) -> str:
+        if value not in allowed_content_types():
+            raise serializers.ValidationError("Tipo de archivo no permitido.")
+        return value
+
+
+class DirectUploadCompleteSerializer(serializers.Serializer):
+    ticket = serializers.CharField()
@@ -0,0 +1,216 @@
+"""Archivado de postulantes de convocatorias cerradas en almacenamiento frío.
+
+Las tablas `candidate`, `candidate_documents`, `candidate_process`,
+`candidate_assignment` y `candidate_document_file` solo crecen, mientras que
+el trabajo diario toca convocatorias recientes. `archive_convocatoria` vuelca
+los postulantes de una convocatoria cerrada a un JSON Lines comprimido en el
+`StorageClient` y los borra de esas tablas: los índices activos quedan del
+tamaño de lo vigente. El `LinkCounter` se conserva, así los listados siguen
+mostrando los totales históricos.
+
+`restore_convocatoria` hace el camino inverso (por ejemplo para reabrirla o
+para un reclamo) y borra el archivo al confirmar.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import tempfile
+from datetime import timedelta
+from typing import Any, Iterator
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Model
+from django.utils import timezone
+from django.utils.text import slugify
+from rest_framework import serializers
+
+from api.shared.audit import record_audit
+from integrations.storage.base import CHUNK_SIZE
+
+from .. import models
+from ..storage import get_storage_client
+
+ARCHIVE_PREFIX = "archives/convocatorias"
+ARCHIVE_CONTENT_TYPE = "application/gzip"
+ARCHIVE_CHUNK_SIZE = 2000
+# Por debajo de este tamaño el archivo se arma en memoria; encima, en disco
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+# Orden de escritura y de restauración: primero el postulante, luego sus hijos
+ARCHIVED_MODELS: tuple[tuple[str, type[Model], str], ...] = (
+    ("candidate", models.Candidate, "link"),
+    ("documents", models.CandidateDocuments, "candidate__link"),
+    ("process", models.CandidateProcess, "candidate__link"),
+    ("assignment", models.CandidateAssignment, "candidate__link"),
+    ("file", models.CandidateDocumentFile, "candidate__link"),
+)
+_MODELS_BY_LABEL = {label: model for label, model, _ in ARCHIVED_MODELS}
+
+
+def archive_path(convocatoria: models.Link) -> str:
+    periodo = slugify(convocatoria.periodo) or "sin-periodo"
+    return f"{ARCHIVE_PREFIX}/{periodo}/{convocatoria.pk}.jsonl.gz"
+
+
+def archivable(*, older_than_days: int, now=None):
+    """Convocatorias cerradas, sin archivar, sin cambios en `older_than_days`."""
+
+    cutoff = (now or timezone.now()) - timedelta(days=older_than_days)
+    return (
+        models.Link.objects.exclude(estado=models.Link.Estado.ACTIVO)
+        .filter(archive__isnull=True, updated_at__lt=cutoff)
+        .order_by("updated_at", "pk")
+    )
+
+
+def _iter_rows(convocatoria: models.Link, model: type[Model], link_lookup: str):
+    return (
+        model.objects.filter(**{link_lookup: convocatoria})
+        .order_by("pk")
+        .values()
+        .iterator(chunk_size=ARCHIVE_CHUNK_SIZE)
+    )
+
+
+def _build_archive(convocatoria: models.Link) -> tuple[Any, int]:
+    """Archivo gzip temporal (posicionado al inicio) y cantidad de postulantes."""
+
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    candidates = 0
+    # mtime fijo: el mismo contenido produce el mismo archivo (y hash)
+    with gzip.GzipFile(fileobj=spool, mode="wb", mtime=0) as archive:
+        for label, model, link_lookup in ARCHIVED_MODELS:
+            for row in _iter_rows(convocatoria, model, link_lookup):
+                line = json.dumps(
+                    {"model": label, "fields": row}, cls=DjangoJSONEncoder
+                )
+                archive.write(line.encode() + b"\n")
+                candidates += label == "candidate"
+    spool.seek(0)
+    return spool, candidates
+
+
+def archive_convocatoria(
+    *, convocatoria: models.Link, actor_id: str | None = None
+) -> models.ConvocatoriaArchive:
+    """Mueve los postulantes de una convocatoria cerrada al almacenamiento frío."""
+
+    storage = get_storage_client()
+    with transaction.atomic():
+        link = models.Link.objects.select_for_update().get(pk=convocatoria.pk)
+        if link.estado == models.Link.Estado.ACTIVO:
+            raise serializers.ValidationError(
+                {"estado": ["Solo se archivan convocatorias cerradas."]}
+            )
+        if models.ConvocatoriaArchive.objects.filter(link=link).exists():
+            raise serializers.ValidationError(
+                {"archive": ["La convocatoria ya está archivada."]}
+            )
+        spool, candidates = _build_archive(link)
+        with spool:
+            stored = storage.save_file(
+                spool, destination=archive_path(link), content_type=ARCHIVE_CONTENT_TYPE
+            )
+        try:
+            # Las referencias a los blobs pasan al archivo: no se liberan
+            blob_shas = list(
+                models.CandidateDocumentFile.objects.filter(candidate__link=link)
+                .order_by("pk")
+                .values_list("blob_id", flat=True)
+            )
+            archive = models.ConvocatoriaArchive.objects.create(
+                link=link,
+                path=stored.path,
+                sha256=stored.sha256,
+                size=stored.size,
+                candidates=candidates,
+                blob_shas=blob_shas,
+                archived_by=actor_id,
+            )
+            models.Candidate.objects.filter(link=link).delete()
+            record_audit(
+                entity_type="convocatoria",
+                entity_id=str(link.pk),
+                action="archive",
+                actor_id=actor_id,
+                payload={"postulantes": candidates, "bytes": stored.size},
+            )
+        except Exception:
+            storage.delete(stored.path)
+            raise
+    return archive
+
+
+def _read_records(archive: models.ConvocatoriaArchive) -> Iterator[dict[str, Any]]:
+    """Descarga el archivo por bloques, valida su hash y lo recorre."""
+
+    digest = hashlib.sha256()
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as spool:
+        with get_storage_client().open(archive.path) as handle:
+            while chunk := handle.read(CHUNK_SIZE):
+                digest.update(chunk)
+                spool.write(chunk)
+        if digest.hexdigest() != archive.sha256:
+            raise serializers.ValidationError(
+                {"archive": ["El archivo no coincide con el hash registrado."]}
+            )
+        spool.seek(0)
+        with gzip.GzipFile(fileobj=spool, mode="rb") as lines:
+            for line in lines:
+                yield json.loads(line)
+
+
+def _instance(model: type[Model], fields: dict[str, Any]) -> Model:
+    values = {
+        field.attname: field.to_python(fields[field.attname])
+        for field in model._meta.concrete_fields
+        if field.attname in fields
+    }
+    return model(**values)
+
+
+def restore_convocatoria(
+    *, convocatoria: models.Link, actor_id: str | None = None
+) -> int:
+    """Devuelve los postulantes archivados a las tablas activas."""
+
+    storage = get_storage_client()
+    with transaction.atomic():
+        archive = (
+            models.ConvocatoriaArchive.objects.select_for_update()
+            .filter(link=convocatoria)
+            .first()
+        )
+        if archive is None:
+            raise serializers.ValidationError(
+                {"archive": ["La convocatoria no está archivada."]}
+            )
+        restored = 0
+        batch: list[Model] = []
+        # El archivo viene agrupado por modelo en el orden de ARCHIVED_MODELS
+        for record in _read_records(archive):
+            model = _MODELS_BY_LABEL[record["model"]]
+            if batch and (
+                type(batch[0]) is not model or len(batch) >= ARCHIVE_CHUNK_SIZE
+            ):
+                type(batch[0]).objects.bulk_create(batch)
+                batch = []
+            batch.append(_instance(model, record["fields"]))
+            restored += model is models.Candidate
+        if batch:
+            type(batch[0]).objects.bulk_create(batch)
+        path = archive.path
+        archive.delete()
+        record_audit(
+            entity_type="convocatoria",
+            entity_id=str(convocatoria.pk),
+            action="restore",
+            actor_id=actor_id,
+            payload={"postulantes": restored},
+        )
+        transaction.on_commit(lambda: storage.delete(path))
+    return restored
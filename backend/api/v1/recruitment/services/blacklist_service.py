@@ -0,0 +1,48 @@
+"""Servicios para la blacklist de documentos."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from django.db import transaction
+
+from api.shared.audit import record_audit
+
+from .. import models
+
+
+def _audit(
+    entry_id: object, action: str, actor_id: str | None, payload: dict[str, Any]
+) -> None:
+    record_audit(
+        entity_type="blacklist",
+        entity_id=str(entry_id),
+        action=action,
+        actor_id=actor_id,
+        payload=payload,
+    )
+
+
+def create_entry(*, data: dict[str, Any], actor_id: str | None) -> models.Blacklist:
+    with transaction.atomic():
+        entry = models.Blacklist.objects.create(**data)
+        _audit(entry.pk, "create", actor_id, data)
+    return entry
+
+
+def update_entry(
+    *, entry: models.Blacklist, data: dict[str, Any], actor_id: str | None
+) -> models.Blacklist:
+    for field, value in data.items():
+        setattr(entry, field, value)
+    with transaction.atomic():
+        entry.save()
+        _audit(entry.pk, "update", actor_id, data)
+    return entry
+
+
+def delete_entry(*, entry: models.Blacklist, actor_id: str | None) -> None:
+    entry_id, dni = entry.pk, entry.dni
+    with transaction.atomic():
+        entry.delete()
+        _audit(entry_id, "delete", actor_id, {"dni": dni})
@@ -0,0 +1,119 @@
+"""Almacenamiento deduplicado por contenido sobre `StorageClient`.
+
+`store_blob` copia primero el archivo a un temporal local calculando su
+SHA-256: si el contenido ya existía solo se suma una referencia al blob
+existente y el storage no recibe ni un byte. Si es nuevo, se sube desde el
+temporal a una ruta aleatoria. `release_blob` resta la referencia y borra el
+archivo cuando nadie más lo usa.
+
+`adopt_blob` aplica lo mismo a un archivo que ya está en el storage, por
+ejemplo uno subido directo con una URL prefirmada. Si ese archivo ya es la
+ruta del blob (un reintento), solo suma la referencia: nunca lo borra.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import tempfile
+import uuid
+from typing import BinaryIO
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from integrations.storage.base import CHUNK_SIZE, StoredFile
+
+from .. import models
+from ..storage import get_storage_client
+
+BLOB_PREFIX = "blobs"
+
+
+def _add_reference(sha256: str) -> models.StoredBlob | None:
+    updated = models.StoredBlob.objects.filter(pk=sha256).update(
+        ref_count=F("ref_count") + 1, updated_at=timezone.now()
+    )
+    return models.StoredBlob.objects.get(pk=sha256) if updated else None
+
+
+def _delete_paths(storage, paths: list[str]) -> None:
+    for path in paths:
+        storage.delete(path)
+
+
+def new_blob_path() -> str:
+    """Ruta aleatoria para escribir un blob antes de conocer su hash."""
+
+    return f"{BLOB_PREFIX}/{uuid.uuid4().hex[:2]}/{uuid.uuid4().hex}"
+
+
+def store_blob(file_obj: BinaryIO, *, content_type: str) -> models.StoredBlob:
+    """Guarda `file_obj` (o reutiliza un blob idéntico) y suma una referencia."""
+
+    digest = hashlib.sha256()
+    # En disco: el storage local lo copia con copy_file_range y S3 lo sube
+    # por partes sin cargarlo en memoria
+    with tempfile.TemporaryFile() as spool:
+        while chunk := file_obj.read(CHUNK_SIZE):
+            digest.update(chunk)
+            spool.write(chunk)
+        blob = _add_reference(digest.hexdigest())
+        if blob is not None:
+            return blob
+        spool.seek(0)
+        staged = get_storage_client().save_file(
+            spool, destination=new_blob_path(), content_type=content_type
+        )
+    # Si otra subida del mismo contenido ganó la carrera, adopt_blob lo resuelve
+    return adopt_blob(staged, content_type=content_type)
+
+
+def adopt_blob(staged: StoredFile, *, content_type: str) -> models.StoredBlob:
+    """Registra un archivo ya guardado; si es un duplicado, lo borra."""
+
+    storage = get_storage_client()
+    blob = None
+    try:
+        with transaction.atomic():
+            blob = _add_reference(staged.sha256)
+            if blob is None:
+                try:
+                    with transaction.atomic():
+                        return models.StoredBlob.objects.create(
+                            sha256=staged.sha256,
+                            path=staged.path,
+                            size=staged.size,
+                            content_type=content_type,
+                        )
+                except IntegrityError:
+                    # Otra subida del mismo contenido ganó la carrera
+                    blob = _add_reference(staged.sha256)
+                    if blob is None:  # pragma: no cover - borrado concurrente
+                        raise
+            if blob.path != staged.path:
+                transaction.on_commit(lambda: storage.delete(staged.path))
+    except Exception:
+        if blob is None or blob.path != staged.path:
+            storage.delete(staged.path)
+        raise
+    return blob
+
+
+def release_blob(sha256: str) -> bool:
+    """Resta una referencia; devuelve True si el archivo se eliminó."""
+
+    storage = get_storage_client()
+    with transaction.atomic():
+        blob = models.StoredBlob.objects.select_for_update().filter(pk=sha256).first()
+        if blob is None:
+            return False
+        if blob.ref_count > 1:
+            models.StoredBlob.objects.filter(pk=sha256).update(
+                ref_count=F("ref_count") - 1, updated_at=timezone.now()
+            )
+            return False
+        paths = [blob.path, *blob.derivatives.values_list("path", flat=True)]
+        blob.delete()
+        transaction.on_commit(lambda: _delete_paths(storage, paths))
+    return True
@@ -0,0 +1,421 @@
+"""Importación masiva de postulantes desde CSV/XLSX (Excel operativo).
+
+El archivo se recorre en streaming y se procesa por lotes. Cada lote valida
+las filas en memoria (campos del modelo + `validate_document`), consulta la
+blacklist y los duplicados con una sola query cada uno y crea el postulante y
+sus tres tablas satélite con `bulk_create`, así el número de consultas crece
+con los lotes y no con las filas.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import itertools
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, BinaryIO, Iterable, Iterator, Sequence
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from api.shared.audit import record_audit_many
+from api.shared.xlsx import XlsxReadError, iter_xlsx_rows
+
+from .. import models
+from ..validators.document_validator import validate_document
+from . import candidate_service, outbox_service
+from .exceptions import CandidateError
+
+IMPORT_BATCH_SIZE = 1000
+IMPORT_FORMATS = ("csv", "xlsx")
+
+IMPORT_FIELDS = (
+    "tipo_documento",
+    "numero_documento",
+    "apellido_paterno",
+    "apellido_materno",
+    "nombres_completos",
+    "telefono",
+    "telefono_referencia",
+    "email",
+    "sexo",
+    "fecha_nacimiento",
+    "edad",
+    "estado_civil",
+    "numero_hijos",
+    "nivel_academico",
+    "carrera",
+    "nacionalidad",
+    "lugar_residencia",
+    "distrito",
+    "direccion",
+    "has_callcenter_experience",
+    "callcenter_experience_type",
+    "callcenter_experience_time",
+    "other_experience_type",
+    "other_experience_time",
+    "enteraste_oferta",
+    "observacion",
+    "modalidad",
+    "condicion",
+    "hora_gestion",
+    "descanso",
+)
+REQUIRED_COLUMNS = (
+    "numero_documento",
+    "apellido_paterno",
+    "nombres_completos",
+    "telefono",
+    "email",
+)
+
+# Encabezados del Excel operativo (docs/rq.md) ya normalizados -> campo
+HEADER_ALIASES = {
+    "tipo_de_documento": "tipo_documento",
+    "tipo_doc": "tipo_documento",
+    "dni": "numero_documento",
+    "documento": "numero_documento",
+    "numero_de_documento": "numero_documento",
+    "nro_documento": "numero_documento",
+    "ap_paterno": "apellido_paterno",
+    "ap_materno": "apellido_materno",
+    "nombres": "nombres_completos",
+    "nombre": "nombres_completos",
+    "celular": "telefono",
+    "telefono_celular": "telefono",
+    "telefono_de_referencia": "telefono_referencia",
+    "correo": "email",
+    "correo_electronico": "email",
+    "fecha_de_nacimiento": "fecha_nacimiento",
+    "numero_de_hijos": "numero_hijos",
+    "n_de_hijos": "numero_hijos",
+    "lugar_de_residencia": "lugar_residencia",
+    "cuenta_con_experiencia_en_call_center": "has_callcenter_experience",
+    "como_se_entero": "enteraste_oferta",
+    "como_se_entero_de_la_oferta": "enteraste_oferta",
+    "horario": "hora_gestion",
+}
+
+_DATE_FIELDS = {"fecha_nacimiento"}
+_BOOLEAN_FIELDS = {"has_callcenter_experience"}
+_TRUE_VALUES = {"si", "sí", "s", "x", "1", "true", "verdadero", "yes"}
+_EXCEL_EPOCH = date(1899, 12, 30)
+
+
+@dataclass
+class ImportReport:
+    total: int = 0
+    created: int = 0
+    errors: list[dict[str, Any]] = field(default_factory=list)
+    ignored_columns: list[str] = field(default_factory=list)
+
+    def add_error(
+        self, row: int, numero_documento: Any, errors: dict[str, list[str]]
+    ) -> None:
+        self.errors.append(
+            {
+                "row": row,
+                "numero_documento": (
+                    "" if numero_documento is None else str(numero_documento)
+                ),
+                "errors": errors,
+            }
+        )
+
+
+def _normalize_header(value: Any) -> str:
+    text = unicodedata.normalize("NFKD", str(value or ""))
+    text = text.encode("ascii", "ignore").decode("ascii").lower()
+    return re.sub(r"[^a-z0-9]+", "_", text).strip("_")
+
+
+def map_columns(header: Sequence[Any]) -> tuple[dict[int, str], list[str]]:
+    """Posición -> campo del modelo, más los encabezados que no se usan."""
+
+    mapping: dict[int, str] = {}
+    ignored: list[str] = []
+    for index, raw in enumerate(header):
+        name = _normalize_header(raw)
+        target = name if name in IMPORT_FIELDS else HEADER_ALIASES.get(name)
+        if target and target not in mapping.values():
+            mapping[index] = target
+        elif name:
+            ignored.append(str(raw))
+    return mapping, ignored
+
+
+def iter_file_rows(file_obj: BinaryIO, file_format: str) -> Iterator[Sequence[Any]]:
+    """Filas crudas (encabezado incluido) de un CSV o XLSX en streaming."""
+
+    if file_format == "xlsx":
+        try:
+            yield from iter_xlsx_rows(file_obj)
+        except XlsxReadError as exc:
+            raise CandidateError(str(exc), field="archivo") from exc
+        return
+    text = io.TextIOWrapper(file_obj, encoding="utf-8-sig", newline="")
+    try:
+        first = text.readline()
+        # Excel en configuración regional es-PE exporta CSV con ';'
+        delimiter = ";" if first.count(";") > first.count(",") else ","
+        yield from csv.reader(itertools.chain([first], text), delimiter=delimiter)
+    except UnicodeDecodeError as exc:
+        raise CandidateError(
+            "El CSV debe estar codificado en UTF-8.", field="archivo"
+        ) from exc
+    finally:
+        text.detach()
+
+
+def _coerce(name: str, value: Any) -> Any:
+    if isinstance(value, str):
+        value = value.strip()
+    if value is None or value == "":
+        return None
+    if name in _DATE_FIELDS:
+        if isinstance(value, (int, float)):
+            return _EXCEL_EPOCH + timedelta(days=int(value))
+        for fmt in ("%d/%m/%Y", "%d-%m-%Y"):
+            try:
+                return datetime.strptime(value, fmt).date()
+            except (TypeError, ValueError):
+                continue
+        return value
+    if name in _BOOLEAN_FIELDS:
+        if isinstance(value, bool):
+            return value
+        return str(value).strip().lower() in _TRUE_VALUES
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    # `clean_fields` convierte el texto al tipo de cada campo
+    return str(value)
+
+
+def _row_payload(mapping: dict[int, str], values: Sequence[Any]) -> dict[str, Any]:
+    payload: dict[str, Any] = {}
+    for index, name in mapping.items():
+        value = _coerce(name, values[index] if index < len(values) else None)
+        if value is not None:
+            payload[name] = value
+    tipo = str(payload.get("tipo_documento") or "dni").lower()
+    payload["tipo_documento"] = tipo
+    numero = str(payload.get("numero_documento") or "").upper()
+    # Excel suele perder el cero a la izquierda de los DNI numéricos
+    if tipo == "dni" and numero.isdigit() and len(numero) == 7:
+        numero = numero.zfill(8)
+    payload["numero_documento"] = numero
+    return payload
+
+
+def _validate(link: models.Link, payload: dict[str, Any]) -> models.Candidate:
+    """Valida la fila sin consultar la base y devuelve la instancia a crear."""
+
+    try:
+        payload["numero_documento"] = validate_document(
+            payload["tipo_documento"], payload["numero_documento"]
+        )
+    except CandidateError as exc:
+        raise ValidationError({exc.field or "numero_documento": [str(exc)]})
+    candidate_service.apply_link_defaults(link, payload)
+    candidate = models.Candidate(link=link, **payload)
+    candidate.clean_fields(exclude=["link", "created_by", "updated_by"])
+    return candidate
+
+
+def import_candidates(
+    *,
+    link: models.Link,
+    file_obj: BinaryIO,
+    file_format: str,
+    actor_id: str | None,
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> ImportReport:
+    """Importa postulantes a `link` y devuelve el reporte por fila.
+
+    Aplica las mismas reglas que `create_candidate`: convocatoria activa,
+    blacklist, documento único por convocatoria y cuotas. Las filas con error
+    no detienen la importación; cada lote se confirma por separado.
+    """
+
+    if file_format not in IMPORT_FORMATS:
+        raise CandidateError("Formato no soportado (use csv o xlsx).", field="archivo")
+    candidate_service.ensure_convocatoria_available(link)
+    rows = iter(iter_file_rows(file_obj, file_format))
+    header = next(rows, None)
+    if not header:
+        raise CandidateError("El archivo está vacío.", field="archivo")
+    mapping, ignored = map_columns(header)
+    missing = [name for name in REQUIRED_COLUMNS if name not in mapping.values()]
+    if missing:
+        raise CandidateError(
+            f"Faltan columnas obligatorias: {', '.join(missing)}.", field="archivo"
+        )
+
+    report = ImportReport(ignored_columns=ignored)
+    seen: set[tuple[str, str]] = set()
+    batch: list[tuple[int, models.Candidate]] = []
+    # La fila 1 es el encabezado: los números coinciden con los del Excel
+    for line, values in enumerate(rows, start=2):
+        if not any(value not in (None, "") for value in values):
+            continue
+        report.total += 1
+        payload = _row_payload(mapping, values)
+        try:
+            candidate = _validate(link, payload)
+        except ValidationError as exc:
+            report.add_error(line, payload.get("numero_documento"), exc.message_dict)
+            continue
+        key = (candidate.tipo_documento, candidate.numero_documento)
+        if key in seen:
+            report.add_error(
+                line,
+                candidate.numero_documento,
+                {"numero_documento": ["Documento repetido en el archivo."]},
+            )
+            continue
+        seen.add(key)
+        batch.append((line, candidate))
+        if len(batch) >= batch_size:
+            _create_batch(link, batch, actor_id, report)
+            batch = []
+    if batch:
+        _create_batch(link, batch, actor_id, report)
+    report.errors.sort(key=lambda error: error["row"])
+    return report
+
+
+def _create_batch(
+    link: models.Link,
+    batch: list[tuple[int, models.Candidate]],
+    actor_id: str | None,
+    report: ImportReport,
+) -> None:
+    dnis = {
+        candidate.numero_documento
+        for _, candidate in batch
+        if candidate.tipo_documento == "dni"
+    }
+    blacklisted = set(
+        models.Blacklist.objects.filter(
+            dni__in=dnis, estado=models.Blacklist.Status.ACTIVO
+        ).values_list("dni", flat=True)
+    )
+    pending: list[tuple[int, models.Candidate]] = []
+    for line, candidate in batch:
+        if (
+            candidate.tipo_documento == "dni"
+            and candidate.numero_documento in blacklisted
+        ):
+            report.add_error(
+                line,
+                candidate.numero_documento,
+                {"numero_documento": ["El documento se encuentra en blacklist."]},
+            )
+        else:
+            pending.append((line, candidate))
+    if not pending:
+        return
+
+    with transaction.atomic():
+        candidate_service.ensure_counter(link)
+        # Bloquear el contador serializa contra las postulaciones públicas
+        # (que lo actualizan antes de insertar), así la verificación de
+        # duplicados y cuotas no compite con ellas.
+        counter = models.LinkCounter.objects.select_for_update().get(link_id=link.pk)
+        existing = set(
+            models.Candidate.objects.filter(
+                link=link,
+                numero_documento__in={c.numero_documento for _, c in pending},
+            ).values_list("tipo_documento", "numero_documento")
+        )
+        available = (
+            None if link.cuotas is None else max(link.cuotas - counter.postulantes, 0)
+        )
+        to_create: list[models.Candidate] = []
+        for line, candidate in pending:
+            if (candidate.tipo_documento, candidate.numero_documento) in existing:
+                report.add_error(
+                    line,
+                    candidate.numero_documento,
+                    {
+                        "numero_documento": [
+                            "Ya existe un postulante con ese documento para esta "
+                            "convocatoria."
+                        ]
+                    },
+                )
+            elif available is not None and len(to_create) >= available:
+                report.add_error(
+                    line,
+                    candidate.numero_documento,
+                    {"non_field_errors": ["La convocatoria ya completó sus cuotas."]},
+                )
+            else:
+                candidate.created_by = actor_id
+                candidate.updated_by = actor_id
+                to_create.append(candidate)
+        if not to_create:
+            return
+
+        # Los UUID se generan en Python, así las tablas satélite se arman sin
+        # releer los postulantes insertados.
+        models.Candidate.objects.bulk_create(to_create)
+        assignment_defaults = candidate_service.assignment_defaults(link)
+        models.CandidateDocuments.objects.bulk_create(
+            [models.CandidateDocuments(candidate=c) for c in to_create]
+        )
+        models.CandidateProcess.objects.bulk_create(
+            [
+                models.CandidateProcess(candidate=c, updated_by=actor_id)
+                for c in to_create
+            ]
+        )
+        models.CandidateAssignment.objects.bulk_create(
+            [
+                models.CandidateAssignment(candidate=c, **assignment_defaults)
+                for c in to_create
+            ]
+        )
+        now = timezone.now()
+        models.LinkCounter.objects.filter(link_id=link.pk).update(
+            postulantes=F("postulantes") + len(to_create),
+            ultima_postulacion_at=now,
+            updated_at=now,
+        )
+        if link.cuotas is not None and settings.STAFFLINK_CUOTAS_AUTO_EXPIRE:
+            candidate_service.expire_if_full(link)
+        record_audit_many(
+            {
+                "entity_type": "candidate",
+                "entity_id": str(c.pk),
+                "action": "import",
+                "actor_id": actor_id,
+                "payload": {
+                    "link": str(link.pk),
+                    "numero_documento": c.numero_documento,
+                },
+            }
+            for c in to_create
+        )
+        outbox_service.publish_events(
+            "candidate.import",
+            ((c.pk, {"link": link.pk, "actor_id": actor_id}) for c in to_create),
+        )
+    report.created += len(to_create)
+
+
+def summarize_errors(errors: Iterable[dict[str, Any]]) -> Iterator[str]:
+    """Líneas legibles del reporte (para la línea de comandos)."""
+
+    for error in errors:
+        detail = "; ".join(
+            f"{name}: {' '.join(messages)}"
+            for name, messages in error["errors"].items()
+        )
+        yield f"Fila {error['row']} ({error['numero_documento']}): {detail}"
@@ -2,13 +2,39 @@
 
 from __future__ import annotations
 
+from typing import Any, Mapping, Sequence
+
+from django.conf import settings
 from django.db import IntegrityError, transaction
+from django.db.models import F, QuerySet
+from django.db.models.functions import Greatest
 from django.utils import timezone
 
+from api.shared.audit import record_audit, record_audit_many
+
 from .. import models
 from ..validators.document_validator import validate_document
+from . import blob_service, convocatoria_cache, outbox_service
 from .exceptions import CandidateError
 
+CANDIDATE_FILTER_KEYS = ("documento", "campaign_id", "convocatoria_id", "grupo")
+
+
+def apply_filters(
+    qs: QuerySet[models.Candidate], params: Mapping[str, Any]
+) -> QuerySet[models.Candidate]:
+    """Aplica los filtros de la grilla de postulantes (lista y exportes)."""
+
+    if document := params.get("documento"):
+        qs = qs.filter(numero_documento__iexact=str(document).strip())
+    if campaign_id := params.get("campaign_id"):
+        qs = qs.filter(link__campaign_id=campaign_id)
+    if convocatoria_id := params.get("convocatoria_id"):
+        qs = qs.filter(link_id=convocatoria_id)
+    if grupo := params.get("grupo"):
+        qs = qs.filter(link__grupo__iexact=str(grupo).strip())
+    return qs
+
 
 def _sanitize(value: str | None) -> str:
     return (value or "").strip().upper()
@@ -26,27 +52,85 @@ def _ensure_not_blacklisted(tipo_documento: str, numero_documento: str) -> None:
         )
 
 
-def _ensure_convocatoria_available(link: models.Link) -> None:
+def ensure_convocatoria_available(link: models.Link) -> None:
     if link.estado != models.Link.Estado.ACTIVO:
         raise CandidateError("La convocatoria no está activa.")
     if link.expires_at < timezone.now():
         raise CandidateError("La convocatoria ya venció.")
 
 
-def _apply_defaults(link: models.Link, data: dict[str, object]) -> None:
+def ensure_counter(link: models.Link) -> None:
+    """Crea el contador del link si falta (links previos a los contadores)."""
+
+    models.LinkCounter.objects.get_or_create(
+        link_id=link.pk, defaults={"postulantes": link.candidates.count()}
+    )
+
+
+def reserve_slot(link: models.Link) -> None:
+    """Suma un postulante al contador del link respetando `cuotas`.
+
+    El UPDATE condicional es atómico: con la cuota llena no actualiza ninguna
+    fila y la postulación se rechaza sin contar candidatos.
+    """
+
+    counters = models.LinkCounter.objects.filter(link_id=link.pk)
+    if link.cuotas is not None:
+        counters = counters.filter(postulantes__lt=link.cuotas)
+    updated = counters.update(
+        postulantes=F("postulantes") + 1,
+        ultima_postulacion_at=timezone.now(),
+        updated_at=timezone.now(),
+    )
+    if not updated:
+        if models.LinkCounter.objects.filter(link_id=link.pk).exists():
+            raise CandidateError("La convocatoria ya completó sus cuotas.")
+        ensure_counter(link)
+        reserve_slot(link)
+        return
+    if link.cuotas is not None and settings.STAFFLINK_CUOTAS_AUTO_EXPIRE:
+        expire_if_full(link)
+
+
+def expire_if_full(link: models.Link) -> None:
+    expired = models.Link.objects.filter(
+        pk=link.pk,
+        estado=models.Link.Estado.ACTIVO,
+        counter__postulantes__gte=F("cuotas"),
+    ).update(estado=models.Link.Estado.EXPIRADO, updated_at=timezone.now())
+    if expired:
+        transaction.on_commit(lambda: convocatoria_cache.invalidate([link.slug]))
+
+
+def _adjust_counter(
+    link_id: object, *, postulantes: int = 0, completos: int = 0
+) -> None:
+    """Aplica deltas al contador de un link (sin validar cuotas)."""
+
+    models.LinkCounter.objects.filter(link_id=link_id).update(
+        postulantes=Greatest(F("postulantes") + postulantes, 0),
+        completos=Greatest(F("completos") + completos, 0),
+        updated_at=timezone.now(),
+    )
+
+
+def _is_complete(candidate: models.Candidate) -> bool:
+    return models.CandidateDocuments.objects.filter(
+        candidate=candidate, status=models.CandidateDocuments.Status.COMPLETO
+    ).exists()
+
+
+def apply_link_defaults(link: models.Link, data: dict[str, object]) -> None:
     data.setdefault("modalidad", link.modalidad)
     data.setdefault("condicion", link.condicion)
     data.setdefault("hora_gestion", link.hora_gestion)
     data.setdefault("descanso", link.descanso)
 
 
-def _ensure_related(candidate: models.Candidate, actor_id: str | None) -> None:
-    link = candidate.link
-    models.CandidateDocuments.objects.get_or_create(candidate=candidate)
-    models.CandidateProcess.objects.get_or_create(
-        candidate=candidate, defaults={"updated_by": actor_id}
-    )
-    assignment_defaults = {
+def assignment_defaults(link: models.Link) -> dict[str, object]:
+    """Condiciones contractuales del link que se copian al postulante."""
+
+    return {
         "tipo_contratacion": link.tipo_contratacion,
         "razon_social": link.razon_social,
         "remuneracion": link.remuneracion,
@@ -57,15 +141,67 @@ def _ensure_related(candidate: models.Candidate, actor_id: str | None) -> None:
         "bono_asistencia": link.bono_asistencia,
         "cargo_contractual": link.cargo_contractual,
     }
+
+
+def _record_change(
+    candidate_id: object,
+    action: str,
+    actor_id: str | None,
+    payload: Mapping[str, object] | None = None,
+) -> None:
+    """Audita la mutación y encola su evento en la transacción actual."""
+
+    data = dict(payload or {})
+    record_audit(
+        entity_type="candidate",
+        entity_id=str(candidate_id),
+        action=action,
+        actor_id=actor_id,
+        payload=data,
+    )
+    outbox_service.publish_event(
+        f"candidate.{action}", candidate_id, {**data, "actor_id": actor_id}
+    )
+
+
+def _record_bulk_change(
+    candidate_ids: Sequence[object],
+    action: str,
+    actor_id: str | None,
+    payload: Mapping[str, object],
+) -> None:
+    data = {**payload, "bulk": True}
+    record_audit_many(
+        {
+            "entity_type": "candidate",
+            "entity_id": str(pk),
+            "action": action,
+            "actor_id": actor_id,
+            "payload": data,
+        }
+        for pk in candidate_ids
+    )
+    event = {**data, "actor_id": actor_id}
+    outbox_service.publish_events(
+        f"candidate.{action}", ((pk, event) for pk in candidate_ids)
+    )
+
+
+def _ensure_related(candidate: models.Candidate, actor_id: str | None) -> None:
+    link = candidate.link
+    models.CandidateDocuments.objects.get_or_create(candidate=candidate)
+    models.CandidateProcess.objects.get_or_create(
+        candidate=candidate, defaults={"updated_by": actor_id}
+    )
     models.CandidateAssignment.objects.get_or_create(
-        candidate=candidate, defaults=assignment_defaults
+        candidate=candidate, defaults=assignment_defaults(link)
     )
 
 
 def create_candidate(
     *, link: models.Link, data: dict[str, object], actor_id: str | None
 ) -> models.Candidate:
-    _ensure_convocatoria_available(link)
+    ensure_convocatoria_available(link)
     doc_type = str(data["tipo_documento"])  # type: ignore[index]
     doc_number = str(data["numero_documento"])  # type: ignore[index]
     numero_documento = validate_document(
@@ -79,11 +215,18 @@ def create_candidate(
     payload["link"] = link
     payload["created_by"] = actor_id
     payload["updated_by"] = actor_id
-    _apply_defaults(link, payload)
+    apply_link_defaults(link, payload)
     try:
         with transaction.atomic():
+            reserve_slot(link)
             candidate = models.Candidate.objects.create(**payload)
             _ensure_related(candidate, actor_id)
+            _record_change(
+                candidate.pk,
+                "create",
+                actor_id,
+                {"link": link.pk, **data},
+            )
     except IntegrityError as exc:
         raise CandidateError(
             "Ya existe un postulante con ese documento para esta convocatoria."
@@ -103,41 +246,184 @@ def update_candidate(
         _ensure_not_blacklisted(
             str(data["tipo_documento"]), str(data["numero_documento"])  # type: ignore[index]
         )
+    previous_link_id = candidate.link_id
     for field, value in data.items():
         setattr(candidate, field, value)
     candidate.updated_by = actor_id
-    candidate.save()
+    link_changed = candidate.link_id != previous_link_id
+    with transaction.atomic():
+        if link_changed:
+            # El destino cuenta como una postulación más: respeta sus cuotas
+            reserve_slot(candidate.link)
+        candidate.save()
+        if link_changed:
+            completos = 1 if _is_complete(candidate) else 0
+            _adjust_counter(previous_link_id, postulantes=-1, completos=-completos)
+            _adjust_counter(candidate.link_id, completos=completos)
+        _record_change(candidate.pk, "update", actor_id, data)
     return candidate
 
 
+def delete_candidate(
+    *, candidate: models.Candidate, actor_id: str | None = None
+) -> None:
+    with transaction.atomic():
+        completos = 1 if _is_complete(candidate) else 0
+        link_id = candidate.link_id
+        candidate_id = candidate.pk
+        blob_shas = list(candidate.document_files.values_list("blob_id", flat=True))
+        candidate.delete()
+        for sha256 in blob_shas:
+            blob_service.release_blob(sha256)
+        _adjust_counter(link_id, postulantes=-1, completos=-completos)
+        _record_change(
+            candidate_id,
+            "delete",
+            actor_id,
+            {"link": link_id, "numero_documento": candidate.numero_documento},
+        )
+
+
 def update_documents(
-    *, candidate: models.Candidate, data: dict[str, object]
+    *,
+    candidate: models.Candidate,
+    data: dict[str, object],
+    actor_id: str | None = None,
 ) -> models.CandidateDocuments:
-    docs, _ = models.CandidateDocuments.objects.get_or_create(candidate=candidate)
-    for field, value in data.items():
-        setattr(docs, field, value)
-    docs.save()
+    completo = models.CandidateDocuments.Status.COMPLETO
+    with transaction.atomic():
+        docs, _ = models.CandidateDocuments.objects.get_or_create(candidate=candidate)
+        was_complete = docs.status == completo
+        for field, value in data.items():
+            setattr(docs, field, value)
+        docs.save()
+        is_complete = docs.status == completo
+        if was_complete != is_complete:
+            _adjust_counter(candidate.link_id, completos=1 if is_complete else -1)
+        _record_change(candidate.pk, "documents", actor_id, data)
     return docs
 
 
 def update_process(
     *, candidate: models.Candidate, data: dict[str, object], actor_id: str | None
 ) -> models.CandidateProcess:
-    process, _ = models.CandidateProcess.objects.get_or_create(candidate=candidate)
-    for field, value in data.items():
-        setattr(process, field, value)
-    process.updated_by = actor_id
-    process.save()
+    with transaction.atomic():
+        process, _ = models.CandidateProcess.objects.get_or_create(candidate=candidate)
+        for field, value in data.items():
+            setattr(process, field, value)
+        process.updated_by = actor_id
+        process.save()
+        _record_change(candidate.pk, "process", actor_id, data)
     return process
 
 
 def update_assignment(
-    *, candidate: models.Candidate, data: dict[str, object]
+    *,
+    candidate: models.Candidate,
+    data: dict[str, object],
+    actor_id: str | None = None,
 ) -> models.CandidateAssignment:
-    assignment, _ = models.CandidateAssignment.objects.get_or_create(
-        candidate=candidate
-    )
-    for field, value in data.items():
-        setattr(assignment, field, value)
-    assignment.save()
+    with transaction.atomic():
+        assignment, _ = models.CandidateAssignment.objects.get_or_create(
+            candidate=candidate, defaults=assignment_defaults(candidate.link)
+        )
+        for field, value in data.items():
+            setattr(assignment, field, value)
+        assignment.save()
+        _record_change(candidate.pk, "assignment", actor_id, data)
     return assignment
+
+
+def _bulk_update_related(
+    model: (
+        type[models.CandidateDocuments]
+        | type[models.CandidateProcess]
+        | type[models.CandidateAssignment]
+    ),
+    candidate_ids: Sequence[object],
+    values: dict[str, object],
+) -> int:
+    """Crea los registros satélite faltantes y aplica un único UPDATE.
+
+    Las asignaciones nuevas copian las condiciones de su link, igual que
+    `_ensure_related`. `QuerySet.update` no dispara `auto_now`, por eso
+    `updated_at` se fija a mano (los exportes incrementales dependen de él).
+    """
+
+    existing = set(
+        model.objects.filter(candidate_id__in=candidate_ids).values_list(
+            "candidate_id", flat=True
+        )
+    )
+    missing = [pk for pk in candidate_ids if pk not in existing]
+    if missing:
+        if model is models.CandidateAssignment:
+            links = models.Candidate.objects.select_related("link").filter(
+                pk__in=missing
+            )
+            rows = [
+                model(candidate_id=c.pk, **assignment_defaults(c.link)) for c in links
+            ]
+        else:
+            rows = [model(candidate_id=pk) for pk in missing]
+        model.objects.bulk_create(rows, ignore_conflicts=True)
+    return model.objects.filter(candidate_id__in=candidate_ids).update(
+        **values, updated_at=timezone.now()
+    )
+
+
+def bulk_update_documents(
+    *,
+    candidate_ids: Sequence[object],
+    data: dict[str, object],
+    actor_id: str | None = None,
+) -> int:
+    completo = models.CandidateDocuments.Status.COMPLETO
+    with transaction.atomic():
+        _record_bulk_change(candidate_ids, "documents", actor_id, data)
+        if "status" not in data:
+            return _bulk_update_related(models.CandidateDocuments, candidate_ids, data)
+        _bulk_update_related(models.CandidateDocuments, candidate_ids, {})
+        # Bloquea los checklists y calcula cuántos cambian de estado completo
+        is_complete = data["status"] == completo
+        deltas: dict[object, int] = {}
+        rows = (
+            models.CandidateDocuments.objects.select_for_update(of=("self",))
+            .filter(candidate_id__in=candidate_ids)
+            .values_list("status", "candidate__link_id")
+        )
+        for status, link_id in rows:
+            if (status == completo) != is_complete:
+                deltas[link_id] = deltas.get(link_id, 0) + (1 if is_complete else -1)
+        updated = models.CandidateDocuments.objects.filter(
+            candidate_id__in=candidate_ids
+        ).update(**data, updated_at=timezone.now())
+        for link_id, delta in deltas.items():
+            _adjust_counter(link_id, completos=delta)
+    return updated
+
+
+def bulk_update_process(
+    *,
+    candidate_ids: Sequence[object],
+    data: dict[str, object],
+    actor_id: str | None,
+) -> int:
+    with transaction.atomic():
+        _record_bulk_change(candidate_ids, "process", actor_id, data)
+        return _bulk_update_related(
+            models.CandidateProcess,
+            candidate_ids,
+            {**data, "updated_by": actor_id},
+        )
+
+
+def bulk_update_assignment(
+    *,
+    candidate_ids: Sequence[object],
+    data: dict[str, object],
+    actor_id: str | None = None,
+) -> int:
+    with transaction.atomic():
+        _record_bulk_change(candidate_ids, "assignment", actor_id, data)
+        return _bulk_update_related(models.CandidateAssignment, candidate_ids, data)
@@ -0,0 +1,144 @@
+"""Cachés de convocatorias para el flujo público.
+
+- El landing del postulante se sirve desde la caché de Django indexada por
+  slug. El TTL nunca supera `expires_at`, de modo que un link vencido deja de
+  servirse aunque nadie lo haya expirado explícitamente.
+- Las postulaciones resuelven el slug contra un snapshot en memoria del
+  proceso (TTL corto). Cada snapshot guarda la versión del slug vigente en la
+  caché compartida; al cambiar la convocatoria se incrementa la versión y los
+  demás workers descartan su copia en la siguiente lectura.
+
+Los servicios de convocatorias invalidan ambas cachés al modificar el link.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from .. import models
+
+PUBLIC_PAYLOAD_PREFIX = "recruitment:public-convocatoria:"
+SNAPSHOT_VERSION_PREFIX = "recruitment:convocatoria-version:"
+SNAPSHOT_MAX_ENTRIES = 512
+
+_snapshot_lock = threading.Lock()
+# slug -> (monotonic de vencimiento, versión, Link)
+_snapshots: dict[str, tuple[float, int, models.Link]] = {}
+
+
+def _payload_key(slug: str) -> str:
+    return f"{PUBLIC_PAYLOAD_PREFIX}{slug}"
+
+
+def _compute_etag(data: Any) -> str:
+    raw = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True)
+    return '"' + hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def remaining_seconds(entry: dict[str, Any]) -> int:
+    """Segundos de vida que le quedan a una entrada (para Cache-Control)."""
+
+    return max(0, int(entry["valid_until"] - time.time()))
+
+
+def get_public_payload(slug: str) -> dict[str, Any] | None:
+    """Devuelve `{"data", "etag", "valid_until"}` si hay una entrada vigente."""
+
+    entry = cache.get(_payload_key(slug))
+    if entry is None:
+        return None
+    if remaining_seconds(entry) <= 0:
+        cache.delete(_payload_key(slug))
+        return None
+    return entry
+
+
+def store_public_payload(link: models.Link, data: Any) -> dict[str, Any]:
+    """Guarda el payload serializado con TTL recortado a `expires_at`."""
+
+    now = timezone.now()
+    until_expiry = int((link.expires_at - now).total_seconds())
+    ttl = max(0, min(settings.STAFFLINK_PUBLIC_CACHE_SECONDS, until_expiry))
+    entry = {
+        "data": data,
+        "etag": _compute_etag(data),
+        "valid_until": time.time() + ttl,
+    }
+    if ttl > 0:
+        cache.set(_payload_key(link.slug), entry, timeout=ttl)
+    return entry
+
+
+def _version_key(slug: str) -> str:
+    return f"{SNAPSHOT_VERSION_PREFIX}{slug}"
+
+
+def _bump_version(slug: str) -> None:
+    key = _version_key(slug)
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:  # la clave fue desalojada entre add e incr
+        cache.set(key, 1, timeout=None)
+
+
+def get_link_snapshot(slug: str) -> models.Link | None:
+    """Resuelve un slug a su Link (con campaña) usando el snapshot local.
+
+    Devuelve una copia del snapshot para que el llamador pueda usarla sin
+    afectar a otros threads. Retorna None si el slug no existe.
+    """
+
+    version = cache.get(_version_key(slug), 0)
+    now = time.monotonic()
+    with _snapshot_lock:
+        entry = _snapshots.get(slug)
+    if entry and entry[0] > now and entry[1] == version:
+        return copy.copy(entry[2])
+
+    try:
+        link = models.Link.objects.select_related("campaign").get(slug=slug)
+    except models.Link.DoesNotExist:
+        return None
+
+    with _snapshot_lock:
+        if len(_snapshots) >= SNAPSHOT_MAX_ENTRIES and slug not in _snapshots:
+            oldest = min(_snapshots, key=lambda key: _snapshots[key][0])
+            _snapshots.pop(oldest, None)
+        _snapshots[slug] = (
+            now + settings.STAFFLINK_LINK_SNAPSHOT_SECONDS,
+            version,
+            link,
+        )
+    return copy.copy(link)
+
+
+def clear_snapshots() -> None:
+    """Vacía los snapshots locales del proceso (útil en pruebas)."""
+
+    with _snapshot_lock:
+        _snapshots.clear()
+
+
+def invalidate(slugs: Iterable[str]) -> None:
+    """Elimina las entradas públicas y versiona los snapshots de los slugs."""
+
+    pending = {slug for slug in slugs if slug}
+    if not pending:
+        return
+    cache.delete_many([_payload_key(slug) for slug in pending])
+    for slug in pending:
+        _bump_version(slug)
+    with _snapshot_lock:
+        for slug in pending:
+            _snapshots.pop(slug, None)
@@ -3,14 +3,21 @@
 from __future__ import annotations
 
 import uuid
+from datetime import datetime
 from typing import Any
 
 from django.db import transaction
+from django.db.models import Count, Max, Q
+from django.utils import timezone
 from django.utils.text import slugify
 
 from rest_framework import serializers
 
+from api.shared.audit import record_audit, record_audit_many
+
 from .. import models
+from ..storage import get_storage_client
+from . import blob_service, convocatoria_cache, outbox_service
 
 
 def _generate_slug(data: dict[str, Any]) -> str:
@@ -38,6 +45,28 @@ def _generate_slug(data: dict[str, Any]) -> str:
     return f"{base}-{uuid.uuid4().hex[:6]}"
 
 
+def _record_change(
+    convocatoria_id: object,
+    action: str,
+    actor_id: str | None,
+    payload: dict[str, Any],
+    actor_name: str = "",
+) -> None:
+    """Audita la mutación y encola su evento en la transacción actual."""
+
+    record_audit(
+        entity_type="convocatoria",
+        entity_id=str(convocatoria_id),
+        action=action,
+        actor_id=actor_id,
+        actor_name=actor_name,
+        payload=payload,
+    )
+    outbox_service.publish_event(
+        f"convocatoria.{action}", convocatoria_id, {**payload, "actor_id": actor_id}
+    )
+
+
 def create_convocatoria(
     *, data: dict[str, Any], actor_id: str | None, actor_name: str
 ) -> models.Link:
@@ -50,19 +79,55 @@ def create_convocatoria(
     payload["updated_by"] = actor_id
     with transaction.atomic():
         convocatoria = models.Link.objects.create(**payload)
+        models.LinkCounter.objects.create(link=convocatoria)
+        _record_change(
+            convocatoria.pk,
+            "create",
+            actor_id,
+            {"slug": convocatoria.slug, **data},
+            actor_name=actor_name,
+        )
     return convocatoria
 
 
+def _invalidate_on_commit(*slugs: str) -> None:
+    transaction.on_commit(lambda: convocatoria_cache.invalidate(slugs))
+
+
 def update_convocatoria(
     *, convocatoria: models.Link, data: dict[str, Any], actor_id: str | None
 ) -> models.Link:
+    previous_slug = convocatoria.slug
     for field, value in data.items():
         setattr(convocatoria, field, value)
     convocatoria.updated_by = actor_id
-    convocatoria.save()
+    with transaction.atomic():
+        convocatoria.save()
+        _record_change(convocatoria.pk, "update", actor_id, data)
+    _invalidate_on_commit(previous_slug, convocatoria.slug)
     return convocatoria
 
 
+def delete_convocatoria(*, convocatoria: models.Link, actor_id: str | None) -> None:
+    pk, slug = convocatoria.pk, convocatoria.slug
+    with transaction.atomic():
+        blob_shas = list(
+            models.CandidateDocumentFile.objects.filter(
+                candidate__link=convocatoria
+            ).values_list("blob_id", flat=True)
+        )
+        archive = models.ConvocatoriaArchive.objects.filter(link=convocatoria).first()
+        if archive is not None:
+            blob_shas.extend(archive.blob_shas)
+            storage = get_storage_client()
+            transaction.on_commit(lambda: storage.delete(archive.path))
+        convocatoria.delete()
+        for sha256 in blob_shas:
+            blob_service.release_blob(sha256)
+        _record_change(pk, "delete", actor_id, {"slug": slug})
+    _invalidate_on_commit(slug)
+
+
 def set_status(
     *, convocatoria: models.Link, estado: str, actor_id: str | None
 ) -> models.Link:
@@ -72,7 +137,130 @@ def set_status(
         raise serializers.ValidationError(
             {"estado": ["Estado de convocatoria inválido."]}
         )
+    if (
+        estado == models.Link.Estado.ACTIVO
+        and models.ConvocatoriaArchive.objects.filter(link=convocatoria).exists()
+    ):
+        raise serializers.ValidationError(
+            {"estado": ["Restaure los postulantes archivados antes de reactivarla."]}
+        )
+    previous = convocatoria.estado
     convocatoria.estado = estado
     convocatoria.updated_by = actor_id
-    convocatoria.save(update_fields=["estado", "updated_by", "updated_at"])
+    with transaction.atomic():
+        convocatoria.save(update_fields=["estado", "updated_by", "updated_at"])
+        _record_change(
+            convocatoria.pk,
+            "status",
+            actor_id,
+            {"estado": estado, "anterior": previous},
+        )
+    _invalidate_on_commit(convocatoria.slug)
     return convocatoria
+
+
+def expire_due(*, batch_size: int = 500, now: datetime | None = None) -> int:
+    """Marca como expiradas las convocatorias activas con `expires_at` vencido.
+
+    Trabaja por lotes: cada lote toma los ids con SKIP LOCKED (índice
+    estado/expires_at), los actualiza con un único UPDATE, invalida las
+    cachés públicas al confirmar y registra la auditoría y los eventos en
+    bloque.
+    Devuelve la cantidad de convocatorias expiradas.
+    """
+
+    now = now or timezone.now()
+    expired = 0
+    while True:
+        with transaction.atomic():
+            due = list(
+                models.Link.objects.select_for_update(skip_locked=True)
+                .filter(estado=models.Link.Estado.ACTIVO, expires_at__lt=now)
+                .order_by()
+                .values_list("pk", "slug")[:batch_size]
+            )
+            if not due:
+                return expired
+            ids = [pk for pk, _ in due]
+            slugs = [slug for _, slug in due]
+            models.Link.objects.filter(
+                pk__in=ids, estado=models.Link.Estado.ACTIVO
+            ).update(estado=models.Link.Estado.EXPIRADO, updated_at=timezone.now())
+            _invalidate_on_commit(*slugs)
+            payload = {"estado": models.Link.Estado.EXPIRADO, "origen": "sweeper"}
+            record_audit_many(
+                {
+                    "entity_type": "convocatoria",
+                    "entity_id": str(pk),
+                    "action": "expire",
+                    "payload": payload,
+                }
+                for pk in ids
+            )
+            outbox_service.publish_events(
+                "convocatoria.expire", ((pk, payload) for pk in ids)
+            )
+        expired += len(ids)
+
+
+def reconcile_counters(
+    *, link_ids: list[Any] | None = None, batch_size: int = 500
+) -> int:
+    """Recalcula en bloque los contadores de las convocatorias.
+
+    Procesa los links por lotes: un GROUP BY por lote sobre los postulantes y
+    un upsert (`bulk_create` con `update_conflicts`) de los contadores.
+    Devuelve la cantidad de contadores escritos.
+    """
+
+    # Las archivadas ya no tienen postulantes en las tablas: su contador es
+    # el histórico congelado al archivarlas
+    links = models.Link.objects.filter(archive__isnull=True).order_by("pk")
+    if link_ids is not None:
+        links = links.filter(pk__in=link_ids)
+    completo = models.CandidateDocuments.Status.COMPLETO
+    written = 0
+    last_pk = None
+    while True:
+        page = links if last_pk is None else links.filter(pk__gt=last_pk)
+        batch = list(page.values_list("pk", flat=True)[:batch_size])
+        if not batch:
+            return written
+        stats = {
+            row["link_id"]: row
+            for row in models.Candidate.objects.filter(link_id__in=batch)
+            .values("link_id")
+            .annotate(
+                total=Count("id"),
+                completos=Count("id", filter=Q(documents__status=completo)),
+                ultima=Max("created_at"),
+            )
+            .order_by()
+        }
+        now = timezone.now()
+        counters = []
+        for link_id in batch:
+            row = stats.get(link_id, {})
+            counters.append(
+                models.LinkCounter(
+                    link_id=link_id,
+                    postulantes=row.get("total", 0),
+                    completos=row.get("completos", 0),
+                    ultima_postulacion_at=row.get("ultima"),
+                    updated_at=now,
+                )
+            )
+        with transaction.atomic():
+            models.LinkCounter.objects.bulk_create(
+                counters,
+                update_conflicts=True,
+                unique_fields=["link"],
+                update_fields=[
+                    "postulantes",
+                    "completos",
+                    "ultima_postulacion_at",
+                    "updated_at",
+                ],
+            )
+        written += len(counters)
+        last_pk = batch[-1]
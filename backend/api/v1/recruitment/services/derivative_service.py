@@ -0,0 +1,148 @@
+"""Miniaturas y vistas previas de los documentos subidos.
+
+Subir un documento publica `document.upload` en el outbox; el relay llama a
+`on_document_uploaded` fuera del request y el render (CPU) corre en un pool
+de procesos para no frenar al relay ni competir por el GIL. Las derivadas
+se guardan por blob en `derivatives/<sha256>/<nombre>.jpg`: el mismo
+contenido subido dos veces se procesa una sola vez, y como el contenido de
+una ruta nunca cambia se sirven con caché de larga duración.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from django.conf import settings
+from django.db import transaction
+
+from integrations.imaging.derivatives import (
+    DerivativeSpec,
+    ImagingError,
+    Rendition,
+    render,
+    supports,
+)
+
+from .. import models
+from ..signals import register_handler
+from ..storage import get_storage_client
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVE_PREFIX = "derivatives"
+# Nombres como str simples: viajan por pickle a procesos sin Django
+SPECS = (
+    DerivativeSpec(name="thumb", max_side=320, quality=70),
+    DerivativeSpec(name="preview", max_side=1600, quality=80),
+)
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: el hijo no hereda conexiones a la base ni hilos del padre
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.STAFFLINK_DERIVATIVE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+
+
+def derivative_path(sha256: str, name: str) -> str:
+    return f"{DERIVATIVE_PREFIX}/{sha256[:2]}/{sha256}/{name}.jpg"
+
+
+def _render(source: bytes, content_type: str) -> list[Rendition]:
+    if settings.STAFFLINK_DERIVATIVE_WORKERS <= 0:
+        return render(source, content_type, SPECS)
+    future = _get_pool().submit(render, source, content_type, SPECS)
+    return future.result(timeout=settings.STAFFLINK_DERIVATIVE_TIMEOUT_SECONDS)
+
+
+def generate_derivatives(blob: models.StoredBlob) -> list[models.BlobDerivative]:
+    """Genera (o reutiliza) las derivadas de `blob`; [] si el tipo no aplica."""
+
+    if not supports(blob.content_type):
+        return []
+    existing = list(blob.derivatives.all())
+    if {d.name for d in existing} >= {spec.name for spec in SPECS}:
+        return existing
+
+    storage = get_storage_client()
+    handle = storage.open(blob.path)
+    try:
+        source = handle.read()
+    finally:
+        handle.close()
+    renditions = _render(source, blob.content_type)
+
+    derivatives = []
+    written: list[str] = []
+    try:
+        for rendition in renditions:
+            path = storage.save(
+                io.BytesIO(rendition.data),
+                destination=derivative_path(blob.sha256, rendition.name),
+                content_type=rendition.content_type,
+            )
+            written.append(path)
+            derivatives.append(
+                models.BlobDerivative(
+                    blob=blob,
+                    name=rendition.name,
+                    path=path,
+                    size=len(rendition.data),
+                    content_type=rendition.content_type,
+                    width=rendition.width,
+                    height=rendition.height,
+                )
+            )
+        with transaction.atomic():
+            # Bloquea el blob: `release_blob` espera a que terminemos
+            locked = models.StoredBlob.objects.select_for_update().filter(pk=blob.pk)
+            if not locked.exists():
+                # El blob se liberó mientras se renderizaba
+                raise models.StoredBlob.DoesNotExist(blob.pk)
+            models.BlobDerivative.objects.bulk_create(
+                derivatives,
+                update_conflicts=True,
+                unique_fields=["blob", "name"],
+                update_fields=["path", "size", "content_type", "width", "height"],
+            )
+    except BaseException:
+        for path in written:
+            storage.delete(path)
+        raise
+    return derivatives
+
+
+@register_handler("document.upload")
+def on_document_uploaded(event: models.OutboxEvent) -> None:
+    blob = models.StoredBlob.objects.filter(pk=event.payload.get("sha256")).first()
+    if blob is None:
+        return
+    try:
+        generate_derivatives(blob)
+    except (ImagingError, FutureTimeout) as exc:
+        # Archivo dañado, sin herramientas de render o que agota el tiempo
+        # (el render sigue ocupando el pool): reintentar no ayuda
+        logger.warning("Sin derivadas para %s: %s", blob.sha256, exc)
+    except models.StoredBlob.DoesNotExist:
+        return
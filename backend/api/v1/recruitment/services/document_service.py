@@ -0,0 +1,248 @@
+"""Subida de archivos del checklist documental.
+
+El cuerpo de la petición se lee por bloques directo hacia el storage: los
+primeros bytes se validan antes de escribir nada y el límite de tamaño se
+aplica mientras se transmite, así una subida inválida se corta sin pasar por
+un archivo temporal de Django. Al terminar se marca el `<tipo>_entregado`
+correspondiente con `candidate_service.update_documents` (auditoría y
+outbox incluidos).
+
+Con `request_direct_upload` el postulante sube el archivo directo al storage
+con una URL prefirmada y el worker solo atiende metadatos: el ticket firmado
+que recibe recuerda ruta, tamaño y SHA-256 declarados, y
+`complete_direct_upload` los verifica contra lo que quedó en el storage
+antes de registrar el blob. Completar dos veces el mismo ticket devuelve el
+documento ya registrado. Un ticket que nunca se completa deja su objeto
+huérfano bajo `blobs/` hasta una limpieza periódica.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import BinaryIO
+
+from django.conf import settings
+from django.core import signing
+from django.db import transaction
+from rest_framework import serializers
+
+from integrations.storage.base import PresignedRequest, StorageError
+
+from .. import models
+from ..storage import get_storage_client
+from ..validators.file_validator import (
+    SNIFF_BYTES,
+    StreamingFileValidator,
+    sniff_file_type,
+)
+from . import blob_service, candidate_service, outbox_service
+
+UPLOAD_TOKEN_SALT = "recruitment.documents.upload"
+DIRECT_UPLOAD_SALT = "recruitment.documents.direct-upload"
+
+
+@dataclass(frozen=True)
+class DirectUpload:
+    request: PresignedRequest
+    ticket: str
+    expires_in: int
+
+
+def make_upload_token(candidate: models.Candidate) -> str:
+    """Token firmado para que el postulante suba sus documentos."""
+
+    return signing.dumps(str(candidate.pk), salt=UPLOAD_TOKEN_SALT)
+
+
+def check_upload_token(token: str, candidate_id: object) -> bool:
+    try:
+        value = signing.loads(
+            token,
+            salt=UPLOAD_TOKEN_SALT,
+            max_age=settings.STAFFLINK_PUBLIC_UPLOAD_TOKEN_TTL_SECONDS,
+        )
+    except signing.BadSignature:
+        return False
+    return value == str(candidate_id)
+
+
+def upload_document(
+    *,
+    candidate: models.Candidate,
+    kind: str,
+    stream: BinaryIO,
+    filename: str = "",
+    actor_id: str | None = None,
+) -> models.CandidateDocumentFile:
+    """Guarda el archivo de `kind` (reemplazando el anterior) y marca el ítem."""
+
+    reader = StreamingFileValidator(stream)
+    content_type = reader.sniff()
+    blob = blob_service.store_blob(reader, content_type=content_type)
+    return _attach_blob(
+        candidate=candidate,
+        kind=kind,
+        blob=blob,
+        filename=filename,
+        actor_id=actor_id,
+    )
+
+
+def request_direct_upload(
+    *,
+    candidate: models.Candidate,
+    kind: str,
+    size: int,
+    sha256: str,
+    content_type: str,
+    filename: str = "",
+) -> DirectUpload:
+    """Firma la subida directa al storage de un archivo ya descrito."""
+
+    if size > settings.STAFFLINK_UPLOAD_MAX_SIZE_BYTES:
+        raise serializers.ValidationError(
+            {"size": ["El archivo excede el tamaño permitido."]}
+        )
+    expires_in = settings.STAFFLINK_PRESIGNED_URL_TTL_SECONDS
+    destination = blob_service.new_blob_path()
+    try:
+        request = get_storage_client().presigned_put(
+            destination,
+            content_type=content_type,
+            expires_in=expires_in,
+            sha256=sha256,
+            size=size,
+        )
+    except StorageError as exc:
+        raise serializers.ValidationError({"non_field_errors": [str(exc)]}) from exc
+    ticket = signing.dumps(
+        {
+            "candidate": str(candidate.pk),
+            "kind": kind,
+            "path": destination,
+            "size": size,
+            "sha256": sha256,
+            "content_type": content_type,
+            "filename": filename[:255],
+        },
+        salt=DIRECT_UPLOAD_SALT,
+    )
+    return DirectUpload(request=request, ticket=ticket, expires_in=expires_in)
+
+
+def complete_direct_upload(
+    *,
+    candidate: models.Candidate,
+    kind: str,
+    ticket: str,
+    actor_id: str | None = None,
+) -> models.CandidateDocumentFile:
+    """Verifica tamaño, hash y tipo de lo subido y lo registra como documento."""
+
+    try:
+        # Margen para una subida lenta que empezó al final de la vigencia
+        upload = signing.loads(
+            ticket,
+            salt=DIRECT_UPLOAD_SALT,
+            max_age=settings.STAFFLINK_PRESIGNED_URL_TTL_SECONDS * 2,
+        )
+    except signing.BadSignature as exc:
+        raise serializers.ValidationError(
+            {"ticket": ["Ticket inválido o vencido."]}
+        ) from exc
+    if upload["candidate"] != str(candidate.pk) or upload["kind"] != kind:
+        raise serializers.ValidationError({"ticket": ["Ticket de otro documento."]})
+
+    # Reintento de un ticket ya completado: su archivo puede ser el del blob
+    existing = (
+        models.CandidateDocumentFile.objects.select_related("blob")
+        .filter(candidate=candidate, kind=kind, blob_id=upload["sha256"])
+        .first()
+    )
+    if existing is not None:
+        return existing
+
+    storage = get_storage_client()
+    try:
+        stored = storage.describe(upload["path"])
+    except StorageError as exc:
+        raise serializers.ValidationError(
+            {"file": ["No se encontró el archivo subido."]}
+        ) from exc
+    if stored.size != upload["size"] or stored.sha256 != upload["sha256"]:
+        storage.delete(stored.path)
+        raise serializers.ValidationError(
+            {"file": ["El archivo no coincide con el tamaño o hash declarados."]}
+        )
+    head = storage.open(stored.path)
+    try:
+        detected = sniff_file_type(head.read(SNIFF_BYTES))
+    finally:
+        head.close()
+    if detected is None or detected[1] != upload["content_type"]:
+        storage.delete(stored.path)
+        raise serializers.ValidationError({"file": ["Tipo de archivo no permitido."]})
+
+    blob = blob_service.adopt_blob(stored, content_type=upload["content_type"])
+    return _attach_blob(
+        candidate=candidate,
+        kind=kind,
+        blob=blob,
+        filename=upload["filename"],
+        actor_id=actor_id,
+    )
+
+
+def download_url(document: models.CandidateDocumentFile) -> str:
+    """URL prefirmada para descargar el archivo directo del storage."""
+
+    return get_storage_client().presigned_get_url(
+        document.blob.path,
+        expires_in=settings.STAFFLINK_PRESIGNED_URL_TTL_SECONDS,
+        filename=document.filename or document.kind,
+    )
+
+
+def _attach_blob(
+    *,
+    candidate: models.Candidate,
+    kind: str,
+    blob: models.StoredBlob,
+    filename: str,
+    actor_id: str | None,
+) -> models.CandidateDocumentFile:
+    """Asocia `blob` al ítem `kind` (la referencia ya fue sumada) y lo marca."""
+
+    try:
+        with transaction.atomic():
+            document = (
+                models.CandidateDocumentFile.objects.select_for_update()
+                .filter(candidate=candidate, kind=kind)
+                .first()
+            )
+            previous_sha = document.blob_id if document else None
+            if document is None:
+                document = models.CandidateDocumentFile(candidate=candidate, kind=kind)
+            document.blob = blob
+            document.filename = filename[:255]
+            document.content_type = blob.content_type
+            document.size = blob.size
+            document.uploaded_by = actor_id
+            document.save()
+            if previous_sha is not None:
+                blob_service.release_blob(previous_sha)
+            candidate_service.update_documents(
+                candidate=candidate,
+                data={document.checklist_field: True},
+                actor_id=actor_id,
+            )
+            # Miniaturas y vistas previas: ver derivative_service
+            outbox_service.publish_event(
+                "document.upload",
+                candidate.pk,
+                {"kind": kind, "sha256": blob.sha256},
+            )
+    except Exception:
+        blob_service.release_blob(blob.sha256)
+        raise
+    return document
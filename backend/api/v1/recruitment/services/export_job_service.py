@@ -0,0 +1,292 @@
+"""Exportaciones en segundo plano con checkpoint por bloques.
+
+Cada job recorre los postulantes en orden keyset `(created_at, id)` y escribe
+un archivo parcial por bloque a través de `get_storage_client()`. Tras cada
+bloque se persiste el cursor, de modo que un worker caído se retoma desde el
+último checkpoint: el bloque en curso simplemente se vuelve a escribir con el
+mismo nombre. Los jobs activos con la misma firma (filtros, solicitante y
+alcance) se deduplican; `owner_id` limita el job a las convocatorias de ese
+usuario, igual que la grilla para quien no tiene permisos globales.
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import io
+import json
+import logging
+from datetime import timedelta
+from typing import Any, Callable, Iterator, Sequence
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from api.shared.db_routing import read_db
+from integrations.smart.formatter import SmartFormatter
+
+from .. import models
+from ..storage import get_storage_client
+from . import candidate_service, export_service
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = (
+    models.ExportJob.Status.PENDIENTE,
+    models.ExportJob.Status.EN_PROCESO,
+)
+MAX_ATTEMPTS = 3
+READ_CHUNK_BYTES = 64 * 1024
+
+
+class LeaseLost(Exception):
+    """El lease del job venció y otro worker lo reclamó."""
+
+
+def compute_signature(
+    kind: str,
+    filters: dict[str, Any],
+    *,
+    actor_id: str | None = None,
+    owner_id: str | None = None,
+) -> str:
+    raw = json.dumps(
+        {"kind": kind, "filters": filters, "actor": actor_id, "owner": owner_id},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def request_job(
+    *,
+    kind: str,
+    filters: dict[str, Any],
+    actor_id: str | None,
+    owner_id: str | None = None,
+) -> tuple[models.ExportJob, bool]:
+    """Crea un job o devuelve el activo con la misma firma (created=False)."""
+
+    filters = {key: str(value) for key, value in filters.items() if value}
+    signature = compute_signature(kind, filters, actor_id=actor_id, owner_id=owner_id)
+    existing = models.ExportJob.objects.filter(
+        signature=signature, status__in=ACTIVE_STATUSES
+    ).first()
+    if existing:
+        return existing, False
+    try:
+        with transaction.atomic():
+            job = models.ExportJob.objects.create(
+                kind=kind,
+                filters=filters,
+                signature=signature,
+                created_by=actor_id,
+                owner_id=owner_id,
+            )
+    except IntegrityError:
+        # Otro request creó el mismo job en paralelo
+        job = models.ExportJob.objects.get(
+            signature=signature, status__in=ACTIVE_STATUSES
+        )
+        return job, False
+    return job, True
+
+
+def part_destination(job: models.ExportJob, index: int) -> str:
+    return f"exports/{job.pk}/part-{index:05d}.csv"
+
+
+def _scoped(job: models.ExportJob, qs):
+    if job.owner_id:
+        qs = qs.filter(link__user_id=job.owner_id)
+    return qs.using(read_db())
+
+
+def _source(
+    job: models.ExportJob,
+) -> tuple[
+    Any, Sequence[str], Sequence[str] | None, Callable[[dict[str, Any]], list[Any]]
+]:
+    """Queryset ordenado, campos a leer, encabezado (o None) y formateador.
+
+    Lee de la réplica si hay una: el job se pidió antes de procesarse, así que
+    unos segundos de retraso no cambian el resultado.
+    """
+
+    if job.kind == models.ExportJob.Kind.SMART:
+        formatter = SmartFormatter()
+        qs = _scoped(job, export_service.smart_queryset(**job.filters))
+        return (
+            qs,
+            export_service.SMART_FIELDS,
+            formatter.columns if settings.STAFFLINK_SMART_HEADER else None,
+            lambda row: formatter.format_row(export_service.smart_applicant(row)),
+        )
+    lookups = [lookup for _, lookup in export_service.CANDIDATE_EXPORT_COLUMNS]
+    headers = [header for header, _ in export_service.CANDIDATE_EXPORT_COLUMNS]
+    qs = _scoped(
+        job, candidate_service.apply_filters(models.Candidate.objects, job.filters)
+    ).order_by("created_at", "pk")
+    return qs, lookups, headers, lambda row: [row[lookup] for lookup in lookups]
+
+
+def claim_next_job() -> models.ExportJob | None:
+    """Toma un job pendiente o uno en proceso cuyo worker dejó de latir."""
+
+    lease = timedelta(seconds=settings.STAFFLINK_EXPORT_JOB_LEASE_SECONDS)
+    stale = timezone.now() - lease
+    with transaction.atomic():
+        job = (
+            models.ExportJob.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=models.ExportJob.Status.PENDIENTE)
+                | Q(status=models.ExportJob.Status.EN_PROCESO, heartbeat_at__lt=stale)
+            )
+            .order_by("created_at")
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = models.ExportJob.Status.EN_PROCESO
+        job.heartbeat_at = timezone.now()
+        job.attempts += 1
+        job.save(update_fields=["status", "heartbeat_at", "attempts", "updated_at"])
+    return job
+
+
+def _plain_cell(value: Any) -> Any:
+    return "" if value is None else value
+
+
+def _write_part(job: models.ExportJob, rows: list[list[Any]], header) -> None:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if job.parts == 0:
+        if job.kind == models.ExportJob.Kind.CANDIDATES:
+            buffer.write("\ufeff")
+        if header:
+            writer.writerow(header)
+    if job.kind == models.ExportJob.Kind.CANDIDATES:
+        # Misma grilla que la descarga directa: se abre en una planilla
+        cell = export_service.csv_cell
+    else:
+        cell = _plain_cell
+    writer.writerows([cell(value) for value in row] for row in rows)
+    payload = io.BytesIO(buffer.getvalue().encode("utf-8"))
+    get_storage_client().save(
+        payload,
+        destination=part_destination(job, job.parts + 1),
+        content_type="text/csv",
+    )
+
+
+def _checkpoint(job: models.ExportJob, **fields: Any) -> None:
+    """Persiste `fields` solo si el job sigue siendo de este worker.
+
+    `attempts` actúa de token de fencing: si el lease venció y otro worker
+    reclamó el job, el intento ya no coincide y se lanza `LeaseLost`.
+    """
+
+    fields["updated_at"] = timezone.now()
+    fenced = models.ExportJob.objects.filter(pk=job.pk, attempts=job.attempts)
+    if not fenced.update(**fields):
+        raise LeaseLost(f"El job {job.pk} fue reclamado por otro worker")
+    for name, value in fields.items():
+        setattr(job, name, value)
+
+
+def process_job(job: models.ExportJob, *, max_chunks: int | None = None) -> bool:
+    """Procesa bloques del job desde su checkpoint.
+
+    Devuelve True si el job quedó completado. `max_chunks` permite trabajar en
+    tramos (p. ej. para repartir el tiempo del worker). Si otro worker reclamó
+    el job, este deja de escribir en el primer checkpoint y devuelve False.
+    """
+
+    chunk_size = settings.STAFFLINK_EXPORT_JOB_CHUNK_SIZE
+    qs, fields, header, to_row = _source(job)
+    values = list(dict.fromkeys([*fields, "id", "created_at"]))
+    chunks = 0
+    try:
+        while max_chunks is None or chunks < max_chunks:
+            page = qs
+            if job.cursor_created_at is not None:
+                page = page.filter(
+                    Q(created_at__gt=job.cursor_created_at)
+                    | Q(created_at=job.cursor_created_at, pk__gt=job.cursor_id)
+                )
+            batch = list(page.values(*values)[:chunk_size])
+            if not batch and job.parts > 0:
+                _finish(job)
+                return True
+            _write_part(job, [to_row(row) for row in batch], header)
+            last = batch[-1] if batch else None
+            progress = {
+                "parts": job.parts + 1,
+                "rows_written": job.rows_written + len(batch),
+                "heartbeat_at": timezone.now(),
+            }
+            if last:
+                progress["cursor_created_at"] = last["created_at"]
+                progress["cursor_id"] = last["id"]
+            _checkpoint(job, **progress)
+            chunks += 1
+            if len(batch) < chunk_size:
+                _finish(job)
+                return True
+    except LeaseLost:
+        logger.warning("Export job %s lost its lease; abandoning", job.pk)
+        return False
+    except Exception as exc:
+        logger.exception("Export job %s failed", job.pk)
+        try:
+            _checkpoint(
+                job,
+                error=str(exc),
+                status=(
+                    models.ExportJob.Status.FALLIDO
+                    if job.attempts >= MAX_ATTEMPTS
+                    else models.ExportJob.Status.PENDIENTE
+                ),
+            )
+        except LeaseLost:
+            pass
+        raise
+    return False
+
+
+def _finish(job: models.ExportJob) -> None:
+    _checkpoint(
+        job,
+        status=models.ExportJob.Status.COMPLETADO,
+        finished_at=timezone.now(),
+        error="",
+    )
+
+
+def run_pending(*, limit: int | None = None) -> int:
+    """Procesa jobs hasta vaciar la cola (o `limit`). Devuelve cuántos tomó."""
+
+    processed = 0
+    while limit is None or processed < limit:
+        job = claim_next_job()
+        if job is None:
+            break
+        processed += 1
+        try:
+            process_job(job)
+        except Exception:  # ya registrado en process_job
+            continue
+    return processed
+
+
+def iter_result(job: models.ExportJob) -> Iterator[bytes]:
+    """Concatena las partes del job en streaming para la descarga."""
+
+    storage = get_storage_client()
+    for index in range(1, job.parts + 1):
+        with storage.open(part_destination(job, index)) as handle:
+            while chunk := handle.read(READ_CHUNK_BYTES):
+                yield chunk
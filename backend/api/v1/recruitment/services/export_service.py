@@ -0,0 +1,304 @@
+"""Servicios de exportación (lotes Smart Boleta y grilla de postulantes)."""
+
+from __future__ import annotations
+
+import csv
+import secrets
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Iterable, Iterator, Sequence
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from api.shared.db_routing import read_db
+from integrations.smart.client import SmartClient
+from integrations.smart.formatter import SmartFormatter
+
+from .. import models
+
+SMART_EXPORT_CHUNK_SIZE = 2000
+CANDIDATE_EXPORT_CHUNK_SIZE = 2000
+
+# (encabezado, lookup) de la grilla de postulantes. Los campos de proceso y
+# contrato se resuelven con LEFT JOIN en la misma consulta.
+CANDIDATE_EXPORT_COLUMNS: tuple[tuple[str, str], ...] = (
+    ("convocatoria", "link__titulo"),
+    ("grupo", "link__grupo"),
+    ("campaña", "link__campaign__nombre"),
+    ("tipo_documento", "tipo_documento"),
+    ("numero_documento", "numero_documento"),
+    ("apellido_paterno", "apellido_paterno"),
+    ("apellido_materno", "apellido_materno"),
+    ("nombres_completos", "nombres_completos"),
+    ("telefono", "telefono"),
+    ("email", "email"),
+    ("distrito", "distrito"),
+    ("enteraste_oferta", "enteraste_oferta"),
+    ("modalidad", "modalidad"),
+    ("condicion", "condicion"),
+    ("hora_gestion", "hora_gestion"),
+    ("descanso", "descanso"),
+    ("inicio_capacitacion_at", "process__inicio_capacitacion_at"),
+    ("fin_capacitacion_at", "process__fin_capacitacion_at"),
+    ("estado_dia0", "process__estado_dia0"),
+    ("estado_dia1", "process__estado_dia1"),
+    ("estado_personal", "process__status_final"),
+    ("estado_contrato", "assignment__estado"),
+    ("tipo_contratacion", "assignment__tipo_contratacion"),
+    ("razon_social", "assignment__razon_social"),
+    ("cargo_contractual", "assignment__cargo_contractual"),
+    ("fecha_inicio", "assignment__fecha_inicio"),
+    ("fecha_fin", "assignment__fecha_fin"),
+    ("created_at", "created_at"),
+)
+
+SMART_FIELDS = (
+    "numero_documento",
+    "apellido_paterno",
+    "apellido_materno",
+    "nombres_completos",
+    "link__campaign__nombre",
+)
+
+
+@dataclass(frozen=True)
+class SmartExportResult:
+    batch_code: str
+    file_name: str
+    # Ruta en el servidor: solo para la línea de comandos, no se expone en la API
+    file_path: str
+    rows: int
+    bytes: int
+    sha256: str
+    # Ventana (since, until] de un exporte incremental; None en exportes completos
+    since: datetime | None = None
+    until: datetime | None = None
+
+
+def smart_queryset(
+    *,
+    campaign_id: Any = None,
+    periodo: str | None = None,
+    convocatoria_id: Any = None,
+) -> QuerySet[models.Candidate]:
+    qs = models.Candidate.objects.all()
+    if campaign_id:
+        qs = qs.filter(link__campaign_id=campaign_id)
+    if periodo:
+        qs = qs.filter(link__periodo=periodo)
+    if convocatoria_id:
+        qs = qs.filter(link_id=convocatoria_id)
+    return qs.order_by("created_at", "pk")
+
+
+def smart_target(
+    *,
+    campaign_id: Any = None,
+    periodo: str | None = None,
+    convocatoria_id: Any = None,
+) -> str:
+    """Clave del destino Smart cuyo watermark se persiste."""
+
+    scope = {
+        "campaign": campaign_id,
+        "periodo": periodo,
+        "convocatoria": convocatoria_id,
+    }
+    parts = [f"{key}={value}" for key, value in scope.items() if value]
+    return "smart|" + "|".join(parts)
+
+
+def changed_candidate_ids(since: datetime | None, until: datetime) -> QuerySet:
+    """Ids de postulantes con cambios en la ficha, el proceso o el contrato.
+
+    Son tres rangos sobre `updated_at` (cada uno con su índice) unidos con
+    UNION; se usa como subconsulta `pk__in` y nunca se materializa en Python.
+    """
+
+    def window(qs: QuerySet) -> QuerySet:
+        qs = qs.filter(updated_at__lte=until)
+        if since is not None:
+            qs = qs.filter(updated_at__gt=since)
+        return qs.order_by()
+
+    return (
+        window(models.Candidate.objects.all())
+        .values("pk")
+        .union(
+            window(models.CandidateProcess.objects.all()).values("candidate_id"),
+            window(models.CandidateAssignment.objects.all()).values("candidate_id"),
+        )
+    )
+
+
+def _full_name(row: dict[str, Any]) -> str:
+    parts = (
+        row["apellido_paterno"],
+        row["apellido_materno"],
+        row["nombres_completos"],
+    )
+    return " ".join(part.strip() for part in parts if part and part.strip())
+
+
+def smart_applicant(row: dict[str, Any]) -> dict[str, str]:
+    """Convierte una fila de `SMART_FIELDS` al mapping que usa SmartFormatter."""
+
+    return {
+        "document_number": row["numero_documento"],
+        "full_name": _full_name(row),
+        "campaign": row["link__campaign__nombre"] or "",
+    }
+
+
+def iter_smart_applicants(qs: QuerySet[models.Candidate]) -> Iterator[dict[str, str]]:
+    """Recorre los postulantes con un cursor del lado del servidor.
+
+    `.iterator()` en PostgreSQL usa un cursor con nombre y trae los registros
+    por bloques, por lo que la memoria no depende del tamaño del lote.
+    """
+
+    rows = qs.values(*SMART_FIELDS).iterator(chunk_size=SMART_EXPORT_CHUNK_SIZE)
+    for row in rows:
+        yield smart_applicant(row)
+
+
+def _batch_code(prefix: str | None) -> str:
+    # El sufijo aleatorio evita que dos lotes del mismo segundo se pisen
+    stamp = f"{timezone.now():%Y%m%d%H%M%S}-{secrets.token_hex(3)}"
+    return f"SMART-{prefix}-{stamp}" if prefix else f"SMART-{stamp}"
+
+
+def export_smart_batch(
+    *,
+    campaign_id: Any = None,
+    periodo: str | None = None,
+    convocatoria_id: Any = None,
+    batch_code: str | None = None,
+    incremental: bool = False,
+) -> SmartExportResult:
+    """Genera el archivo Smart en `STAFFLINK_EXPORT_OUTPUT_DIR` en streaming.
+
+    Con `incremental=True` solo se exportan los postulantes que cambiaron
+    desde el último lote exitoso del mismo destino y, al terminar, se avanza
+    su watermark. El corte superior se atrasa `STAFFLINK_SMART_DELTA_LAG_SECONDS`
+    para no perder filas de transacciones que aún no confirmaban.
+    """
+
+    scope = {
+        "campaign_id": campaign_id,
+        "periodo": periodo,
+        "convocatoria_id": convocatoria_id,
+    }
+    qs = smart_queryset(**scope)
+    since = until = None
+    target = smart_target(**scope)
+    if incremental:
+        watermark = models.ExportWatermark.objects.filter(target=target).first()
+        since = watermark.watermark_at if watermark else None
+        until = timezone.now() - timedelta(
+            seconds=settings.STAFFLINK_SMART_DELTA_LAG_SECONDS
+        )
+        qs = qs.filter(pk__in=changed_candidate_ids(since, until))
+    else:
+        # El lote completo puede leer de la réplica; el incremental no, porque
+        # una fila aún no replicada antes de `until` quedaría fuera del
+        # watermark para siempre.
+        qs = qs.using(read_db())
+    if not batch_code:
+        campaign = (
+            models.Campaign.objects.filter(pk=campaign_id).first()
+            if campaign_id
+            else None
+        )
+        batch_code = _batch_code(campaign.codigo if campaign else periodo)
+
+    formatter = SmartFormatter()
+    client = SmartClient(
+        output_dir=settings.STAFFLINK_EXPORT_OUTPUT_DIR,
+        compression=settings.STAFFLINK_SMART_COMPRESSION,
+    )
+    manifest = client.save_batch(
+        batch_code,
+        formatter.iter_rows(iter_smart_applicants(qs)),
+        header=formatter.columns if settings.STAFFLINK_SMART_HEADER else None,
+    )
+    if incremental:
+        _advance_watermark(target, until, batch_code, manifest.rows)
+    return SmartExportResult(
+        batch_code=batch_code,
+        file_name=manifest.file_name,
+        file_path=str(client.output_dir / manifest.file_name),
+        rows=manifest.rows,
+        bytes=manifest.bytes,
+        sha256=manifest.sha256,
+        since=since,
+        until=until,
+    )
+
+
+def _advance_watermark(
+    target: str, until: datetime, batch_code: str, rows: int
+) -> None:
+    """Avanza el watermark sin retrocederlo si otro lote terminó después."""
+
+    with transaction.atomic():
+        watermark, created = (
+            models.ExportWatermark.objects.select_for_update().get_or_create(
+                target=target,
+                defaults={
+                    "watermark_at": until,
+                    "last_batch_code": batch_code,
+                    "last_rows": rows,
+                },
+            )
+        )
+        if created or watermark.watermark_at >= until:
+            return
+        watermark.watermark_at = until
+        watermark.last_batch_code = batch_code
+        watermark.last_rows = rows
+        watermark.save()
+
+
+def iter_candidate_rows(qs: QuerySet[models.Candidate]) -> Iterator[Sequence[Any]]:
+    """Encabezado + filas de la grilla en una sola consulta por bloques."""
+
+    yield [header for header, _ in CANDIDATE_EXPORT_COLUMNS]
+    lookups = [lookup for _, lookup in CANDIDATE_EXPORT_COLUMNS]
+    yield from qs.values_list(*lookups).iterator(
+        chunk_size=CANDIDATE_EXPORT_CHUNK_SIZE
+    )
+
+
+# Excel/LibreOffice evalúan como fórmula una celda que empieza con estos
+# caracteres: un nombre "=HYPERLINK(...)" cargado en el formulario público se
+# ejecutaría al abrir la exportación.
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def csv_cell(value: Any) -> Any:
+    """Valor listo para una celda CSV: vacío para None, texto sin fórmulas."""
+
+    if value is None:
+        return ""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+class _Echo:
+    """Pseudo-buffer para que `csv.writer` devuelva cada línea escrita."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def iter_csv(rows: Iterable[Sequence[Any]]) -> Iterator[str]:
+    writer = csv.writer(_Echo())
+    # BOM para que Excel detecte UTF-8 al abrir el archivo
+    yield "\ufeff"
+    for row in rows:
+        yield writer.writerow([csv_cell(value) for value in row])
@@ -0,0 +1,130 @@
+"""Notificaciones por correo a partir de eventos del outbox.
+
+Para activarlas, agregar este módulo a `STAFFLINK_OUTBOX_HANDLER_MODULES`:
+el relay llama a los handlers fuera del request y reintenta si fallan.
+
+El cierre de una convocatoria no envía nada por sí mismo: reparte a sus
+postulantes en eventos `notification.convocatoria_closed` de hasta
+`NOTIFY_CHUNK_SIZE` destinatarios. Cada uno se envía sobre una conexión y,
+si algunos fallan, se reencola solo a esos con backoff. Un relay caído a
+mitad de un bloque reenvía como mucho ese bloque, no toda la convocatoria.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Iterable, Iterator
+
+from django.conf import settings
+
+from integrations.notifications.email_client import (
+    EmailBatchResult,
+    EmailClient,
+    Recipient,
+)
+
+from .. import models
+from ..signals import register_handler
+from . import outbox_service
+
+logger = logging.getLogger(__name__)
+
+CLOSED_STATES = {models.Link.Estado.EXPIRADO, models.Link.Estado.REVOCADO}
+CLOSED_NOTIFICATION = "notification.convocatoria_closed"
+NOTIFY_CHUNK_SIZE = 100
+
+
+def _applicants(
+    link: models.Link, candidate_ids: Iterable[str] | None = None
+) -> Iterator[Recipient]:
+    rows = models.Candidate.objects.filter(link=link).exclude(email="")
+    if candidate_ids is not None:
+        rows = rows.filter(pk__in=list(candidate_ids))
+    rows = (
+        rows.order_by("pk")
+        .values_list("pk", "email", "nombres_completos")
+        .iterator(chunk_size=500)
+    )
+    for pk, email, nombres in rows:
+        yield Recipient(email=email, context={"nombres": nombres, "id": str(pk)})
+
+
+def notify_convocatoria_closed(
+    link: models.Link,
+    *,
+    candidate_ids: Iterable[str] | None = None,
+    client: EmailClient | None = None,
+) -> EmailBatchResult:
+    """Avisa a los postulantes que la convocatoria dejó de recibir postulaciones."""
+
+    return (client or EmailClient()).send_many(
+        _applicants(link, candidate_ids),
+        subject_template="recruitment/email/convocatoria_cerrada_subject.txt",
+        body_template="recruitment/email/convocatoria_cerrada_body.txt",
+        context={"convocatoria": link},
+    )
+
+
+def _closed_link(link_id: str) -> models.Link | None:
+    link = models.Link.objects.filter(pk=link_id).first()
+    if link is None or link.estado not in CLOSED_STATES:
+        # Borrada o reabierta antes de que el relay llegara al evento
+        return None
+    return link
+
+
+@register_handler("convocatoria.status", "convocatoria.expire")
+def on_convocatoria_closed(event: models.OutboxEvent) -> None:
+    if event.payload.get("estado") not in CLOSED_STATES:
+        return
+    link = _closed_link(event.aggregate_id)
+    if link is None:
+        return
+    # Idempotente: si el relay se cayó tras repartir, no repartir de nuevo
+    if models.OutboxEvent.objects.filter(
+        event_type=CLOSED_NOTIFICATION,
+        aggregate_id=str(link.pk),
+        payload__source=event.pk,
+    ).exists():
+        return
+    ids = [recipient.context["id"] for recipient in _applicants(link)]
+    chunks = [
+        ids[start : start + NOTIFY_CHUNK_SIZE]
+        for start in range(0, len(ids), NOTIFY_CHUNK_SIZE)
+    ]
+    outbox_service.publish_events(
+        CLOSED_NOTIFICATION,
+        ((link.pk, {"source": event.pk, "candidates": chunk}) for chunk in chunks),
+    )
+
+
+@register_handler(CLOSED_NOTIFICATION)
+def on_closed_notification(event: models.OutboxEvent) -> None:
+    link = _closed_link(event.aggregate_id)
+    if link is None:
+        return
+    result = notify_convocatoria_closed(
+        link, candidate_ids=event.payload.get("candidates", [])
+    )
+    if result.failed and not result.sent:
+        # Nada salió: reintentar el bloque completo con el backoff del outbox
+        raise RuntimeError(f"Sin envíos para la convocatoria {link.pk}")
+    if not result.failed:
+        return
+    # Reintentar el bloque reenviaría a quienes ya recibieron el correo
+    failed = {email for email, _ in result.failed}
+    retry = int(event.payload.get("retry", 0)) + 1
+    if retry >= settings.STAFFLINK_OUTBOX_MAX_ATTEMPTS:
+        logger.error("Convocatoria %s: %s correos fallidos", link.pk, len(failed))
+        return
+    pending = [
+        recipient.context["id"]
+        for recipient in _applicants(link, event.payload.get("candidates", []))
+        if recipient.email in failed
+    ]
+    outbox_service.publish_event(
+        CLOSED_NOTIFICATION,
+        link.pk,
+        {"source": event.payload.get("source"), "candidates": pending, "retry": retry},
+        delay=outbox_service.backoff(retry),
+    )
@@ -0,0 +1,187 @@
+"""Outbox transaccional de eventos de dominio.
+
+`publish_event` inserta el evento dentro de la transacción del servicio que
+muta los datos: si la mutación se revierte, el evento también. `relay_batch`
+reclama lotes pendientes con SKIP LOCKED en una transacción corta que solo
+corre su `available_at` al fin del lease (`STAFFLINK_OUTBOX_LEASE_SECONDS`):
+así varios relays pueden correr en paralelo sin repartir el mismo evento y
+los handlers de `signals.py` se ejecutan fuera de esa transacción, sin
+retener locks mientras hablan con servicios externos. El resultado se
+registra evento por evento, condicionado al lease reclamado; un relay caído
+deja sus eventos disponibles de nuevo cuando el lease vence. Un handler que
+falla reprograma el evento con backoff exponencial hasta
+`STAFFLINK_OUTBOX_MAX_ATTEMPTS`.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Iterable
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from api.shared.audit import snapshot_payload
+
+from .. import models, signals
+
+logger = logging.getLogger(__name__)
+
+
+def _event(
+    event_type: str, aggregate_id: object, payload: dict[str, Any] | None
+) -> models.OutboxEvent:
+    return models.OutboxEvent(
+        event_type=event_type,
+        aggregate_type=event_type.split(".", 1)[0],
+        aggregate_id=str(aggregate_id),
+        payload=snapshot_payload(payload),
+    )
+
+
+def publish_event(
+    event_type: str,
+    aggregate_id: object,
+    payload: dict[str, Any] | None = None,
+    *,
+    delay: timedelta | None = None,
+) -> models.OutboxEvent:
+    """Encola `event_type` (`<agregado>.<acción>`) en la transacción actual.
+
+    Con `delay` el relay no lo entrega antes de ese plazo.
+    """
+
+    event = _event(event_type, aggregate_id, payload)
+    if delay:
+        event.available_at = timezone.now() + delay
+    event.save(force_insert=True)
+    return event
+
+
+def publish_events(
+    event_type: str, items: Iterable[tuple[object, dict[str, Any] | None]]
+) -> int:
+    """Encola un evento por (aggregate_id, payload) con un único INSERT."""
+
+    events = [_event(event_type, pk, payload) for pk, payload in items]
+    models.OutboxEvent.objects.bulk_create(events, batch_size=500)
+    return len(events)
+
+
+@dataclass
+class RelayResult:
+    published: int = 0
+    retried: int = 0
+    failed: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.published + self.retried + self.failed
+
+
+def _dispatch(event: models.OutboxEvent) -> None:
+    for handler in signals.handlers_for(event.event_type):
+        # Fuera del claim, cada handler corre en su propia transacción: lo que
+        # escribe se confirma o se revierte solo, sin afectar al resto del lote
+        with transaction.atomic():
+            handler(event)
+
+
+def backoff(attempts: int) -> timedelta:
+    base = settings.STAFFLINK_OUTBOX_RETRY_SECONDS
+    return timedelta(seconds=min(base * 2 ** (attempts - 1), 6 * 3600))
+
+
+def _claim(batch_size: int) -> tuple[list[models.OutboxEvent], datetime]:
+    """Reclama hasta `batch_size` eventos; devuelve los eventos y su lease."""
+
+    now = timezone.now()
+    leased_until = now + timedelta(seconds=settings.STAFFLINK_OUTBOX_LEASE_SECONDS)
+    with transaction.atomic():
+        events = list(
+            models.OutboxEvent.objects.select_for_update(skip_locked=True)
+            .filter(status=models.OutboxEvent.Status.PENDIENTE, available_at__lte=now)
+            .order_by("available_at", "id")[:batch_size]
+        )
+        if events:
+            models.OutboxEvent.objects.filter(
+                pk__in=[event.pk for event in events]
+            ).update(available_at=leased_until)
+    return events, leased_until
+
+
+def _record(event: models.OutboxEvent, leased_until: datetime, **fields: Any) -> bool:
+    """Guarda el resultado si el lease sigue siendo de este relay."""
+
+    updated = models.OutboxEvent.objects.filter(
+        pk=event.pk,
+        status=models.OutboxEvent.Status.PENDIENTE,
+        available_at=leased_until,
+    ).update(**fields)
+    if not updated:
+        logger.warning("Evento %s reclamado por otro relay", event.pk)
+    return bool(updated)
+
+
+def relay_batch(*, batch_size: int | None = None) -> RelayResult:
+    """Entrega un lote de eventos pendientes en orden de creación."""
+
+    batch_size = batch_size or settings.STAFFLINK_OUTBOX_BATCH_SIZE
+    result = RelayResult()
+    events, leased_until = _claim(batch_size)
+    for event in events:
+        try:
+            _dispatch(event)
+        except Exception as exc:
+            attempts = event.attempts + 1
+            fields: dict[str, Any] = {
+                "attempts": attempts,
+                "last_error": f"{type(exc).__name__}: {exc}"[:2000],
+            }
+            if attempts >= settings.STAFFLINK_OUTBOX_MAX_ATTEMPTS:
+                fields["status"] = models.OutboxEvent.Status.FALLIDO
+            else:
+                fields["available_at"] = timezone.now() + backoff(attempts)
+            if not _record(event, leased_until, **fields):
+                continue
+            if "status" in fields:
+                result.failed += 1
+                logger.exception("Evento %s descartado", event.pk)
+            else:
+                result.retried += 1
+                logger.warning("Evento %s reprogramado: %s", event.pk, exc)
+        else:
+            if _record(
+                event,
+                leased_until,
+                status=models.OutboxEvent.Status.PUBLICADO,
+                published_at=timezone.now(),
+            ):
+                result.published += 1
+    return result
+
+
+def relay_pending(*, batch_size: int | None = None) -> RelayResult:
+    """Vacía la cola disponible; devuelve el acumulado de todos los lotes."""
+
+    total = RelayResult()
+    while True:
+        result = relay_batch(batch_size=batch_size)
+        total.published += result.published
+        total.retried += result.retried
+        total.failed += result.failed
+        if not result.total:
+            return total
+
+
+def purge_published(*, older_than: timedelta) -> int:
+    """Borra eventos ya publicados (la tabla es una cola, no un histórico)."""
+
+    cutoff = timezone.now() - older_than
+    deleted, _ = models.OutboxEvent.objects.filter(
+        status=models.OutboxEvent.Status.PUBLICADO, published_at__lt=cutoff
+    ).delete()
+    return deleted
@@ -1,5 +1,60 @@
-"""Signals para auditoría y eventos del dominio de reclutamiento."""
+"""Registro de handlers para los eventos de dominio del outbox.
+
+Los servicios escriben eventos (`candidate.create`, `convocatoria.status`,
+...) en `OutboxEvent`; el relay los entrega a los handlers registrados aquí,
+fuera de la ruta del request. Un handler recibe el `OutboxEvent` y debe ser
+idempotente: la entrega es al menos una vez.
+
+    @register_handler("candidate.*")
+    def notify(event): ...
+
+Los módulos listados en `STAFFLINK_OUTBOX_HANDLER_MODULES` se importan al
+iniciar la app para que registren sus handlers.
+"""
 
 from __future__ import annotations
 
-# TODO: conectar señales post_save/post_delete cuando los servicios estén listos.
+from collections import defaultdict
+from importlib import import_module
+from typing import TYPE_CHECKING, Callable
+
+from django.conf import settings
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .models import OutboxEvent
+
+Handler = Callable[["OutboxEvent"], None]
+
+_handlers: dict[str, list[Handler]] = defaultdict(list)
+
+
+def register_handler(*event_types: str) -> Callable[[Handler], Handler]:
+    """Registra un handler para tipos exactos, prefijos (`candidate.*`) o `*`."""
+
+    def decorator(handler: Handler) -> Handler:
+        for event_type in event_types:
+            if handler not in _handlers[event_type]:
+                _handlers[event_type].append(handler)
+        return handler
+
+    return decorator
+
+
+def unregister_handler(handler: Handler) -> None:
+    for handlers in _handlers.values():
+        if handler in handlers:
+            handlers.remove(handler)
+
+
+def handlers_for(event_type: str) -> list[Handler]:
+    aggregate = event_type.split(".", 1)[0]
+    return [
+        *_handlers.get(event_type, []),
+        *_handlers.get(f"{aggregate}.*", []),
+        *_handlers.get("*", []),
+    ]
+
+
+def load_handler_modules() -> None:
+    for module in settings.STAFFLINK_OUTBOX_HANDLER_MODULES:
+        import_module(module)
@@ -16,7 +16,12 @@ def get_storage_client() -> StorageClient:
     backend = settings.STAFFLINK_STORAGE_BACKEND
     base_path = settings.STAFFLINK_STORAGE_BASE_PATH
     if backend == "s3":
-        bucket = getattr(settings, "STAFFLINK_STORAGE_BUCKET", "")
-        region = getattr(settings, "STAFFLINK_STORAGE_REGION", None)
-        return S3StorageClient(base_path, bucket=bucket, region=region)
-    return LocalStorageClient(base_path)
+        return S3StorageClient(
+            settings.STAFFLINK_STORAGE_S3_PREFIX,
+            bucket=settings.STAFFLINK_STORAGE_BUCKET,
+            region=settings.STAFFLINK_STORAGE_REGION,
+            endpoint_url=settings.STAFFLINK_STORAGE_ENDPOINT_URL,
+            part_size=settings.STAFFLINK_STORAGE_S3_PART_SIZE_MB * 1024 * 1024,
+            max_concurrency=settings.STAFFLINK_STORAGE_S3_MAX_CONCURRENCY,
+        )
+    return LocalStorageClient(base_path, url_base=settings.STAFFLINK_STORAGE_LOCAL_URL)
@@ -5,21 +5,32 @@ from __future__ import annotations
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
+from .views.audit_viewset import AuditLogViewSet
 from .views.blacklist_viewset import BlacklistViewSet
 from .views.campaign_viewset import CampaignViewSet
 from .views.candidate_viewset import CandidateViewSet
 from .views.convocatoria_viewset import ConvocatoriaViewSet
+from .views.export_viewset import ExportJobViewSet, SmartExportViewSet
 from .views.iam_views import IAMUsersView
 from .views.public_views import (
     PublicCandidateCreateView,
+    PublicCandidateDocumentUploadView,
     PublicConvocatoriaDetailView,
+    PublicDocumentUploadCompleteView,
+    PublicDocumentUploadURLView,
 )
+from .views.storage_views import LocalStorageObjectView
 
 router = DefaultRouter()
 router.register(r"campaigns", CampaignViewSet, basename="campaigns")
 router.register(r"blacklist", BlacklistViewSet, basename="blacklist")
 router.register(r"convocatorias", ConvocatoriaViewSet, basename="convocatorias")
 router.register(r"candidates", CandidateViewSet, basename="candidates")
+router.register(
+    r"exports/smart/batches", SmartExportViewSet, basename="smart-exports"
+)
+router.register(r"exports/jobs", ExportJobViewSet, basename="export-jobs")
+router.register(r"audit", AuditLogViewSet, basename="audit")
 
 public_patterns = (
     [
@@ -31,6 +42,21 @@ public_patterns = (
         path(
             "candidates", PublicCandidateCreateView.as_view(), name="public-candidate"
         ),
+        path(
+            "candidates/<uuid:pk>/documents/<slug:kind>",
+            PublicCandidateDocumentUploadView.as_view(),
+            name="public-candidate-document",
+        ),
+        path(
+            "candidates/<uuid:pk>/documents/<slug:kind>/upload-url",
+            PublicDocumentUploadURLView.as_view(),
+            name="public-candidate-document-upload-url",
+        ),
+        path(
+            "candidates/<uuid:pk>/documents/<slug:kind>/complete",
+            PublicDocumentUploadCompleteView.as_view(),
+            name="public-candidate-document-complete",
+        ),
     ],
     "public",
 )
@@ -39,4 +65,9 @@ urlpatterns = [
     path("iam/users/", IAMUsersView.as_view(), name="iam-users"),
     path("", include(router.urls)),
     path("public/", include(public_patterns)),
+    path(
+        "storage/local/<str:token>",
+        LocalStorageObjectView.as_view(),
+        name="storage-local",
+    ),
 ]
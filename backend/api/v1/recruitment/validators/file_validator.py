@@ -2,11 +2,39 @@
 
 from __future__ import annotations
 
+import io
 import os
+from typing import BinaryIO
 
 from django.conf import settings
 from rest_framework import serializers
 
+# Firmas (magic bytes) aceptadas: (prefijo, extensión, content type)
+MAGIC_SIGNATURES: tuple[tuple[bytes, str, str], ...] = (
+    (b"%PDF-", "pdf", "application/pdf"),
+    (b"\x89PNG\r\n\x1a\n", "png", "image/png"),
+    (b"\xff\xd8\xff", "jpg", "image/jpeg"),
+)
+# Bytes necesarios para reconocer cualquiera de las firmas
+SNIFF_BYTES = max(len(signature) for signature, _, _ in MAGIC_SIGNATURES)
+
+
+def _file_error(message: str) -> serializers.ValidationError:
+    return serializers.ValidationError({"file": [message]})
+
+
+def _allowed_extensions() -> set[str]:
+    allowed = {ext.lower() for ext in settings.STAFFLINK_ALLOWED_UPLOAD_EXTENSIONS}
+    # jpg y jpeg son el mismo formato
+    if allowed & {"jpg", "jpeg"}:
+        allowed |= {"jpg", "jpeg"}
+    return allowed
+
+
+def allowed_content_types() -> set[str]:
+    allowed = _allowed_extensions()
+    return {content_type for _, ext, content_type in MAGIC_SIGNATURES if ext in allowed}
+
 
 def validate_file(uploaded_file) -> None:
     max_bytes = settings.STAFFLINK_UPLOAD_MAX_SIZE_BYTES
@@ -19,3 +47,70 @@ def validate_file(uploaded_file) -> None:
     ext = ext.lstrip(".").lower()
     if ext not in allowed:
         raise serializers.ValidationError({"file": ["Tipo de archivo no permitido."]})
+
+
+def sniff_file_type(head: bytes) -> tuple[str, str] | None:
+    """(extensión, content type) según los primeros bytes, o None."""
+
+    for signature, ext, content_type in MAGIC_SIGNATURES:
+        if head.startswith(signature):
+            return ext, content_type
+    return None
+
+
+class StreamingFileValidator(io.RawIOBase):
+    """Envuelve el cuerpo de una subida validándolo mientras se lee.
+
+    `sniff()` lee solo la cabecera y rechaza el archivo si sus magic bytes no
+    corresponden a un tipo permitido; luego cada lectura suma al tamaño y
+    corta la subida en cuanto supera `max_bytes`, sin esperar al final.
+    """
+
+    def __init__(self, source: BinaryIO, *, max_bytes: int | None = None) -> None:
+        self._source = source
+        self.max_bytes = (
+            settings.STAFFLINK_UPLOAD_MAX_SIZE_BYTES if max_bytes is None else max_bytes
+        )
+        self.extension = ""
+        self.content_type = ""
+        self.size = 0
+        self._head = b""
+        self._sniffed = False
+
+    def readable(self) -> bool:
+        return True
+
+    def sniff(self) -> str:
+        """Valida la firma del archivo y devuelve su content type."""
+
+        if self._sniffed:
+            return self.content_type
+        while len(self._head) < SNIFF_BYTES:
+            data = self._source.read(SNIFF_BYTES - len(self._head))
+            if not data:
+                break
+            self._head += data
+        if not self._head:
+            raise _file_error("El archivo está vacío.")
+        detected = sniff_file_type(self._head)
+        if detected is None or detected[0] not in _allowed_extensions():
+            raise _file_error("Tipo de archivo no permitido.")
+        self.extension, self.content_type = detected
+        self._sniffed = True
+        self._count(len(self._head))
+        return self.content_type
+
+    def readinto(self, buffer) -> int:  # type: ignore[override]
+        self.sniff()
+        if self._head:
+            data, self._head = self._head[: len(buffer)], self._head[len(buffer) :]
+        else:
+            data = self._source.read(len(buffer))
+            self._count(len(data))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def _count(self, length: int) -> None:
+        self.size += length
+        if self.size > self.max_bytes:
+            raise _file_error("El archivo excede el tamaño permitido.")
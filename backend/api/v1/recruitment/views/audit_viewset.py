@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from rest_framework import viewsets
+
+from .. import models
+from ..pagination import AuditLogPagination
+from ..permissions import permission_class
+from ..serializers.audit_serializer import AuditLogFilterSerializer, AuditLogSerializer
+
+
+class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
+    """Consulta de la bitácora por entidad (`entity_type` + `entity_id`), por
+    actor y por rango de fechas; cada filtro usa uno de los índices de
+    `audit_log`."""
+
+    queryset = models.AuditLog.objects.all()
+    serializer_class = AuditLogSerializer
+    permission_classes = [permission_class("audit.read")]
+    pagination_class = AuditLogPagination
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if self.action != "list":
+            return qs
+        params = AuditLogFilterSerializer(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        filters = params.validated_data
+        for field in ("entity_type", "entity_id", "actor_id", "action"):
+            if field in filters:
+                qs = qs.filter(**{field: filters[field]})
+        if "since" in filters:
+            qs = qs.filter(created_at__gte=filters["since"])
+        if "until" in filters:
+            qs = qs.filter(created_at__lt=filters["until"])
+        return qs
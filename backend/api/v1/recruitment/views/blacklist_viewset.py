@@ -4,7 +4,9 @@ from rest_framework import viewsets
 
 from .. import models
 from ..permissions import permission_class
+from ..request_context import get_user_id
 from ..serializers.blacklist_serializer import BlacklistSerializer
+from ..services import blacklist_service
 
 
 class BlacklistViewSet(viewsets.ModelViewSet):
@@ -16,3 +18,20 @@ class BlacklistViewSet(viewsets.ModelViewSet):
         if self.action in {"create", "update", "partial_update", "destroy"}:
             return [permission_class("blacklist.manage")()]
         return super().get_permissions()
+
+    def perform_create(self, serializer):
+        serializer.instance = blacklist_service.create_entry(
+            data=serializer.validated_data, actor_id=get_user_id(self.request)
+        )
+
+    def perform_update(self, serializer):
+        serializer.instance = blacklist_service.update_entry(
+            entry=serializer.instance,
+            data=serializer.validated_data,
+            actor_id=get_user_id(self.request),
+        )
+
+    def perform_destroy(self, instance):
+        blacklist_service.delete_entry(
+            entry=instance, actor_id=get_user_id(self.request)
+        )
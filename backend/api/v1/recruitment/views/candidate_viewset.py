@@ -1,19 +1,44 @@
 from __future__ import annotations
 
-from rest_framework import decorators, response, viewsets
+from django.conf import settings
+from django.http import FileResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from rest_framework import decorators, exceptions, parsers, response, viewsets
+from rest_framework.reverse import reverse
+
+from api.shared.db_routing import read_db, read_replica
+from api.shared.xlsx import XLSX_CONTENT_TYPE, iter_xlsx
 
 from .. import models
 from ..permissions import permission_class
 from ..request_context import get_user_id
 from ..serializers.candidate_serializers import (
     CandidateAssignmentSerializer,
+    CandidateBulkUpdateResultSerializer,
+    CandidateBulkUpdateSerializer,
     CandidateDetailSerializer,
+    CandidateDocumentFileSerializer,
     CandidateDocumentsSerializer,
+    CandidateImportReportSerializer,
+    CandidateImportSerializer,
     CandidateListSerializer,
     CandidateProcessSerializer,
     CandidateWriteSerializer,
 )
-from ..services import candidate_service
+from ..services import (
+    candidate_import_service,
+    candidate_service,
+    document_service,
+    export_service,
+)
+from ..services.exceptions import CandidateError
+from ..storage import get_storage_client
+from .uploads import check_kind, upload_from_request
+
+# Las derivadas se sirven por hash: su contenido nunca cambia
+DERIVATIVE_CACHE_SECONDS = 365 * 24 * 3600
 
 
 class CandidateViewSet(viewsets.ModelViewSet):
@@ -33,21 +58,22 @@ class CandidateViewSet(viewsets.ModelViewSet):
         "update": permission_class("candidates.manage"),
         "partial_update": permission_class("candidates.manage"),
         "documents": permission_class("candidates.process"),
+        "upload_document": permission_class("candidates.process"),
+        "document_url": permission_class("candidates.process"),
+        "document_derivative": permission_class("candidates.process"),
         "process": permission_class("candidates.process"),
         "assignment": permission_class("candidates.contract"),
+        "bulk_documents": permission_class("candidates.process"),
+        "bulk_process": permission_class("candidates.process"),
+        "bulk_assignment": permission_class("candidates.contract"),
+        "export": permission_class("candidates.read", "exports.download"),
+        "bulk_import": permission_class("candidates.manage"),
     }
 
     def get_queryset(self):
-        qs = super().get_queryset()
-        params = self.request.query_params
-        if document := params.get("documento"):
-            qs = qs.filter(numero_documento__iexact=document.strip())
-        if campaign_id := params.get("campaign_id"):
-            qs = qs.filter(link__campaign_id=campaign_id)
-        if convocatoria_id := params.get("convocatoria_id"):
-            qs = qs.filter(link_id=convocatoria_id)
-        if grupo := params.get("grupo"):
-            qs = qs.filter(link__grupo__iexact=grupo.strip())
+        qs = candidate_service.apply_filters(
+            super().get_queryset(), self.request.query_params
+        )
         # Si no tiene permisos globales, limitar a convocatorias del usuario
         if not self.request or not self.request.auth:
             return qs
@@ -80,6 +106,68 @@ class CandidateViewSet(viewsets.ModelViewSet):
             return [perm()]
         return super().get_permissions()
 
+    def list(self, request, *args, **kwargs):
+        with read_replica():
+            return super().list(request, *args, **kwargs)
+
+    def perform_destroy(self, instance):
+        candidate_service.delete_candidate(
+            candidate=instance, actor_id=get_user_id(self.request)
+        )
+
+    @decorators.action(detail=False, methods=["get"], url_path="export")
+    def export(self, request):
+        """Descarga la grilla filtrada en CSV o XLSX (`?formato=`) en streaming."""
+        formato = (request.query_params.get("formato") or "csv").lower()
+        if formato not in {"csv", "xlsx"}:
+            raise exceptions.ValidationError({"formato": ["Use csv o xlsx."]})
+        # El streaming se evalúa fuera del view: el alias va fijo en el queryset
+        rows = export_service.iter_candidate_rows(
+            self.get_queryset().using(read_db())
+        )
+        if formato == "xlsx":
+            resp = StreamingHttpResponse(
+                iter_xlsx(rows, sheet_name="Postulantes"),
+                content_type=XLSX_CONTENT_TYPE,
+            )
+        else:
+            resp = StreamingHttpResponse(
+                export_service.iter_csv(rows), content_type="text/csv; charset=utf-8"
+            )
+        stamp = timezone.now().strftime("%Y%m%d%H%M%S")
+        resp["Content-Disposition"] = (
+            f'attachment; filename="postulantes-{stamp}.{formato}"'
+        )
+        return resp
+
+    @decorators.action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        parser_classes=[parsers.MultiPartParser],
+    )
+    def bulk_import(self, request):
+        """Importa postulantes desde el Excel operativo (CSV o XLSX).
+
+        Devuelve el reporte por fila; las filas válidas se crean aunque otras
+        tengan errores.
+        """
+        serializer = CandidateImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload = serializer.validated_data["archivo"]
+        try:
+            report = candidate_import_service.import_candidates(
+                link=serializer.validated_data["convocatoria"],
+                file_obj=upload.file,
+                file_format=upload.name.rsplit(".", 1)[-1].lower(),
+                actor_id=get_user_id(request),
+            )
+        except CandidateError as exc:
+            raise exceptions.ValidationError(
+                {exc.field or "non_field_errors": [str(exc)]}
+            ) from exc
+        return response.Response(CandidateImportReportSerializer(report).data)
+
     @decorators.action(detail=True, methods=["patch"], url_path="documents")
     def documents(self, request, pk=None):
         candidate = self.get_object()
@@ -88,10 +176,91 @@ class CandidateViewSet(viewsets.ModelViewSet):
         )
         serializer.is_valid(raise_exception=True)
         docs = candidate_service.update_documents(
-            candidate=candidate, data=serializer.validated_data
+            candidate=candidate,
+            data=serializer.validated_data,
+            actor_id=get_user_id(request),
         )
         return response.Response(CandidateDocumentsSerializer(docs).data)
 
+    @decorators.action(
+        detail=True,
+        methods=["put"],
+        url_path=r"documents/(?P<kind>[a-z_]+)/file",
+    )
+    def upload_document(self, request, pk=None, kind=None):
+        """Sube el archivo de un ítem del checklist y lo marca como entregado.
+
+        El cuerpo es el archivo crudo; el nombre original puede enviarse en
+        `Content-Disposition`.
+        """
+        candidate = self.get_object()
+        document = upload_from_request(
+            request, candidate=candidate, kind=kind, actor_id=get_user_id(request)
+        )
+        return response.Response(
+            {
+                "file": CandidateDocumentFileSerializer(document).data,
+                "documents": CandidateDocumentsSerializer(candidate.documents).data,
+            }
+        )
+
+    @upload_document.mapping.get
+    def document_url(self, request, pk=None, kind=None):
+        """URL prefirmada para descargar el archivo directo del storage."""
+        candidate = self.get_object()
+        document = get_object_or_404(
+            candidate.document_files.select_related("blob"), kind=check_kind(kind)
+        )
+        url = document_service.download_url(document)
+        previews = {
+            name: reverse(
+                "candidates-document-derivative",
+                args=[candidate.pk, kind, document.blob_id, name],
+                request=request,
+            )
+            for name in document.blob.derivatives.values_list("name", flat=True)
+        }
+        return response.Response(
+            {
+                "url": request.build_absolute_uri(url),
+                "expires_in": settings.STAFFLINK_PRESIGNED_URL_TTL_SECONDS,
+                "file": CandidateDocumentFileSerializer(document).data,
+                "previews": previews,
+            }
+        )
+
+    @decorators.action(
+        detail=True,
+        methods=["get"],
+        url_path=(
+            r"documents/(?P<kind>[a-z_]+)/(?P<sha256>[0-9a-f]{64})/(?P<name>[a-z]+)"
+        ),
+    )
+    def document_derivative(self, request, pk=None, kind=None, sha256=None, name=None):
+        """Miniatura o vista previa; la URL incluye el hash, así es inmutable."""
+        candidate = self.get_object()
+        derivative = get_object_or_404(
+            models.BlobDerivative,
+            blob__document_files__candidate=candidate,
+            blob__document_files__kind=check_kind(kind),
+            blob_id=sha256,
+            name=name,
+        )
+        etag = f'"{sha256}-{name}"'
+        if_none_match = request.headers.get("If-None-Match", "")
+        if etag in {tag.strip() for tag in if_none_match.split(",")}:
+            resp = HttpResponseNotModified()
+        else:
+            resp = FileResponse(
+                get_storage_client().open(derivative.path),
+                content_type=derivative.content_type,
+            )
+        resp["ETag"] = etag
+        patch_cache_control(
+            resp, private=True, max_age=DERIVATIVE_CACHE_SECONDS, immutable=True
+        )
+        return resp
+
     @decorators.action(detail=True, methods=["patch"], url_path="process")
     def process(self, request, pk=None):
         candidate = self.get_object()
@@ -115,6 +284,89 @@ class CandidateViewSet(viewsets.ModelViewSet):
         )
         serializer.is_valid(raise_exception=True)
         assignment = candidate_service.update_assignment(
-            candidate=candidate, data=serializer.validated_data
+            candidate=candidate,
+            data=serializer.validated_data,
+            actor_id=get_user_id(request),
         )
         return response.Response(CandidateAssignmentSerializer(assignment).data)
+
+    def _bulk_update(self, request, section_serializer_class, apply):
+        """Valida destinatarios y cambios, acota por `get_queryset` y aplica.
+
+        Los ids fuera del alcance del usuario (o inexistentes) se reportan
+        como `not_found` y no se tocan.
+        """
+        payload = CandidateBulkUpdateSerializer(data=request.data)
+        payload.is_valid(raise_exception=True)
+        section = section_serializer_class(
+            data=payload.validated_data["data"],
+            partial=True,
+            context=self.get_serializer_context(),
+        )
+        if not section.is_valid():
+            raise exceptions.ValidationError({"data": section.errors})
+        if not section.validated_data:
+            raise exceptions.ValidationError(
+                {"data": ["No hay campos editables para actualizar."]}
+            )
+
+        scoped = self.get_queryset().order_by()
+        requested = payload.validated_data.get("ids")
+        if requested is None:
+            limit = settings.STAFFLINK_BULK_UPDATE_MAX_CANDIDATES
+            filtered = candidate_service.apply_filters(
+                scoped, payload.validated_data["filter"]
+            )
+            requested = list(filtered.values_list("pk", flat=True)[: limit + 1])
+            if len(requested) > limit:
+                raise exceptions.ValidationError(
+                    {"filter": [f"El filtro supera el máximo de {limit} postulantes."]}
+                )
+            allowed = set(requested)
+        else:
+            allowed = set(scoped.filter(pk__in=requested).values_list("pk", flat=True))
+        updated = apply(
+            [pk for pk in requested if pk in allowed], section.validated_data
+        )
+        results = [
+            {"id": str(pk), "status": "updated" if pk in allowed else "not_found"}
+            for pk in requested
+        ]
+        return response.Response(
+            CandidateBulkUpdateResultSerializer(
+                {"updated": updated, "results": results}
+            ).data
+        )
+
+    @decorators.action(detail=False, methods=["patch"], url_path="bulk/documents")
+    def bulk_documents(self, request):
+        actor_id = get_user_id(request)
+        return self._bulk_update(
+            request,
+            CandidateDocumentsSerializer,
+            lambda ids, data: candidate_service.bulk_update_documents(
+                candidate_ids=ids, data=data, actor_id=actor_id
+            ),
+        )
+
+    @decorators.action(detail=False, methods=["patch"], url_path="bulk/process")
+    def bulk_process(self, request):
+        actor_id = get_user_id(request)
+        return self._bulk_update(
+            request,
+            CandidateProcessSerializer,
+            lambda ids, data: candidate_service.bulk_update_process(
+                candidate_ids=ids, data=data, actor_id=actor_id
+            ),
+        )
+
+    @decorators.action(detail=False, methods=["patch"], url_path="bulk/assignment")
+    def bulk_assignment(self, request):
+        actor_id = get_user_id(request)
+        return self._bulk_update(
+            request,
+            CandidateAssignmentSerializer,
+            lambda ids, data: candidate_service.bulk_update_assignment(
+                candidate_ids=ids, data=data, actor_id=actor_id
+            ),
+        )
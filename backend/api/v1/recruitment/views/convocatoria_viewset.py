@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from rest_framework import decorators, response, viewsets
 
+from api.shared.db_routing import read_replica
+
 from .. import models
 from ..permissions import permission_class, request_has_permission
 from ..request_context import get_user_id
@@ -13,7 +15,7 @@ from ..services import convocatoria_service
 
 
 class ConvocatoriaViewSet(viewsets.ModelViewSet):
-    queryset = models.Link.objects.select_related("campaign")
+    queryset = models.Link.objects.select_related("campaign", "counter")
     serializer_class = ConvocatoriaSerializer
     permission_classes: list = []
 
@@ -46,6 +48,15 @@ class ConvocatoriaViewSet(viewsets.ModelViewSet):
             return ConvocatoriaDetailSerializer
         return super().get_serializer_class()
 
+    def list(self, request, *args, **kwargs):
+        with read_replica():
+            return super().list(request, *args, **kwargs)
+
+    def perform_destroy(self, instance):
+        convocatoria_service.delete_convocatoria(
+            convocatoria=instance, actor_id=get_user_id(self.request)
+        )
+
     @decorators.action(detail=True, methods=["post"], url_path="expire")
     def expire(self, request, pk=None):
         self._assert_action_permission("convocatorias.close")
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from django.http import StreamingHttpResponse
+from rest_framework import decorators, mixins, response, status, viewsets
+from rest_framework.exceptions import PermissionDenied
+
+from .. import models
+from ..permissions import permission_class, request_has_permission
+from ..request_context import get_user_id
+from ..serializers.export_serializers import (
+    ExportJobCreateSerializer,
+    ExportJobSerializer,
+    SmartExportRequestSerializer,
+    SmartExportResultSerializer,
+)
+from ..services import export_job_service, export_service
+
+
+class SmartExportViewSet(viewsets.ViewSet):
+    permission_classes = [permission_class("exports.download")]
+
+    def create(self, request):
+        serializer = SmartExportRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        result = export_service.export_smart_batch(**serializer.validated_data)
+        return response.Response(
+            SmartExportResultSerializer(result).data, status=status.HTTP_201_CREATED
+        )
+
+
+class ExportJobViewSet(
+    mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet
+):
+    """Exportaciones en segundo plano: se encolan aquí y las procesa
+    `run_export_jobs`; la descarga está disponible al completarse.
+
+    Cada usuario ve solo sus jobs, salvo con `exports.manage`. La grilla de
+    postulantes exige además `candidates.read`; sin permisos globales sobre
+    postulantes el job queda limitado a las convocatorias del solicitante."""
+
+    queryset = models.ExportJob.objects.all()
+    serializer_class = ExportJobSerializer
+    permission_classes = [permission_class("exports.download")]
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if request_has_permission(self.request, "exports.manage"):
+            return qs
+        user_id = get_user_id(self.request)
+        if user_id:
+            return qs.filter(created_by=user_id)
+        return qs.none()
+
+    def _owner_scope(self, kind: str) -> str | None:
+        if kind == models.ExportJob.Kind.CANDIDATES and not request_has_permission(
+            self.request, "candidates.read"
+        ):
+            raise PermissionDenied("Se requiere el permiso candidates.read.")
+        if request_has_permission(
+            self.request, "candidates.manage"
+        ) or request_has_permission(self.request, "candidates.read"):
+            return None
+        owner_id = get_user_id(self.request)
+        if not owner_id:
+            raise PermissionDenied("No se pudo identificar al solicitante.")
+        return owner_id
+
+    def create(self, request):
+        serializer = ExportJobCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job, created = export_job_service.request_job(
+            **serializer.validated_data,
+            actor_id=get_user_id(request),
+            owner_id=self._owner_scope(serializer.validated_data["kind"]),
+        )
+        return response.Response(
+            ExportJobSerializer(job).data,
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+
+    @decorators.action(detail=True, methods=["get"], url_path="download")
+    def download(self, request, pk=None):
+        job = self.get_object()
+        if job.status != models.ExportJob.Status.COMPLETADO:
+            return response.Response(
+                {"detail": "La exportación aún no está lista."},
+                status=status.HTTP_409_CONFLICT,
+            )
+        resp = StreamingHttpResponse(
+            export_job_service.iter_result(job), content_type="text/csv; charset=utf-8"
+        )
+        resp["Content-Disposition"] = (
+            f'attachment; filename="{job.kind}-{job.created_at:%Y%m%d%H%M%S}.csv"'
+        )
+        return resp
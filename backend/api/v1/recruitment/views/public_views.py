@@ -1,13 +1,20 @@
 from __future__ import annotations
 
 from django.utils import timezone
-from rest_framework import generics, permissions
+from django.utils.cache import patch_cache_control
+from rest_framework import exceptions, generics, permissions, status
+from rest_framework.response import Response
 
 from .. import models
+from ..serializers.candidate_serializers import CandidateDocumentFileSerializer
 from ..serializers.public_serializers import (
+    DirectUploadCompleteSerializer,
+    DirectUploadRequestSerializer,
     PublicCandidateSerializer,
     PublicConvocatoriaSerializer,
 )
+from ..services import convocatoria_cache, document_service
+from .uploads import check_kind, direct_upload_payload, upload_from_request
 
 
 class PublicConvocatoriaDetailView(generics.RetrieveAPIView):
@@ -27,7 +34,89 @@ class PublicConvocatoriaDetailView(generics.RetrieveAPIView):
             raise generics.Http404
         return convocatoria
 
+    def retrieve(self, request, *args, **kwargs):
+        slug = kwargs[self.lookup_field]
+        entry = convocatoria_cache.get_public_payload(slug)
+        if entry is None:
+            convocatoria = self.get_object()
+            data = self.get_serializer(convocatoria).data
+            entry = convocatoria_cache.store_public_payload(convocatoria, data)
+
+        etag = entry["etag"]
+        if_none_match = request.headers.get("If-None-Match", "")
+        if etag in {tag.strip() for tag in if_none_match.split(",")}:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(entry["data"])
+        response["ETag"] = etag
+        patch_cache_control(
+            response,
+            public=True,
+            max_age=convocatoria_cache.remaining_seconds(entry),
+        )
+        return response
+
 
 class PublicCandidateCreateView(generics.CreateAPIView):
     serializer_class = PublicCandidateSerializer
     permission_classes = [permissions.AllowAny]
+
+
+class PublicCandidateDocumentView(generics.GenericAPIView):
+    """Base de las subidas hechas por el propio postulante.
+
+    Requiere el `upload_token` devuelto al postular, en la cabecera
+    `X-Upload-Token`.
+    """
+
+    permission_classes = [permissions.AllowAny]
+    queryset = models.Candidate.objects.all()
+
+    def get_candidate(self, request, pk):
+        token = request.headers.get("X-Upload-Token", "")
+        if not document_service.check_upload_token(token, pk):
+            raise exceptions.PermissionDenied("Token de subida inválido o vencido.")
+        return generics.get_object_or_404(self.get_queryset(), pk=pk)
+
+
+class PublicCandidateDocumentUploadView(PublicCandidateDocumentView):
+    """Subida del archivo a través de la API (cuerpo crudo)."""
+
+    def put(self, request, pk, kind):
+        candidate = self.get_candidate(request, pk)
+        document = upload_from_request(
+            request, candidate=candidate, kind=kind, actor_id=None
+        )
+        return Response(CandidateDocumentFileSerializer(document).data)
+
+
+class PublicDocumentUploadURLView(PublicCandidateDocumentView):
+    """Firma una subida directa al storage; el worker no recibe el archivo."""
+
+    serializer_class = DirectUploadRequestSerializer
+
+    def post(self, request, pk, kind):
+        candidate = self.get_candidate(request, pk)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload = document_service.request_direct_upload(
+            candidate=candidate, kind=check_kind(kind), **serializer.validated_data
+        )
+        return Response(direct_upload_payload(request, upload))
+
+
+class PublicDocumentUploadCompleteView(PublicCandidateDocumentView):
+    """Confirma una subida directa verificando tamaño y hash."""
+
+    serializer_class = DirectUploadCompleteSerializer
+
+    def post(self, request, pk, kind):
+        candidate = self.get_candidate(request, pk)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        document = document_service.complete_direct_upload(
+            candidate=candidate,
+            kind=check_kind(kind),
+            ticket=serializer.validated_data["ticket"],
+        )
+        return Response(CandidateDocumentFileSerializer(document).data)
@@ -0,0 +1,91 @@
+"""Destino de las URLs prefirmadas del storage local (desarrollo).
+
+Hace el papel de S3: la firma del token es la única autorización y el
+`Content-Type`, el tamaño y el SHA-256 firmados se validan igual que lo haría
+el bucket, antes de publicar el objeto. Cada URL de subida escribe una sola
+vez. El tipo de contenido lo verifica quien completa la subida.
+"""
+
+from __future__ import annotations
+
+from django.conf import settings
+from django.http import FileResponse, Http404
+from rest_framework import exceptions, permissions, status, views
+from rest_framework.response import Response
+
+from integrations.storage.base import StorageError
+from integrations.storage.local import (
+    LocalStorageClient,
+    ObjectExistsError,
+    ObjectTooLargeError,
+)
+
+from ..storage import get_storage_client
+
+
+class LocalStorageObjectView(views.APIView):
+    authentication_classes: list = []
+    permission_classes = [permissions.AllowAny]
+
+    def _load(self, token: str, method: str) -> tuple[LocalStorageClient, dict]:
+        storage = get_storage_client()
+        if not isinstance(storage, LocalStorageClient):
+            raise Http404
+        try:
+            return storage, storage.load_token(token, method)
+        except StorageError as exc:
+            raise exceptions.PermissionDenied(str(exc)) from exc
+
+    def get(self, request, token: str):
+        storage, payload = self._load(token, "GET")
+        try:
+            handle = storage.open(payload["path"])
+        except StorageError as exc:
+            raise Http404 from exc
+        return FileResponse(
+            handle, as_attachment=True, filename=payload.get("filename") or None
+        )
+
+    def put(self, request, token: str):
+        storage, payload = self._load(token, "PUT")
+        if request.content_type != payload["content_type"]:
+            raise exceptions.ValidationError(
+                {"Content-Type": ["No coincide con la firma."]}
+            )
+        max_size = payload.get("size")
+        if max_size is None:
+            max_size = settings.STAFFLINK_UPLOAD_MAX_SIZE_BYTES
+        try:
+            declared = int(request.META.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            declared = 0
+        if declared > max_size:
+            return Response(
+                {"detail": "El archivo excede el tamaño firmado."},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+        if request.stream is None:
+            raise exceptions.ValidationError(
+                {"file": ["Envíe el archivo en el cuerpo."]}
+            )
+        try:
+            storage.put_object(
+                request.stream,
+                destination=payload["path"],
+                sha256=payload.get("sha256"),
+                max_size=max_size,
+            )
+        except ObjectTooLargeError as exc:
+            return Response(
+                {"detail": str(exc)}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
+        except ObjectExistsError:
+            return Response(
+                {"detail": "El objeto ya fue subido."},
+                status=status.HTTP_412_PRECONDITION_FAILED,
+            )
+        except StorageError as exc:
+            raise exceptions.ValidationError(
+                {"x-amz-checksum-sha256": [str(exc)]}
+            ) from exc
+        return Response(status=status.HTTP_200_OK)
@@ -0,0 +1,67 @@
+"""Lectura del cuerpo de subidas binarias sin pasar por los upload handlers.
+
+Las subidas de documentos llegan como cuerpo crudo (`PUT` con el archivo y
+su `Content-Type`), no como multipart: así el view entrega el stream de la
+petición tal cual a `document_service`, que lo valida y lo escribe en el
+storage por bloques. Django no lo copia antes a memoria ni a un temporal.
+"""
+
+from __future__ import annotations
+
+from django.conf import settings
+from django.http import Http404
+from django.utils.http import parse_header_parameters
+from rest_framework import exceptions
+
+from .. import models
+from ..services import document_service
+
+
+def get_upload_filename(request) -> str:
+    disposition = request.headers.get("Content-Disposition", "")
+    if not disposition:
+        return ""
+    _, params = parse_header_parameters(disposition)
+    return params.get("filename", "")
+
+
+def check_kind(kind: str) -> str:
+    if kind not in models.CandidateDocumentFile.Kind.values:
+        raise Http404
+    return kind
+
+
+def direct_upload_payload(request, upload: document_service.DirectUpload) -> dict:
+    """Respuesta de `request_direct_upload` con la URL absoluta."""
+
+    return {
+        "url": request.build_absolute_uri(upload.request.url),
+        "method": upload.request.method,
+        "headers": upload.request.headers,
+        "ticket": upload.ticket,
+        "expires_in": upload.expires_in,
+    }
+
+
+def upload_from_request(
+    request, *, candidate: models.Candidate, kind: str, actor_id: str | None
+) -> models.CandidateDocumentFile:
+    check_kind(kind)
+    try:
+        length = int(request.META.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        length = 0
+    if length <= 0:
+        raise exceptions.ValidationError({"file": ["Envíe el archivo en el cuerpo."]})
+    # Rechazo temprano; el límite real se aplica al leer el stream
+    if length > settings.STAFFLINK_UPLOAD_MAX_SIZE_BYTES:
+        raise exceptions.ValidationError(
+            {"file": ["El archivo excede el tamaño permitido."]}
+        )
+    return document_service.upload_document(
+        candidate=candidate,
+        kind=kind,
+        stream=request.stream,
+        filename=get_upload_filename(request),
+        actor_id=actor_id,
+    )
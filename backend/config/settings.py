@@ -76,6 +76,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "api.shared.db_routing.ReplicaStickinessMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -101,6 +102,22 @@ WSGI_APPLICATION = "config.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Con POSTGRES_POOL=1 cada proceso mantiene un pool de psycopg 3
+# (psycopg_pool): las conexiones se prestan por request y se validan antes
+# de entregarse. Sin pool se reutiliza una conexión persistente por hilo
+# (CONN_MAX_AGE) con health check. Django no admite ambas a la vez.
+POSTGRES_POOL = _env_bool(os.environ.get("POSTGRES_POOL"))
+# Límite por sentencia. Solo para requests: config.wsgi/asgi marcan
+# STAFFLINK_PROCESS=web. migrate, reconcile_counters, archive_convocatorias
+# y los workers de exportación corren con POSTGRES_COMMAND_STATEMENT_TIMEOUT_MS
+# (0 = sin límite), porque una consulta larga ahí es esperable.
+STAFFLINK_WEB_PROCESS = os.environ.get("STAFFLINK_PROCESS") == "web"
+POSTGRES_STATEMENT_TIMEOUT_MS = int(
+    os.environ.get("POSTGRES_STATEMENT_TIMEOUT_MS", "30000")
+    if STAFFLINK_WEB_PROCESS
+    else os.environ.get("POSTGRES_COMMAND_STATEMENT_TIMEOUT_MS", "0")
+)
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -109,8 +126,72 @@ DATABASES = {
         "PASSWORD": os.environ.get("POSTGRES_PASSWORD", ""),
         "HOST": os.environ.get("POSTGRES_HOST", "localhost"),
         "PORT": os.environ.get("POSTGRES_PORT", "5432"),
+        "CONN_MAX_AGE": (
+            0 if POSTGRES_POOL else int(os.environ.get("POSTGRES_CONN_MAX_AGE", "60"))
+        ),
+        "CONN_HEALTH_CHECKS": not POSTGRES_POOL,
+        "OPTIONS": {
+            "connect_timeout": int(os.environ.get("POSTGRES_CONNECT_TIMEOUT", "5")),
+            # Corta consultas desbocadas en el servidor (0 = sin límite)
+            "options": f"-c statement_timeout={POSTGRES_STATEMENT_TIMEOUT_MS}",
+        },
     }
 }
+if POSTGRES_POOL:
+    from psycopg_pool import ConnectionPool
+
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": int(os.environ.get("POSTGRES_POOL_MIN_SIZE", "2")),
+        "max_size": int(os.environ.get("POSTGRES_POOL_MAX_SIZE", "10")),
+        # Segundos: vida máxima de una conexión, inactividad antes de
+        # cerrarla y espera máxima por una conexión libre
+        "max_lifetime": float(os.environ.get("POSTGRES_POOL_MAX_LIFETIME", "1800")),
+        "max_idle": float(os.environ.get("POSTGRES_POOL_MAX_IDLE", "300")),
+        "timeout": float(os.environ.get("POSTGRES_POOL_TIMEOUT", "10")),
+        "check": ConnectionPool.check_connection,
+    }
+
+# Réplica de lectura (opcional): grilla de postulantes, listados y exportes.
+# Ver api/shared/db_routing.py.
+POSTGRES_REPLICA_HOST = os.environ.get("POSTGRES_REPLICA_HOST")
+if POSTGRES_REPLICA_HOST:
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": POSTGRES_REPLICA_HOST,
+        "PORT": os.environ.get("POSTGRES_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        "OPTIONS": {**DATABASES["default"]["OPTIONS"]},
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_ROUTERS = ["api.shared.db_routing.ReplicaRouter"]
+# Tras una escritura, el usuario lee del primario durante estos segundos
+# (debe cubrir el retraso habitual de la réplica)
+STAFFLINK_REPLICA_STICKY_SECONDS = int(
+    os.environ.get("STAFFLINK_REPLICA_STICKY_SECONDS", "15")
+)
+STAFFLINK_REPLICA_STICKY_COOKIE = "stafflink_read_primary"
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Con REDIS_URL la caché se comparte entre nodos (necesario para invalidar
+# el payload público de convocatorias en todos los workers).
+
+REDIS_URL = os.environ.get("REDIS_URL")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+            "KEY_PREFIX": "stafflink",
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "stafflink",
+        }
+    }
 
 
 # Password validation
@@ -260,6 +341,28 @@ STAFFLINK_STORAGE_BASE_PATH = os.environ.get(
     "STAFFLINK_STORAGE_BASE_PATH",
     str(BASE_DIR / "var" / "uploads"),
 )
+# S3 o compatibles (requiere boto3; credenciales por la cadena estándar de
+# AWS). ENDPOINT_URL apunta a MinIO/Ceph; PREFIX antecede a cada clave.
+STAFFLINK_STORAGE_BUCKET = os.environ.get("STAFFLINK_STORAGE_BUCKET", "")
+STAFFLINK_STORAGE_REGION = os.environ.get("STAFFLINK_STORAGE_REGION") or None
+STAFFLINK_STORAGE_ENDPOINT_URL = (
+    os.environ.get("STAFFLINK_STORAGE_ENDPOINT_URL") or None
+)
+STAFFLINK_STORAGE_S3_PREFIX = os.environ.get("STAFFLINK_STORAGE_S3_PREFIX", "")
+STAFFLINK_STORAGE_S3_PART_SIZE_MB = int(
+    os.environ.get("STAFFLINK_STORAGE_S3_PART_SIZE_MB", "8")
+)
+STAFFLINK_STORAGE_S3_MAX_CONCURRENCY = int(
+    os.environ.get("STAFFLINK_STORAGE_S3_MAX_CONCURRENCY", "4")
+)
+# Ruta (bajo la API) que sirve las URLs prefirmadas del storage local
+STAFFLINK_STORAGE_LOCAL_URL = os.environ.get(
+    "STAFFLINK_STORAGE_LOCAL_URL", "/api/v1/storage/local/"
+)
+# Vigencia de las URLs prefirmadas de subida y descarga directa
+STAFFLINK_PRESIGNED_URL_TTL_SECONDS = int(
+    os.environ.get("STAFFLINK_PRESIGNED_URL_TTL_SECONDS", "900")
+)
 STAFFLINK_UPLOAD_MAX_SIZE_BYTES = int(
     os.environ.get("STAFFLINK_UPLOAD_MAX_SIZE_BYTES", str(5 * 1024 * 1024))
 )
@@ -271,10 +374,117 @@ STAFFLINK_ALLOWED_UPLOAD_EXTENSIONS = _env_list(
     "png",
     "pdf",
 ]
+# Vigencia del token que recibe el postulante para subir sus documentos
+STAFFLINK_PUBLIC_UPLOAD_TOKEN_TTL_SECONDS = int(
+    os.environ.get("STAFFLINK_PUBLIC_UPLOAD_TOKEN_TTL_SECONDS", str(7 * 24 * 3600))
+)
+
+# Caché del detalle público de convocatorias (segundos, se recorta a expires_at)
+STAFFLINK_PUBLIC_CACHE_SECONDS = int(
+    os.environ.get("STAFFLINK_PUBLIC_CACHE_SECONDS", "60")
+)
+# Snapshot en memoria slug -> Link usado al validar postulaciones públicas
+STAFFLINK_LINK_SNAPSHOT_SECONDS = int(
+    os.environ.get("STAFFLINK_LINK_SNAPSHOT_SECONDS", "30")
+)
+
+# Al llenar las cuotas de una convocatoria, marcarla como expirada
+STAFFLINK_CUOTAS_AUTO_EXPIRE = _env_bool(
+    os.environ.get("STAFFLINK_CUOTAS_AUTO_EXPIRE"), default=False
+)
 
 STAFFLINK_EXPORT_OUTPUT_DIR = os.environ.get(
     "STAFFLINK_EXPORT_OUTPUT_DIR", str(BASE_DIR / "var" / "exports")
 )
+# Compresión de los lotes Smart: vacío (CSV plano), "gzip" o "zstd"
+# (zstd requiere el paquete opcional `zstandard`)
+STAFFLINK_SMART_COMPRESSION = (
+    os.environ.get("STAFFLINK_SMART_COMPRESSION", "").strip().lower() or None
+)
+# Fila de encabezado en los lotes Smart: el formato acordado no la lleva
+STAFFLINK_SMART_HEADER = _env_bool(
+    os.environ.get("STAFFLINK_SMART_HEADER"), default=False
+)
+# Tope de postulantes por edición masiva (documents/process/assignment)
+STAFFLINK_BULK_UPDATE_MAX_CANDIDATES = int(
+    os.environ.get("STAFFLINK_BULK_UPDATE_MAX_CANDIDATES", "5000")
+)
+# Exportes Smart incrementales: margen (s) para transacciones en curso
+STAFFLINK_SMART_DELTA_LAG_SECONDS = int(
+    os.environ.get("STAFFLINK_SMART_DELTA_LAG_SECONDS", "60")
+)
+# Exportaciones en segundo plano: filas por archivo parcial y segundos sin
+# heartbeat tras los cuales otro worker puede retomar el job
+STAFFLINK_EXPORT_JOB_CHUNK_SIZE = int(
+    os.environ.get("STAFFLINK_EXPORT_JOB_CHUNK_SIZE", "5000")
+)
+STAFFLINK_EXPORT_JOB_LEASE_SECONDS = int(
+    os.environ.get("STAFFLINK_EXPORT_JOB_LEASE_SECONDS", "300")
+)
+# Archivado: convocatorias cerradas sin cambios en estos días pasan sus
+# postulantes al almacenamiento frío (comando archive_convocatorias)
+STAFFLINK_ARCHIVE_AFTER_DAYS = int(
+    os.environ.get("STAFFLINK_ARCHIVE_AFTER_DAYS", "180")
+)
+# Bitácora de auditoría: el escritor de fondo inserta por lotes al juntar
+# BATCH_SIZE registros o cada FLUSH_SECONDS; SYNC escribe al confirmar.
+# MODEL ("app_label.Modelo") es la tabla destino
+STAFFLINK_AUDIT_MODEL = os.environ.get("STAFFLINK_AUDIT_MODEL", "recruitment.AuditLog")
+STAFFLINK_AUDIT_BATCH_SIZE = int(os.environ.get("STAFFLINK_AUDIT_BATCH_SIZE", "200"))
+STAFFLINK_AUDIT_FLUSH_SECONDS = float(
+    os.environ.get("STAFFLINK_AUDIT_FLUSH_SECONDS", "2")
+)
+STAFFLINK_AUDIT_SYNC = _env_bool(os.environ.get("STAFFLINK_AUDIT_SYNC"), default=False)
+# Outbox de eventos de dominio: lote por ciclo del relay, reintentos con
+# backoff exponencial (segundos base) y módulos que registran handlers
+STAFFLINK_OUTBOX_BATCH_SIZE = int(os.environ.get("STAFFLINK_OUTBOX_BATCH_SIZE", "100"))
+STAFFLINK_OUTBOX_MAX_ATTEMPTS = int(
+    os.environ.get("STAFFLINK_OUTBOX_MAX_ATTEMPTS", "8")
+)
+STAFFLINK_OUTBOX_RETRY_SECONDS = int(
+    os.environ.get("STAFFLINK_OUTBOX_RETRY_SECONDS", "30")
+)
+# Tiempo que un relay tiene para entregar lo que reclamó antes de que otro
+# pueda retomarlo
+STAFFLINK_OUTBOX_LEASE_SECONDS = int(
+    os.environ.get("STAFFLINK_OUTBOX_LEASE_SECONDS", "300")
+)
+# Las derivadas de documentos se registran siempre; la variable agrega otros
+# módulos (p. ej. notification_service) sin reemplazarlas
+STAFFLINK_OUTBOX_HANDLER_MODULES = list(
+    dict.fromkeys(
+        [
+            "api.v1.recruitment.services.derivative_service",
+            *_env_list(os.environ.get("STAFFLINK_OUTBOX_HANDLER_MODULES")),
+        ]
+    )
+)
+
+# Miniaturas/vistas previas de documentos: procesos del pool de render (0 =
+# en el mismo proceso) y tiempo máximo por documento
+STAFFLINK_DERIVATIVE_WORKERS = int(os.environ.get("STAFFLINK_DERIVATIVE_WORKERS", "2"))
+STAFFLINK_DERIVATIVE_TIMEOUT_SECONDS = int(
+    os.environ.get("STAFFLINK_DERIVATIVE_TIMEOUT_SECONDS", "120")
+)
+
+# Correo: SMTP por defecto; el envío por lotes reutiliza una conexión
+EMAIL_BACKEND = os.environ.get(
+    "EMAIL_BACKEND", "django.core.mail.backends.smtp.EmailBackend"
+)
+EMAIL_HOST = os.environ.get("EMAIL_HOST", "localhost")
+EMAIL_PORT = int(os.environ.get("EMAIL_PORT", "25"))
+EMAIL_HOST_USER = os.environ.get("EMAIL_HOST_USER", "")
+EMAIL_HOST_PASSWORD = os.environ.get("EMAIL_HOST_PASSWORD", "")
+EMAIL_USE_TLS = _env_bool(os.environ.get("EMAIL_USE_TLS"), default=False)
+EMAIL_TIMEOUT = int(os.environ.get("EMAIL_TIMEOUT", "30"))
+DEFAULT_FROM_EMAIL = os.environ.get("DEFAULT_FROM_EMAIL", "no-reply@stafflink.local")
+STAFFLINK_EMAIL_RATE_PER_SECOND = float(
+    os.environ.get("STAFFLINK_EMAIL_RATE_PER_SECOND", "10")
+)
+STAFFLINK_EMAIL_MAX_RETRIES = int(os.environ.get("STAFFLINK_EMAIL_MAX_RETRIES", "3"))
+STAFFLINK_EMAIL_RETRY_BACKOFF_SECONDS = float(
+    os.environ.get("STAFFLINK_EMAIL_RETRY_BACKOFF_SECONDS", "1")
+)
 
 # Logging
 DJANGO_LOG_LEVEL = os.environ.get("DJANGO_LOG_LEVEL", "INFO").upper()
@@ -6,3 +6,6 @@ DATABASES["default"] = {  # type: ignore[name-defined]  # noqa: F405
     "ENGINE": "django.db.backends.sqlite3",
     "NAME": BASE_DIR / "test.sqlite3",  # type: ignore[name-defined]  # noqa: F405
 }
+
+# Auditoría escrita al confirmar, sin hilo de fondo entre tests
+STAFFLINK_AUDIT_SYNC = True
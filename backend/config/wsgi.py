@@ -12,5 +12,7 @@ import os
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+# Activa el statement_timeout de requests (ver POSTGRES_STATEMENT_TIMEOUT_MS)
+os.environ.setdefault("STAFFLINK_PROCESS", "web")
 
 application = get_wsgi_application()
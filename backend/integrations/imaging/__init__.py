@@ -0,0 +1 @@
+"""imaging integrations."""
@@ -0,0 +1,174 @@
+"""Miniaturas y vistas previas comprimidas de imágenes y PDFs.
+
+`render` es una función pura (bytes de entrada, bytes de salida) pensada
+para correr en un `ProcessPoolExecutor`: no toca la base de datos ni el
+storage. Pillow (en `requirements.txt`) se importa al renderizar; la
+primera página de un PDF se rasteriza con PyMuPDF si está instalado o con
+`pdftoppm` (poppler) si está en el PATH.
+
+Las salidas son JPEG progresivos: los escaneos de DNI y las fotos de
+celular pesan una fracción del original y se decodifican rápido en el
+navegador.
+"""
+
+from __future__ import annotations
+
+import io
+import shutil
+import subprocess
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Sequence
+
+IMAGE_TYPES = {"image/jpeg", "image/png"}
+PDF_TYPE = "application/pdf"
+OUTPUT_CONTENT_TYPE = "image/jpeg"
+# Tope de píxeles al decodificar (protege contra "bombas" de descompresión)
+MAX_PIXELS = 64_000_000
+PDFTOPPM_TIMEOUT_SECONDS = 30
+
+
+class ImagingError(RuntimeError):
+    """No se pudo generar la derivada (formato dañado o herramienta ausente)."""
+
+
+@dataclass(frozen=True)
+class DerivativeSpec:
+    name: str
+    max_side: int
+    quality: int
+
+
+@dataclass(frozen=True)
+class Rendition:
+    name: str
+    data: bytes
+    width: int
+    height: int
+    content_type: str = OUTPUT_CONTENT_TYPE
+
+
+def supports(content_type: str) -> bool:
+    return content_type in IMAGE_TYPES or content_type == PDF_TYPE
+
+
+def _pil():
+    try:
+        from PIL import Image, ImageOps
+    except ImportError as exc:
+        raise ImagingError("Las miniaturas requieren el paquete 'Pillow'.") from exc
+    Image.MAX_IMAGE_PIXELS = MAX_PIXELS
+    return Image, ImageOps
+
+
+def _open_image(source: bytes, max_side: int):
+    Image, ImageOps = _pil()
+    image = Image.open(io.BytesIO(source))
+    # JPEG: decodifica directamente a una escala reducida (mucho más rápido)
+    image.draft("RGB", (max_side, max_side))
+    image = ImageOps.exif_transpose(image)
+    if image.mode in {"RGBA", "LA", "P"}:
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def _pdf_first_page(source: bytes, max_side: int) -> bytes:
+    """PNG de la primera página con su lado mayor cerca de `max_side`."""
+
+    try:
+        import fitz  # PyMuPDF
+    except ImportError:
+        fitz = None
+    if fitz is not None:
+        try:
+            with fitz.open(stream=source, filetype="pdf") as document:
+                if not document.page_count:
+                    raise ImagingError("El PDF no tiene páginas.")
+                page = document[0]
+                longest = max(page.rect.width, page.rect.height)
+                if not longest > 0:
+                    # MediaBox vacía o degenerada
+                    raise ImagingError("La primera página del PDF no tiene tamaño.")
+                zoom = max_side / longest
+                return page.get_pixmap(matrix=fitz.Matrix(zoom, zoom)).tobytes("png")
+        except ImagingError:
+            raise
+        except (RuntimeError, ValueError) as exc:
+            # FileDataError, EmptyFileError, ...: PDF dañado o cifrado
+            raise ImagingError(f"PDF ilegible: {exc}") from exc
+
+    if shutil.which("pdftoppm") is None:
+        raise ImagingError("Instale PyMuPDF o poppler (pdftoppm) para PDFs.")
+    with tempfile.TemporaryDirectory() as workdir:
+        pdf_path = Path(workdir) / "source.pdf"
+        pdf_path.write_bytes(source)
+        output = Path(workdir) / "page"
+        try:
+            subprocess.run(
+                [
+                    "pdftoppm",
+                    "-f",
+                    "1",
+                    "-l",
+                    "1",
+                    "-singlefile",
+                    "-png",
+                    "-scale-to",
+                    str(max_side),
+                    str(pdf_path),
+                    str(output),
+                ],
+                check=True,
+                capture_output=True,
+                timeout=PDFTOPPM_TIMEOUT_SECONDS,
+            )
+        except (subprocess.SubprocessError, OSError) as exc:
+            raise ImagingError(f"pdftoppm falló: {exc}") from exc
+        return output.with_suffix(".png").read_bytes()
+
+
+def render(
+    source: bytes, content_type: str, specs: Sequence[DerivativeSpec]
+) -> list[Rendition]:
+    """Genera una derivada JPEG por `spec`, de la más grande a la más chica."""
+
+    if not specs:
+        return []
+    ordered = sorted(specs, key=lambda spec: spec.max_side, reverse=True)
+    largest = ordered[0].max_side
+    if content_type == PDF_TYPE:
+        source = _pdf_first_page(source, largest)
+    elif content_type not in IMAGE_TYPES:
+        raise ImagingError(f"Tipo sin derivadas: {content_type}")
+
+    Image, _ = _pil()
+    try:
+        image = _open_image(source, largest)
+    except (OSError, Image.DecompressionBombError) as exc:
+        raise ImagingError(f"Imagen ilegible: {exc}") from exc
+
+    renditions = []
+    for spec in ordered:
+        # Cada tamaño parte del anterior: reducir en cascada es más barato
+        image.thumbnail((spec.max_side, spec.max_side), Image.LANCZOS, reducing_gap=3.0)
+        buffer = io.BytesIO()
+        image.save(
+            buffer,
+            format="JPEG",
+            quality=spec.quality,
+            optimize=True,
+            progressive=True,
+        )
+        renditions.append(
+            Rendition(
+                name=spec.name,
+                data=buffer.getvalue(),
+                width=image.width,
+                height=image.height,
+            )
+        )
+    return renditions
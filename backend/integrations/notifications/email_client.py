@@ -1,11 +1,174 @@
-"""Cliente base para mandar correos desde Stafflink."""
+"""Cliente de correo de Stafflink con envío por lotes.
+
+`send_many` abre una sola conexión del backend de Django (SMTP en
+producción, locmem en tests) y la reutiliza para todo el lote, compila las
+plantillas una vez, respeta un máximo de mensajes por segundo y reintenta
+los errores transitorios con backoff exponencial, reabriendo la conexión si
+el servidor la cerró.
+"""
 
 from __future__ import annotations
 
+import logging
+import smtplib
+import socket
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Mapping
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.template.loader import get_template
+
+logger = logging.getLogger(__name__)
+
+# Caídas de red o de la sesión: siempre justifican reintentar. Las respuestas
+# del servidor solo si son 4xx (temporales); un 5xx es definitivo. No se usa
+# OSError: SMTPException hereda de él e incluiría rechazos permanentes.
+TRANSIENT_ERRORS: tuple[type[BaseException], ...] = (
+    smtplib.SMTPServerDisconnected,
+    ConnectionError,
+    socket.timeout,
+)
+
+
+def is_transient(exc: BaseException) -> bool:
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return 400 <= exc.smtp_code < 500
+    return isinstance(exc, TRANSIENT_ERRORS)
+
+
+@dataclass(frozen=True)
+class Recipient:
+    email: str
+    context: Mapping[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class EmailBatchResult:
+    sent: int = 0
+    failed: list[tuple[str, str]] = field(default_factory=list)
+
+
+class _RateLimiter:
+    """Espaciado mínimo entre envíos (mensajes por segundo)."""
+
+    def __init__(
+        self,
+        per_second: float,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.interval = 1.0 / per_second if per_second > 0 else 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._next_at = 0.0
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        now = self._clock()
+        if now < self._next_at:
+            self._sleep(self._next_at - now)
+            now = self._next_at
+        self._next_at = now + self.interval
+
 
 class EmailClient:
-    def send(
-        self, *, to: str, subject: str, body: str
-    ) -> None:  # pragma: no cover - placeholder
-        # Implementar integración real (SMTP, Sendgrid, etc.)
-        print(f"[email placeholder] to={to} subject={subject}")
+    def __init__(
+        self,
+        *,
+        from_email: str | None = None,
+        rate_per_second: float | None = None,
+        max_retries: int | None = None,
+        backoff_seconds: float | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.from_email = from_email or settings.DEFAULT_FROM_EMAIL
+        self.rate_per_second = (
+            settings.STAFFLINK_EMAIL_RATE_PER_SECOND
+            if rate_per_second is None
+            else rate_per_second
+        )
+        self.max_retries = (
+            settings.STAFFLINK_EMAIL_MAX_RETRIES if max_retries is None else max_retries
+        )
+        self.backoff_seconds = (
+            settings.STAFFLINK_EMAIL_RETRY_BACKOFF_SECONDS
+            if backoff_seconds is None
+            else backoff_seconds
+        )
+        self._sleep = sleep
+
+    def send(self, *, to: str, subject: str, body: str) -> None:
+        """Envía un único correo de texto plano."""
+
+        message = EmailMultiAlternatives(
+            subject=subject, body=body, from_email=self.from_email, to=[to]
+        )
+        connection = get_connection(fail_silently=False)
+        with connection:
+            self._deliver(connection, message)
+
+    def send_many(
+        self,
+        recipients: Iterable[Recipient],
+        *,
+        subject_template: str,
+        body_template: str,
+        html_template: str | None = None,
+        context: Mapping[str, Any] | None = None,
+    ) -> EmailBatchResult:
+        """Renderiza y envía un correo por destinatario sobre una conexión.
+
+        `context` es común al lote; cada `Recipient.context` lo complementa.
+        Un destinatario que agota sus reintentos se reporta en `failed` y el
+        lote continúa.
+        """
+
+        subject_tpl = get_template(subject_template)
+        body_tpl = get_template(body_template)
+        html_tpl = get_template(html_template) if html_template else None
+        base = dict(context or {})
+        limiter = _RateLimiter(self.rate_per_second, sleep=self._sleep)
+        result = EmailBatchResult()
+
+        connection = get_connection(fail_silently=False)
+        with connection:
+            for recipient in recipients:
+                ctx = {**base, **recipient.context, "email": recipient.email}
+                # Un salto de línea en el asunto invalida la cabecera
+                subject = " ".join(subject_tpl.render(ctx).split())
+                message = EmailMultiAlternatives(
+                    subject=subject,
+                    body=body_tpl.render(ctx),
+                    from_email=self.from_email,
+                    to=[recipient.email],
+                )
+                if html_tpl is not None:
+                    message.attach_alternative(html_tpl.render(ctx), "text/html")
+                limiter.wait()
+                try:
+                    self._deliver(connection, message)
+                except Exception as exc:
+                    logger.warning("No se pudo enviar a %s: %s", recipient.email, exc)
+                    result.failed.append((recipient.email, str(exc)))
+                else:
+                    result.sent += 1
+        return result
+
+    def _deliver(self, connection, message: EmailMultiAlternatives) -> None:
+        attempt = 0
+        while True:
+            try:
+                connection.send_messages([message])
+                return
+            except Exception as exc:
+                attempt += 1
+                if not is_transient(exc) or attempt > self.max_retries:
+                    raise
+                self._sleep(self.backoff_seconds * 2 ** (attempt - 1))
+                # El servidor pudo cerrar la sesión: abrir una nueva
+                connection.close()
+                connection.open()
@@ -2,19 +2,237 @@
 
 from __future__ import annotations
 
+import csv
+import gzip
+import hashlib
+import io
+import json
+import os
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterable
+from typing import BinaryIO, Iterable, Sequence
+
+WRITE_BUFFER_BYTES = 1024 * 1024
+READ_CHUNK_BYTES = 1024 * 1024
+COMPRESSIONS = ("gzip", "zstd")
+_SUFFIXES = {None: ".csv", "gzip": ".csv.gz", "zstd": ".csv.zst"}
+
+
+class SmartBatchError(RuntimeError):
+    """El lote no se pudo escribir o no coincide con su manifiesto."""
+
+
+@dataclass(frozen=True)
+class BatchManifest:
+    """Resumen de un lote; `bytes` y `sha256` son del archivo tal como se envía."""
+
+    batch_code: str
+    file_name: str
+    compression: str | None
+    header: bool
+    rows: int
+    bytes: int
+    sha256: str
+    created_at: str
+
+
+class _HashingWriter(io.RawIOBase):
+    """Escribe en `target` calculando tamaño y SHA-256 en la misma pasada."""
+
+    def __init__(self, target: BinaryIO) -> None:
+        self._target = target
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:  # type: ignore[override]
+        view = memoryview(data).cast("B")
+        written = 0
+        # Un write crudo puede ser parcial: se cuenta solo lo escrito entero
+        while written < len(view):
+            count = self._target.write(view[written:])
+            if not count:
+                raise SmartBatchError("No se pudo escribir el lote.")
+            written += count
+        self.digest.update(view)
+        self.size += written
+        return written
+
+
+class _HashingReader(io.RawIOBase):
+    """Lee de `source` calculando tamaño y SHA-256 de lo leído."""
+
+    def __init__(self, source: BinaryIO) -> None:
+        self._source = source
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:  # type: ignore[override]
+        data = self._source.read(len(buffer))
+        self.digest.update(data)
+        self.size += len(data)
+        buffer[: len(data)] = data
+        return len(data)
+
+    def drain(self) -> None:
+        while self.read(READ_CHUNK_BYTES):
+            pass
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError as exc:  # pragma: no cover - depende del entorno
+        raise SmartBatchError(
+            "La compresión zstd requiere el paquete 'zstandard'."
+        ) from exc
+    return zstandard
 
 
 class SmartClient:
-    def __init__(self, *, output_dir: str) -> None:
+    def __init__(self, *, output_dir: str, compression: str | None = None) -> None:
+        if compression and compression not in COMPRESSIONS:
+            raise SmartBatchError(f"Compresión no soportada: {compression}")
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.compression = compression or None
+
+    def batch_path(self, batch_code: str, compression: str | None = None) -> Path:
+        return self.output_dir / f"{batch_code}{_SUFFIXES[compression]}"
+
+    def manifest_path(self, batch_code: str) -> Path:
+        return self.output_dir / f"{batch_code}.manifest.json"
+
+    def _compressor(self, sink: BinaryIO) -> BinaryIO:
+        if self.compression == "gzip":
+            # mtime=0: el mismo contenido produce el mismo checksum
+            return gzip.GzipFile(fileobj=sink, mode="wb", mtime=0)  # type: ignore[return-value]
+        if self.compression == "zstd":
+            return _zstd().ZstdCompressor().stream_writer(sink, closefd=False)
+        return sink
+
+    def save_batch(
+        self,
+        batch_code: str,
+        rows: Iterable[list[str]],
+        *,
+        header: Sequence[str] | None = None,
+    ) -> BatchManifest:
+        """Escribe el lote fila a fila con `csv.writer` (campos con comas se citan).
+
+        Se escribe sobre un archivo temporal que se renombra al terminar, así
+        nunca queda un lote a medias con el nombre definitivo. Las filas se
+        acumulan en bloques de `WRITE_BUFFER_BYTES` antes de pasar al
+        compresor, y el tamaño y el SHA-256 del archivo se calculan mientras
+        se escribe.
+        """
+
+        file_path = self.batch_path(batch_code, self.compression)
+        tmp_path = file_path.with_name(f".{file_path.name}.part")
+        written = 0
+        try:
+            with tmp_path.open("wb", buffering=0) as raw:
+                sink = _HashingWriter(raw)
+                stream = self._compressor(sink)
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                if header:
+                    writer.writerow(header)
+                for row in rows:
+                    writer.writerow(row)
+                    written += 1
+                    if buffer.tell() >= WRITE_BUFFER_BYTES:
+                        stream.write(buffer.getvalue().encode("utf-8"))
+                        buffer.seek(0)
+                        buffer.truncate()
+                stream.write(buffer.getvalue().encode("utf-8"))
+                if stream is not sink:
+                    stream.close()
+            os.replace(tmp_path, file_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        manifest = BatchManifest(
+            batch_code=batch_code,
+            file_name=file_path.name,
+            compression=self.compression,
+            header=bool(header),
+            rows=written,
+            bytes=sink.size,
+            sha256=sink.digest.hexdigest(),
+            created_at=datetime.now(timezone.utc).isoformat(),
+        )
+        self._write_manifest(manifest)
+        return manifest
+
+    def _write_manifest(self, manifest: BatchManifest) -> None:
+        path = self.manifest_path(manifest.batch_code)
+        tmp_path = path.with_name(f".{path.name}.part")
+        tmp_path.write_text(json.dumps(asdict(manifest), indent=2), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def read_manifest(self, batch_code: str) -> BatchManifest:
+        try:
+            data = json.loads(self.manifest_path(batch_code).read_text("utf-8"))
+        except FileNotFoundError as exc:
+            raise SmartBatchError(f"El lote {batch_code} no tiene manifiesto.") from exc
+        return BatchManifest(**data)
+
+    def verify_batch(self, batch_code: str) -> BatchManifest:
+        """Relee el lote en streaming y lo contrasta con su manifiesto.
+
+        En una sola lectura se descomprime, se cuentan las filas y se calcula
+        el SHA-256 de los bytes del archivo. Un archivo truncado o alterado
+        lanza `SmartBatchError`.
+        """
+
+        manifest = self.read_manifest(batch_code)
+        path = self.output_dir / manifest.file_name
+        unreadable: tuple[type[BaseException], ...] = (
+            EOFError,
+            OSError,
+            UnicodeDecodeError,
+            csv.Error,
+        )
+        if manifest.compression == "zstd":
+            unreadable += (_zstd().ZstdError,)
+        if not path.exists():
+            raise SmartBatchError(f"No existe el archivo {manifest.file_name}.")
+        try:
+            with path.open("rb") as raw:
+                source = _HashingReader(raw)
+                stream: BinaryIO = source  # type: ignore[assignment]
+                if manifest.compression == "gzip":
+                    stream = gzip.GzipFile(fileobj=source, mode="rb")  # type: ignore[assignment]
+                elif manifest.compression == "zstd":
+                    stream = _zstd().ZstdDecompressor().stream_reader(source)
+                text = io.TextIOWrapper(
+                    io.BufferedReader(stream, buffer_size=READ_CHUNK_BYTES),  # type: ignore[arg-type]
+                    encoding="utf-8",
+                    newline="",
+                )
+                rows = sum(1 for _ in csv.reader(text))
+                source.drain()
+        except unreadable as exc:
+            raise SmartBatchError(f"Lote {batch_code} ilegible: {exc}") from exc
 
-    def save_batch(self, batch_code: str, rows: Iterable[list[str]]) -> str:
-        file_path = self.output_dir / f"{batch_code}.csv"
-        with file_path.open("w", encoding="utf-8") as handle:
-            for row in rows:
-                handle.write(",".join(row))
-                handle.write("\n")
-        return str(file_path)
+        if manifest.header:
+            rows -= 1
+        problems = []
+        if source.size != manifest.bytes:
+            problems.append(f"tamaño {source.size} != {manifest.bytes}")
+        if source.digest.hexdigest() != manifest.sha256:
+            problems.append("sha256 distinto")
+        if rows != manifest.rows:
+            problems.append(f"filas {rows} != {manifest.rows}")
+        if problems:
+            raise SmartBatchError(
+                f"Lote {batch_code} no coincide: {', '.join(problems)}"
+            )
+        return manifest
@@ -2,20 +2,22 @@
 
 from __future__ import annotations
 
-from typing import Iterable, Mapping
+from typing import Iterable, Iterator, Mapping
 
 
 class SmartFormatter:
     """Transforma postulantes en filas compatibles con Smart."""
 
-    def build_rows(self, applicants: Iterable[Mapping[str, str]]) -> list[list[str]]:
-        rows: list[list[str]] = []
+    columns = ("document_number", "full_name", "campaign")
+
+    def format_row(self, applicant: Mapping[str, str]) -> list[str]:
+        return [str(applicant.get(column) or "") for column in self.columns]
+
+    def iter_rows(self, applicants: Iterable[Mapping[str, str]]) -> Iterator[list[str]]:
+        """Genera las filas una a una (no materializa la población)."""
+
         for applicant in applicants:
-            rows.append(
-                [
-                    applicant.get("document_number", ""),
-                    applicant.get("full_name", ""),
-                    applicant.get("campaign", ""),
-                ]
-            )
-        return rows
+            yield self.format_row(applicant)
+
+    def build_rows(self, applicants: Iterable[Mapping[str, str]]) -> list[list[str]]:
+        return list(self.iter_rows(applicants))
@@ -3,14 +3,61 @@
 from __future__ import annotations
 
 import abc
+import hashlib
+import io
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import BinaryIO
 
+# Tamaño de bloque para copiar archivos sin cargarlos completos en memoria
+CHUNK_SIZE = 1024 * 1024
+
 
 class StorageError(RuntimeError):
     """Error genérico al interactuar con el backend de almacenamiento."""
 
 
+@dataclass(frozen=True)
+class StoredFile:
+    """Resultado de `save_file`: ruta lógica, bytes escritos y su SHA-256."""
+
+    path: str
+    size: int
+    sha256: str
+
+
+@dataclass(frozen=True)
+class PresignedRequest:
+    """Petición que el cliente hace directo contra el storage.
+
+    `headers` son las cabeceras que el cliente debe enviar tal cual: forman
+    parte de la firma.
+    """
+
+    url: str
+    method: str
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+class HashingReader(io.RawIOBase):
+    """Envuelve `source` calculando tamaño y SHA-256 de lo que se lee."""
+
+    def __init__(self, source: BinaryIO) -> None:
+        self._source = source
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:  # type: ignore[override]
+        data = self._source.read(len(buffer))
+        self.digest.update(data)
+        self.size += len(data)
+        buffer[: len(data)] = data
+        return len(data)
+
+
 class StorageClient(abc.ABC):
     """Cliente base para almacenar archivos generados por Stafflink."""
 
@@ -21,6 +68,56 @@ class StorageClient(abc.ABC):
     def save(self, file_obj: BinaryIO, *, destination: str, content_type: str) -> str:
         """Guarda un archivo y devuelve la ruta lógica resultante."""
 
+    def save_file(
+        self, file_obj: BinaryIO, *, destination: str, content_type: str
+    ) -> StoredFile:
+        """Guarda un archivo y devuelve tamaño y SHA-256 de la misma pasada."""
+
+        reader = HashingReader(file_obj)
+        path = self.save(reader, destination=destination, content_type=content_type)
+        return StoredFile(path=path, size=reader.size, sha256=reader.digest.hexdigest())
+
+    def describe(self, destination: str) -> StoredFile:
+        """Tamaño y SHA-256 de un archivo ya guardado (leyéndolo por bloques)."""
+
+        digest = hashlib.sha256()
+        size = 0
+        handle = self.open(destination)
+        try:
+            while chunk := handle.read(CHUNK_SIZE):
+                digest.update(chunk)
+                size += len(chunk)
+        finally:
+            handle.close()
+        return StoredFile(path=destination, size=size, sha256=digest.hexdigest())
+
+    def presigned_put(
+        self,
+        destination: str,
+        *,
+        content_type: str,
+        expires_in: int,
+        sha256: str | None = None,
+        size: int | None = None,
+    ) -> PresignedRequest:
+        """Petición firmada para subir `destination` sin pasar por Django.
+
+        Con `size` la firma fija el largo del cuerpo: no se acepta uno mayor.
+        """
+
+        raise StorageError(f"{type(self).__name__} no soporta URLs prefirmadas.")
+
+    def presigned_get_url(
+        self, destination: str, *, expires_in: int, filename: str | None = None
+    ) -> str:
+        """URL firmada para descargar `destination` sin pasar por Django."""
+
+        raise StorageError(f"{type(self).__name__} no soporta URLs prefirmadas.")
+
+    @abc.abstractmethod
+    def open(self, destination: str) -> BinaryIO:
+        """Abre un archivo guardado para lectura binaria."""
+
     @abc.abstractmethod
     def delete(self, destination: str) -> None:
         """Elimina un archivo previamente guardado."""
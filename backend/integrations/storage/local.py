@@ -2,29 +2,297 @@
 
 from __future__ import annotations
 
+import errno
+import hashlib
+import io
+import os
+import stat
+import tempfile
+import time
 from pathlib import Path
-from typing import BinaryIO
+from typing import Any, BinaryIO
 
-from .base import StorageClient, StorageError
+from django.core import signing
+
+from .base import (
+    CHUNK_SIZE,
+    PresignedRequest,
+    StorageClient,
+    StorageError,
+    StoredFile,
+)
+
+SIGNING_SALT = "integrations.storage.local"
+
+
+class ObjectExistsError(StorageError):
+    """El destino de un PUT prefirmado ya tiene contenido."""
+
+
+class ObjectTooLargeError(StorageError):
+    """El cuerpo de un PUT prefirmado supera el tamaño firmado."""
+
+
+def _current_umask() -> int:
+    # os.umask solo se puede leer cambiándolo: se hace una vez, al importar
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# mkstemp crea con 0600; los archivos publicados usan el modo que daría open()
+FILE_MODE = 0o666 & ~_current_umask()
+
+# Errores con los que el kernel rechaza la copia directa entre descriptores
+# (distinto filesystem, kernel antiguo, fs sin soporte): se copia por bloques.
+_NO_KERNEL_COPY = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP}
+
+
+def _source_fd(file_obj: BinaryIO) -> tuple[int, int, int] | None:
+    """(fd, offset, bytes restantes) si `file_obj` es un archivo regular."""
+
+    try:
+        fd = file_obj.fileno()
+        offset = file_obj.tell()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+    info = os.fstat(fd)
+    if not stat.S_ISREG(info.st_mode):
+        return None
+    return fd, offset, max(info.st_size - offset, 0)
+
+
+def _kernel_copy(src: int, dst: int, offset: int, count: int) -> bool:
+    """Copia sin pasar por espacio de usuario (copy_file_range o sendfile)."""
+
+    copy_range = getattr(os, "copy_file_range", None)
+    copied = 0
+    while copied < count:
+        try:
+            if copy_range is not None:
+                sent = copy_range(src, dst, count - copied, offset + copied)
+            else:
+                sent = os.sendfile(dst, src, offset + copied, count - copied)
+        except OSError as exc:
+            if copied == 0 and exc.errno in _NO_KERNEL_COPY:
+                return False
+            raise
+        if sent == 0:
+            break
+        copied += sent
+    # Sin offset de destino, ambas llamadas escriben en la posición actual de
+    # `dst` y la avanzan; el offset explícito solo deja quieto al origen
+    return True
+
+
+def _hash_fd(fd: int, offset: int, count: int) -> tuple[int, str]:
+    digest = hashlib.sha256()
+    size = 0
+    while size < count:
+        data = os.pread(fd, min(CHUNK_SIZE, count - size), offset + size)
+        if not data:
+            break
+        digest.update(data)
+        size += len(data)
+    return size, digest.hexdigest()
 
 
 class LocalStorageClient(StorageClient):
-    """Guarda archivos en el filesystem local dentro de `base_path`."""
+    """Guarda archivos en el filesystem local dentro de `base_path`.
+
+    La escritura va por bloques de `CHUNK_SIZE` a un temporal en el mismo
+    directorio que luego se renombra (`os.replace`): un lector nunca ve un
+    archivo a medio escribir y la memoria usada no depende del tamaño.
+
+    Las URLs prefirmadas apuntan a `url_base` + un token firmado con
+    `SECRET_KEY` que lleva método, ruta y vencimiento; el view que atiende
+    esa ruta lo valida con `load_token`. Imita a S3 en desarrollo.
+    """
+
+    def __init__(self, base_path: str, *, url_base: str = "") -> None:
+        super().__init__(base_path)
+        self.url_base = url_base
 
     def save(self, file_obj: BinaryIO, *, destination: str, content_type: str) -> str:  # type: ignore[override]
+        return self.save_file(
+            file_obj, destination=destination, content_type=content_type
+        ).path
+
+    def save_file(
+        self, file_obj: BinaryIO, *, destination: str, content_type: str
+    ) -> StoredFile:
+        target_path = self.base_path / destination
+        tmp_name, size, sha256 = self._write_temp(file_obj, target_path)
+        try:
+            os.replace(tmp_name, target_path)
+        except OSError as exc:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise StorageError(str(exc)) from exc
+        return StoredFile(path=str(target_path), size=size, sha256=sha256)
+
+    def put_object(
+        self,
+        file_obj: BinaryIO,
+        *,
+        destination: str,
+        sha256: str | None = None,
+        max_size: int | None = None,
+    ) -> StoredFile:
+        """Recibe el cuerpo de un PUT prefirmado, como S3 con `If-None-Match`.
+
+        El contenido se verifica contra `sha256` antes de publicarlo y nunca
+        pisa un objeto existente: una URL reutilizada no reemplaza lo que ya
+        se registró con ella. La copia se corta al pasar `max_size` bytes.
+        """
+
         target_path = self.base_path / destination
-        target_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_name, size, actual = self._write_temp(
+            file_obj, target_path, max_size=max_size
+        )
         try:
-            with target_path.open("wb") as handle:
-                handle.write(file_obj.read())
+            if sha256 and actual != sha256:
+                raise StorageError("El contenido no coincide con la firma.")
+            try:
+                # A diferencia de os.replace, link falla si el destino existe
+                os.link(tmp_name, target_path)
+            except FileExistsError as exc:
+                raise ObjectExistsError(f"{destination} ya existe.") from exc
+            except OSError as exc:
+                raise StorageError(str(exc)) from exc
+        finally:
+            Path(tmp_name).unlink(missing_ok=True)
+        return StoredFile(path=str(target_path), size=size, sha256=actual)
+
+    def _write_temp(
+        self, file_obj: BinaryIO, target_path: Path, *, max_size: int | None = None
+    ) -> tuple[str, int, str]:
+        """Copia `file_obj` a un temporal junto a `target_path` y lo hashea."""
+
+        try:
+            target_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(
+                dir=target_path.parent, prefix=f".{target_path.name}.", suffix=".part"
+            )
         except OSError as exc:  # pragma: no cover - errores del sistema
             raise StorageError(str(exc)) from exc
-        return str(target_path)
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                size, sha256 = self._copy(file_obj, handle, max_size)
+            os.chmod(tmp_name, FILE_MODE)
+        except BaseException as exc:
+            Path(tmp_name).unlink(missing_ok=True)
+            if isinstance(exc, OSError):
+                raise StorageError(str(exc)) from exc
+            raise
+        return tmp_name, size, sha256
 
-    def delete(self, destination: str) -> None:  # type: ignore[override]
+    def _copy(
+        self, file_obj: BinaryIO, handle: BinaryIO, max_size: int | None = None
+    ) -> tuple[int, str]:
+        source = _source_fd(file_obj)
+        if source is not None:
+            fd, offset, count = source
+            if max_size is not None and count > max_size:
+                raise ObjectTooLargeError("El archivo excede el tamaño firmado.")
+            if _kernel_copy(fd, handle.fileno(), offset, count):
+                # La copia ya dejó el origen en page cache: el hash lo relee
+                # de ahí en bloques, sin copias extra a disco.
+                file_obj.seek(offset + count)
+                return _hash_fd(fd, offset, count)
+        digest = hashlib.sha256()
+        size = 0
+        while True:
+            # Con límite se lee a lo sumo un byte más de lo permitido
+            limit = CHUNK_SIZE if max_size is None else max_size + 1 - size
+            chunk = file_obj.read(min(CHUNK_SIZE, limit))
+            if not chunk:
+                break
+            size += len(chunk)
+            if max_size is not None and size > max_size:
+                raise ObjectTooLargeError("El archivo excede el tamaño firmado.")
+            handle.write(chunk)
+            digest.update(chunk)
+        return size, digest.hexdigest()
+
+    def describe(self, destination: str) -> StoredFile:
+        path = self._resolve(destination)
+        try:
+            with path.open("rb") as handle:
+                size, sha256 = _hash_fd(
+                    handle.fileno(), 0, os.fstat(handle.fileno()).st_size
+                )
+        except OSError as exc:
+            raise StorageError(str(exc)) from exc
+        return StoredFile(path=str(path), size=size, sha256=sha256)
+
+    def presigned_put(
+        self,
+        destination: str,
+        *,
+        content_type: str,
+        expires_in: int,
+        sha256: str | None = None,
+        size: int | None = None,
+    ) -> PresignedRequest:
+        token = self._sign(
+            "PUT",
+            destination,
+            expires_in,
+            content_type=content_type,
+            sha256=sha256,
+            size=size,
+        )
+        return PresignedRequest(
+            url=f"{self.url_base}{token}",
+            method="PUT",
+            headers={"Content-Type": content_type},
+        )
+
+    def presigned_get_url(
+        self, destination: str, *, expires_in: int, filename: str | None = None
+    ) -> str:
+        token = self._sign("GET", destination, expires_in, filename=filename or "")
+        return f"{self.url_base}{token}"
+
+    def _sign(self, method: str, destination: str, expires_in: int, **extra) -> str:
+        if not self.url_base:
+            raise StorageError("Configure STAFFLINK_STORAGE_LOCAL_URL.")
+        payload = {
+            "method": method,
+            "path": destination,
+            "exp": int(time.time()) + expires_in,
+            **extra,
+        }
+        return signing.dumps(payload, salt=SIGNING_SALT, compress=True)
+
+    @staticmethod
+    def load_token(token: str, method: str) -> dict[str, Any]:
+        """Valida un token de `presigned_*` y devuelve su contenido."""
+
+        try:
+            payload = signing.loads(token, salt=SIGNING_SALT)
+        except signing.BadSignature as exc:
+            raise StorageError("Firma inválida.") from exc
+        if payload.get("method") != method:
+            raise StorageError("Método no permitido para esta URL.")
+        if payload.get("exp", 0) < time.time():
+            raise StorageError("La URL firmada venció.")
+        return payload
+
+    def _resolve(self, destination: str) -> Path:
         path = Path(destination)
         if not path.is_absolute():
             path = self.base_path / destination
+        return path
+
+    def open(self, destination: str) -> BinaryIO:  # type: ignore[override]
+        try:
+            return self._resolve(destination).open("rb")
+        except OSError as exc:
+            raise StorageError(str(exc)) from exc
+
+    def delete(self, destination: str) -> None:  # type: ignore[override]
+        path = self._resolve(destination)
         try:
             path.unlink(missing_ok=True)
         except OSError as exc:  # pragma: no cover
@@ -1,24 +1,203 @@
-"""Placeholder para almacenamiento en S3/compatibles."""
+"""Almacenamiento en S3 o compatibles (MinIO, Ceph) vía boto3.
+
+`boto3` (en `requirements.txt`) se importa al crear el cliente, así un
+despliegue con storage local no lo carga. El cliente de boto3 es thread-safe y se crea
+una vez por instancia, con un pool de conexiones HTTP reutilizadas y
+reintentos en modo `standard` (backoff exponencial con jitter).
+
+Las subidas usan `upload_fileobj`: sobre `part_size` el archivo se parte en
+un multipart upload que lee del archivo de entrada parte por parte (nunca
+lo carga completo) y sube hasta `max_concurrency` partes en paralelo.
+
+`presigned_put` firma el SHA-256 esperado (`x-amz-checksum-sha256`) y el
+`Content-Length` declarado: S3 rechaza un cuerpo distinto o más largo y `describe` recupera ese checksum con un HEAD,
+sin descargar el objeto.
+"""
 
 from __future__ import annotations
 
-from typing import BinaryIO
+import base64
+import threading
+from typing import Any, BinaryIO
+
+from django.utils.http import content_disposition_header
+
+from .base import PresignedRequest, StorageClient, StorageError, StoredFile
+
+MIB = 1024 * 1024
+
 
-from .base import StorageClient, StorageError
+def _boto3():
+    try:
+        import boto3
+        from boto3.s3.transfer import TransferConfig
+        from botocore.config import Config
+        from botocore.exceptions import BotoCoreError, ClientError
+    except ImportError as exc:  # pragma: no cover - depende del entorno
+        raise StorageError("El storage S3 requiere el paquete 'boto3'.") from exc
+    return boto3, TransferConfig, Config, (BotoCoreError, ClientError)
 
 
 class S3StorageClient(StorageClient):
-    """Se implementará cuando Stafflink despliegue en la nube."""
+    """Guarda los archivos como objetos `<prefijo>/<destination>` del bucket."""
 
     def __init__(
-        self, base_path: str, *, bucket: str, region: str | None = None
+        self,
+        base_path: str,
+        *,
+        bucket: str,
+        region: str | None = None,
+        endpoint_url: str | None = None,
+        part_size: int = 8 * MIB,
+        max_concurrency: int = 4,
+        max_attempts: int = 5,
+        max_pool_connections: int = 10,
     ) -> None:
         super().__init__(base_path)
+        if not bucket:
+            raise StorageError("Configure STAFFLINK_STORAGE_BUCKET para usar S3.")
         self.bucket = bucket
         self.region = region
+        self.endpoint_url = endpoint_url
+        self.prefix = str(base_path).strip("/")
+        if self.prefix == ".":
+            self.prefix = ""
+        # S3 exige partes de al menos 5 MiB (salvo la última)
+        self.part_size = max(part_size, 5 * MIB)
+        self.max_concurrency = max_concurrency
+        self.max_attempts = max_attempts
+        self.max_pool_connections = max_pool_connections
+        self._client: Any = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    boto3, _, Config, _ = _boto3()
+                    self._client = boto3.session.Session().client(
+                        "s3",
+                        region_name=self.region,
+                        endpoint_url=self.endpoint_url,
+                        config=Config(
+                            retries={
+                                "max_attempts": self.max_attempts,
+                                "mode": "standard",
+                            },
+                            max_pool_connections=max(
+                                self.max_pool_connections, self.max_concurrency
+                            ),
+                        ),
+                    )
+        return self._client
+
+    def key(self, destination: str) -> str:
+        destination = destination.lstrip("/")
+        if self.prefix and not destination.startswith(f"{self.prefix}/"):
+            return f"{self.prefix}/{destination}"
+        return destination
 
     def save(self, file_obj: BinaryIO, *, destination: str, content_type: str) -> str:  # type: ignore[override]
-        raise StorageError("S3StorageClient no está implementado todavía")
+        _, TransferConfig, _, errors = _boto3()
+        key = self.key(destination)
+        config = TransferConfig(
+            multipart_threshold=self.part_size,
+            multipart_chunksize=self.part_size,
+            max_concurrency=self.max_concurrency,
+            use_threads=self.max_concurrency > 1,
+        )
+        try:
+            self.client.upload_fileobj(
+                file_obj,
+                self.bucket,
+                key,
+                ExtraArgs={"ContentType": content_type},
+                Config=config,
+            )
+        except errors as exc:
+            raise StorageError(f"No se pudo subir {key}: {exc}") from exc
+        return key
+
+    def describe(self, destination: str) -> StoredFile:
+        _, _, _, errors = _boto3()
+        key = self.key(destination)
+        try:
+            head = self.client.head_object(
+                Bucket=self.bucket, Key=key, ChecksumMode="ENABLED"
+            )
+        except errors as exc:
+            raise StorageError(f"No se pudo leer {key}: {exc}") from exc
+        checksum = head.get("ChecksumSHA256")
+        # Los objetos multipart traen un checksum compuesto ("<b64>-<partes>")
+        if not checksum or "-" in checksum:
+            return super().describe(key)
+        return StoredFile(
+            path=key,
+            size=head["ContentLength"],
+            sha256=base64.b64decode(checksum).hex(),
+        )
+
+    def presigned_put(
+        self,
+        destination: str,
+        *,
+        content_type: str,
+        expires_in: int,
+        sha256: str | None = None,
+        size: int | None = None,
+    ) -> PresignedRequest:
+        _, _, _, errors = _boto3()
+        key = self.key(destination)
+        params = {"Bucket": self.bucket, "Key": key, "ContentType": content_type}
+        headers = {"Content-Type": content_type}
+        if sha256:
+            checksum = base64.b64encode(bytes.fromhex(sha256)).decode()
+            params["ChecksumSHA256"] = checksum
+            headers["x-amz-checksum-sha256"] = checksum
+        if size is not None:
+            params["ContentLength"] = size
+            headers["Content-Length"] = str(size)
+        try:
+            url = self.client.generate_presigned_url(
+                "put_object", Params=params, ExpiresIn=expires_in, HttpMethod="PUT"
+            )
+        except errors as exc:
+            raise StorageError(f"No se pudo firmar {key}: {exc}") from exc
+        return PresignedRequest(url=url, method="PUT", headers=headers)
+
+    def presigned_get_url(
+        self, destination: str, *, expires_in: int, filename: str | None = None
+    ) -> str:
+        _, _, _, errors = _boto3()
+        key = self.key(destination)
+        params = {"Bucket": self.bucket, "Key": key}
+        if filename:
+            params["ResponseContentDisposition"] = content_disposition_header(
+                True, filename
+            )
+        try:
+            return self.client.generate_presigned_url(
+                "get_object", Params=params, ExpiresIn=expires_in
+            )
+        except errors as exc:
+            raise StorageError(f"No se pudo firmar {key}: {exc}") from exc
+
+    def open(self, destination: str) -> BinaryIO:  # type: ignore[override]
+        """Devuelve el cuerpo del objeto como stream (no lo descarga entero)."""
+
+        _, _, _, errors = _boto3()
+        key = self.key(destination)
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=key)
+        except errors as exc:
+            raise StorageError(f"No se pudo leer {key}: {exc}") from exc
+        return response["Body"]
 
     def delete(self, destination: str) -> None:  # type: ignore[override]
-        raise StorageError("S3StorageClient no está implementado todavía")
+        _, _, _, errors = _boto3()
+        key = self.key(destination)
+        try:
+            self.client.delete_object(Bucket=self.bucket, Key=key)
+        except errors as exc:
+            raise StorageError(f"No se pudo eliminar {key}: {exc}") from exc
@@ -0,0 +1,224 @@
+"""Presupuestos de consultas SQL y de tiempo por endpoint.
+
+`EndpointBudgetTestCase` autentica con un IAM simulado (el mismo camino
+`IAMCookieAuthentication` de producción, sin red) y ofrece:
+
+- `assertWithinBudget`: ejecuta la petición y falla si supera el máximo de
+  consultas o de milisegundos de su `Budget`. Para los GET hace antes una
+  petición de calentamiento, así no se mide la carga inicial de módulos.
+- `assertConstantQueries`: mide, agrega filas y vuelve a medir; un N+1 hace
+  crecer la cantidad de consultas con el volumen y el test lo detecta aunque
+  el presupuesto absoluto todavía alcance.
+
+`seed_volume` carga un volumen parecido al de producción con `bulk_create`.
+Los tiempos se escalan con `STAFFLINK_BUDGET_TIME_FACTOR` para máquinas de CI
+más lentas; las consultas no, porque no dependen de la máquina.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, Callable
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from api.v1.recruitment import models
+from api.v1.recruitment.services import convocatoria_cache
+
+TIME_FACTOR = float(os.environ.get("STAFFLINK_BUDGET_TIME_FACTOR", "1"))
+BUDGET_TOKEN = "budget-token"
+
+
+@dataclass(frozen=True)
+class Budget:
+    queries: int
+    millis: float
+
+
+@dataclass
+class Measurement:
+    queries: int
+    millis: float
+    sql: list[str]
+
+
+class FakeIAMClient:
+    """IAM en memoria: acepta `BUDGET_TOKEN` con los permisos indicados."""
+
+    def __init__(self, *, permissions: list[str], user_id: str) -> None:
+        self.payload = {
+            "active": True,
+            "sub": user_id,
+            "user_id": user_id,
+            "permissions": permissions,
+            "user": {"id": user_id, "email": "budget@example.com"},
+        }
+
+    def introspect(self, token: str) -> dict[str, Any]:
+        return dict(self.payload) if token == BUDGET_TOKEN else {"active": False}
+
+    def login(self, **credentials) -> dict[str, Any]:
+        return {
+            "access_token": BUDGET_TOKEN,
+            "token_type": "Bearer",
+            "expires_in": 3600,
+            "session": {"session_id": "budget"},
+            "user": self.payload["user"],
+        }
+
+    def logout(self, token: str) -> None:
+        return None
+
+
+@dataclass
+class SeededVolume:
+    campaigns: list[models.Campaign]
+    convocatorias: list[models.Link]
+    candidates: list[models.Candidate] = field(default_factory=list)
+
+
+def seed_volume(
+    *,
+    convocatorias: int = 30,
+    candidates_per_convocatoria: int = 4,
+    blacklist: int = 50,
+    prefix: str = "v",
+) -> SeededVolume:
+    """Campañas, convocatorias con contador y postulantes con su ficha completa."""
+
+    now = timezone.now()
+    campaigns = models.Campaign.objects.bulk_create(
+        models.Campaign(codigo=f"{prefix}CMP{n}", nombre=f"Campaña {n}")
+        for n in range(3)
+    )
+    links = models.Link.objects.bulk_create(
+        models.Link(
+            campaign=campaigns[n % len(campaigns)],
+            slug=f"{prefix}-convocatoria-{n}",
+            titulo=f"Convocatoria {n}",
+            periodo="2026-10",
+            user_id=uuid.uuid4(),
+            cuotas=100,
+            expires_at=now + timedelta(days=7),
+        )
+        for n in range(convocatorias)
+    )
+    models.LinkCounter.objects.bulk_create(
+        models.LinkCounter(link=link, postulantes=candidates_per_convocatoria)
+        for link in links
+    )
+    candidates = models.Candidate.objects.bulk_create(
+        models.Candidate(
+            link=link,
+            tipo_documento=models.Candidate.DocumentType.DNI,
+            numero_documento=f"{n:08d}",
+            apellido_paterno="PEREZ",
+            nombres_completos=f"POSTULANTE {n}",
+            telefono="999888777",
+            email=f"{prefix}{n}@example.com",
+        )
+        for link in links
+        for n in range(candidates_per_convocatoria)
+    )
+    for model in (
+        models.CandidateDocuments,
+        models.CandidateProcess,
+        models.CandidateAssignment,
+    ):
+        model.objects.bulk_create(model(candidate=c) for c in candidates)
+    models.Blacklist.objects.bulk_create(
+        models.Blacklist(dni=f"{prefix}{n:07d}", nombres=f"VETADO {n}")
+        for n in range(blacklist)
+    )
+    return SeededVolume(campaigns=campaigns, convocatorias=links, candidates=candidates)
+
+
+class EndpointBudgetTestCase(APITestCase):
+    """Base para medir endpoints autenticados con un IAM simulado."""
+
+    permissions: tuple[str, ...] = ()
+
+    def setUp(self) -> None:
+        cache.clear()
+        convocatoria_cache.clear_snapshots()
+        self.user_id = str(uuid.uuid4())
+        self.iam = FakeIAMClient(
+            permissions=list(self.permissions), user_id=self.user_id
+        )
+        for target in (
+            "api.auth.authentication.get_iam_client",
+            "api.auth.views.get_iam_client",
+        ):
+            patcher = mock.patch(target, return_value=self.iam)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {BUDGET_TOKEN}")
+
+    def measure(self, request: Callable[[], Any], *, status: int = 200) -> Measurement:
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = request()
+            if response.streaming:
+                b"".join(response.streaming_content)
+            millis = (time.perf_counter() - started) * 1000
+        self.assertEqual(response.status_code, status, getattr(response, "data", ""))
+        return Measurement(
+            queries=len(queries),
+            millis=millis,
+            sql=[query["sql"] for query in queries.captured_queries],
+        )
+
+    def assertWithinBudget(
+        self,
+        method: str,
+        url: str,
+        budget: Budget,
+        *,
+        status: int = 200,
+        warmup: bool | None = None,
+        **kwargs,
+    ) -> Measurement:
+        call = getattr(self.client, method.lower())
+        if warmup if warmup is not None else method.upper() == "GET":
+            call(url, **kwargs)
+        result = self.measure(lambda: call(url, **kwargs), status=status)
+        detail = "\n".join(result.sql)
+        self.assertLessEqual(
+            result.queries,
+            budget.queries,
+            f"{method} {url}: {result.queries} consultas (máx. {budget.queries})\n"
+            f"{detail}",
+        )
+        limit = budget.millis * TIME_FACTOR
+        self.assertLessEqual(
+            result.millis,
+            limit,
+            f"{method} {url}: {result.millis:.1f} ms (máx. {limit:.0f} ms)",
+        )
+        return result
+
+    def assertConstantQueries(
+        self, url: str, grow: Callable[[], Any], **kwargs
+    ) -> None:
+        """Las consultas de un GET no cambian al agregar filas con `grow`."""
+
+        self.client.get(url, **kwargs)
+        before = self.measure(lambda: self.client.get(url, **kwargs))
+        grow()
+        cache.clear()
+        self.client.get(url, **kwargs)
+        after = self.measure(lambda: self.client.get(url, **kwargs))
+        self.assertEqual(
+            before.queries,
+            after.queries,
+            f"GET {url}: consultas crecen con el volumen\n" + "\n".join(after.sql),
+        )
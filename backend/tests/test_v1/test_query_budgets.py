@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import uuid
+
+from django.urls import reverse
+
+from api.v1.recruitment import models
+
+from .budgets import Budget, EndpointBudgetTestCase, seed_volume
+
+# Máximos por endpoint con el volumen de `seed_volume`. Una consulta más es
+# una regresión: si es intencional, se sube aquí en el mismo cambio.
+BUDGETS = {
+    "campaigns-list": Budget(queries=2, millis=250),
+    "campaigns-create": Budget(queries=2, millis=250),
+    "blacklist-list": Budget(queries=2, millis=250),
+    "convocatorias-list": Budget(queries=2, millis=300),
+    "convocatorias-detail": Budget(queries=1, millis=250),
+    "candidates-list": Budget(queries=2, millis=400),
+    "candidates-detail": Budget(queries=2, millis=250),
+    "candidates-export": Budget(queries=1, millis=500),
+    "public-convocatoria": Budget(queries=0, millis=150),
+    "public-candidate": Budget(queries=19, millis=300),
+    "auth-session": Budget(queries=0, millis=100),
+    "auth-login": Budget(queries=0, millis=100),
+}
+
+
+class RecruitmentEndpointBudgetTests(EndpointBudgetTestCase):
+    permissions = (
+        "campaigns.read",
+        "campaigns.manage",
+        "blacklist.read",
+        "convocatorias.read",
+        "convocatorias.manage",
+        "candidates.read",
+        "candidates.manage",
+        "exports.download",
+    )
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.volume = seed_volume()
+        self.link = self.volume.convocatorias[0]
+        self.candidate = self.volume.candidates[0]
+        self.grown = 0
+
+    def _grow(self) -> None:
+        self.grown += 1
+        seed_volume(convocatorias=10, blacklist=10, prefix=f"g{self.grown}")
+
+    def test_campaigns(self) -> None:
+        url = reverse("campaigns-list")
+        self.assertWithinBudget("GET", url, BUDGETS["campaigns-list"])
+        self.assertWithinBudget(
+            "POST",
+            url,
+            BUDGETS["campaigns-create"],
+            status=201,
+            data={"codigo": "NEW", "nombre": "Nueva"},
+            format="json",
+        )
+        self.assertConstantQueries(url, self._grow)
+
+    def test_blacklist(self) -> None:
+        url = reverse("blacklist-list")
+        self.assertWithinBudget("GET", url, BUDGETS["blacklist-list"])
+        self.assertConstantQueries(url, self._grow)
+
+    def test_convocatorias(self) -> None:
+        url = reverse("convocatorias-list")
+        self.assertWithinBudget("GET", url, BUDGETS["convocatorias-list"])
+        self.assertWithinBudget(
+            "GET",
+            reverse("convocatorias-detail", args=[self.link.pk]),
+            BUDGETS["convocatorias-detail"],
+        )
+        self.assertConstantQueries(url, self._grow)
+
+    def test_candidates(self) -> None:
+        url = reverse("candidates-list")
+        self.assertWithinBudget("GET", url, BUDGETS["candidates-list"])
+        self.assertWithinBudget(
+            "GET",
+            reverse("candidates-detail", args=[self.candidate.pk]),
+            BUDGETS["candidates-detail"],
+        )
+        self.assertWithinBudget(
+            "GET", reverse("candidates-export"), BUDGETS["candidates-export"]
+        )
+        self.assertConstantQueries(url, self._grow)
+        self.assertConstantQueries(reverse("candidates-export"), self._grow)
+
+
+class PublicEndpointBudgetTests(EndpointBudgetTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.client.credentials()
+        self.link = seed_volume(convocatorias=5).convocatorias[0]
+
+    def test_public_convocatoria(self) -> None:
+        url = reverse("public:public-convocatoria", args=[self.link.slug])
+        self.assertWithinBudget("GET", url, BUDGETS["public-convocatoria"])
+
+    def test_public_candidate(self) -> None:
+        payload = {
+            "convocatoria_slug": self.link.slug,
+            "tipo_documento": models.Candidate.DocumentType.DNI,
+            "numero_documento": "87654321",
+            "apellido_paterno": "LOPEZ",
+            "nombres_completos": "MARIA LOPEZ",
+            "telefono": "999000111",
+            "email": "maria@example.com",
+        }
+        self.assertWithinBudget(
+            "POST",
+            reverse("public:public-candidate"),
+            BUDGETS["public-candidate"],
+            status=201,
+            data=payload,
+            format="json",
+        )
+
+
+class AuthEndpointBudgetTests(EndpointBudgetTestCase):
+    permissions = ("candidates.read",)
+
+    def test_auth_endpoints_do_not_touch_the_database(self) -> None:
+        self.client.cookies["stafflink_access_token"] = "budget-token"
+        self.assertWithinBudget("GET", reverse("auth-session"), BUDGETS["auth-session"])
+        self.assertWithinBudget(
+            "POST",
+            reverse("auth-login"),
+            BUDGETS["auth-login"],
+            data={"username_or_email": f"{uuid.uuid4()}@x.com", "password": "x"},
+            format="json",
+        )
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import io
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from api.v1.recruitment import models
+from api.v1.recruitment.services import (
+    archive_service,
+    convocatoria_service,
+    document_service,
+)
+
+from .test_document_upload import PDF, CandidateStorageTestCase
+from .utils import create_applicant
+
+
+class ConvocatoriaArchiveTests(CandidateStorageTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        models.CandidateDocuments.objects.create(
+            candidate=self.candidate, dni_entregado=True
+        )
+        models.CandidateAssignment.objects.create(
+            candidate=self.candidate, remuneracion=Decimal("1500.50")
+        )
+        create_applicant(self.link, document_number="87654321")
+        with self.captureOnCommitCallbacks(execute=True):
+            document_service.upload_document(
+                candidate=self.candidate, kind="cv", stream=io.BytesIO(PDF)
+            )
+        models.LinkCounter.objects.filter(link=self.link).update(postulantes=2)
+        self.link.estado = models.Link.Estado.EXPIRADO
+        self.link.save(update_fields=["estado"])
+
+    def _archive(self) -> models.ConvocatoriaArchive:
+        with self.captureOnCommitCallbacks(execute=True):
+            return archive_service.archive_convocatoria(convocatoria=self.link)
+
+    def test_archive_moves_candidates_out_and_restore_brings_them_back(self) -> None:
+        archive = self._archive()
+
+        self.assertEqual(archive.candidates, 2)
+        self.assertFalse(models.Candidate.objects.filter(link=self.link).exists())
+        self.assertFalse(models.CandidateDocumentFile.objects.exists())
+        # El blob del CV sigue vivo: su referencia la tiene el archivo
+        self.assertEqual(models.StoredBlob.objects.get().ref_count, 1)
+        self.assertIn(
+            self.root / archive_service.archive_path(self.link), self._files()
+        )
+        convocatoria_service.reconcile_counters()
+        self.assertEqual(models.LinkCounter.objects.get(link=self.link).postulantes, 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            restored = archive_service.restore_convocatoria(convocatoria=self.link)
+
+        self.assertEqual(restored, 2)
+        self.assertFalse(models.ConvocatoriaArchive.objects.exists())
+        self.candidate.refresh_from_db()
+        self.assertTrue(self.candidate.documents.dni_entregado)
+        self.assertEqual(self.candidate.assignment.remuneracion, Decimal("1500.50"))
+        self.assertEqual(self.candidate.document_files.get().kind, "cv")
+        self.assertNotIn(
+            self.root / archive_service.archive_path(self.link), self._files()
+        )
+
+    def test_only_closed_convocatorias_are_archived_once(self) -> None:
+        self._archive()
+        with self.assertRaises(ValidationError):
+            archive_service.archive_convocatoria(convocatoria=self.link)
+        with self.assertRaises(ValidationError):
+            convocatoria_service.set_status(
+                convocatoria=self.link,
+                estado=models.Link.Estado.ACTIVO,
+                actor_id=None,
+            )
+
+        self.link.archive.delete()
+        self.link.estado = models.Link.Estado.ACTIVO
+        self.link.save(update_fields=["estado"])
+        with self.assertRaises(ValidationError):
+            archive_service.archive_convocatoria(convocatoria=self.link)
+
+    def test_deleting_an_archived_convocatoria_releases_its_files(self) -> None:
+        self._archive()
+        with self.captureOnCommitCallbacks(execute=True):
+            convocatoria_service.delete_convocatoria(
+                convocatoria=self.link, actor_id=None
+            )
+
+        self.assertEqual(self._files(), [])
+        self.assertFalse(models.StoredBlob.objects.exists())
+
+    def test_command_archives_stale_closed_convocatorias(self) -> None:
+        stale = timezone.now() - timedelta(days=200)
+        out = io.StringIO()
+        call_command("archive_convocatorias", stdout=out)
+        self.assertIn("archivadas: 0", out.getvalue())
+
+        models.Link.objects.filter(pk=self.link.pk).update(updated_at=stale)
+        call_command("archive_convocatorias", "--dry-run", stdout=out)
+        self.assertFalse(models.ConvocatoriaArchive.objects.exists())
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("archive_convocatorias", stdout=out)
+
+        self.assertIn("archivadas: 1, postulantes: 2", out.getvalue())
+        self.assertFalse(models.Candidate.objects.exists())
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import threading
+import uuid
+
+from django.test import TestCase, override_settings
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from api.shared.audit import AuditBuffer, _entry
+from api.v1.recruitment import models
+
+from .utils import create_applicant, create_campaign, create_convocatoria
+
+
+class AuditTrailTests(APITestCase):
+    def setUp(self) -> None:
+        self.actor_id = str(uuid.uuid4())
+        self.link = create_convocatoria(create_campaign())
+        self.candidate = create_applicant(self.link)
+        models.LinkCounter.objects.create(link=self.link, postulantes=1)
+        self.headers = {
+            "HTTP_X_STAFFLINK_PERMISSIONS": "candidates.manage,candidates.process,"
+            "blacklist.manage,audit.read",
+            "HTTP_X_STAFFLINK_USER_ID": self.actor_id,
+        }
+
+    def test_mutations_are_persisted_on_commit(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                reverse("candidates-documents", args=[self.candidate.pk]),
+                {"status": "completo"},
+                format="json",
+                **self.headers,
+            )
+            created = self.client.post(
+                reverse("blacklist-list"),
+                {"dni": "44444444", "nombres": "VETADO"},
+                format="json",
+                **self.headers,
+            )
+            self.client.delete(
+                reverse("blacklist-detail", args=[created.json()["id"]]),
+                **self.headers,
+            )
+
+        docs = models.AuditLog.objects.get(entity_type="candidate")
+        self.assertEqual(docs.entity_id, str(self.candidate.pk))
+        self.assertEqual(docs.action, "documents")
+        self.assertEqual(docs.actor_id, self.actor_id)
+        self.assertEqual(docs.payload, {"status": "completo"})
+        self.assertEqual(
+            list(
+                models.AuditLog.objects.filter(entity_type="blacklist")
+                .order_by("id")
+                .values_list("action", flat=True)
+            ),
+            ["create", "delete"],
+        )
+
+    def test_rolled_back_mutations_leave_no_trace(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("blacklist-list"),
+                {"dni": "44444444"},
+                format="json",
+                **self.headers,
+            )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(models.AuditLog.objects.exists())
+
+    def test_query_api_filters_by_entity_and_actor(self) -> None:
+        other = str(uuid.uuid4())
+        models.AuditLog.objects.bulk_create(
+            [
+                models.AuditLog(
+                    entity_type="candidate", entity_id="a", action="update"
+                ),
+                models.AuditLog(
+                    entity_type="candidate",
+                    entity_id="b",
+                    action="update",
+                    actor_id=other,
+                ),
+                models.AuditLog(
+                    entity_type="convocatoria",
+                    entity_id="a",
+                    action="create",
+                    actor_id=other,
+                ),
+            ]
+        )
+        url = reverse("audit-list")
+
+        by_entity = self.client.get(
+            url, {"entity_type": "candidate", "entity_id": "a"}, **self.headers
+        )
+        self.assertEqual(by_entity.status_code, 200)
+        self.assertEqual(
+            [row["action"] for row in by_entity.json()["results"]], ["update"]
+        )
+        by_actor = self.client.get(url, {"actor_id": other}, **self.headers)
+        self.assertEqual(len(by_actor.json()["results"]), 2)
+        missing_type = self.client.get(url, {"entity_id": "a"}, **self.headers)
+        self.assertEqual(missing_type.status_code, 400)
+        forbidden = self.client.get(url, HTTP_X_STAFFLINK_PERMISSIONS="candidates.read")
+        self.assertEqual(forbidden.status_code, 403)
+
+
+@override_settings(STAFFLINK_AUDIT_BATCH_SIZE=50, STAFFLINK_AUDIT_FLUSH_SECONDS=60)
+class AuditBufferTests(TestCase):
+    def test_concurrent_writers_are_flushed_in_batches(self) -> None:
+        buffer = AuditBuffer()
+        # Sin hilo de fondo: el test controla cuándo se vacía
+        buffer._start = lambda: None  # type: ignore[method-assign]
+
+        def produce(worker: int) -> None:
+            for n in range(40):
+                buffer.add(
+                    [
+                        _entry(
+                            entity_type="candidate",
+                            entity_id=f"{worker}-{n}",
+                            action="update",
+                        )
+                    ]
+                )
+
+        threads = [threading.Thread(target=produce, args=(w,)) for w in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with self.assertNumQueries(4):
+            self.assertEqual(buffer.flush(), 200)
+        self.assertEqual(models.AuditLog.objects.count(), 200)
+        self.assertEqual(buffer.flush(), 0)
+
+    def test_target_model_comes_from_settings(self) -> None:
+        buffer = AuditBuffer()
+        buffer._start = lambda: None  # type: ignore[method-assign]
+        buffer.add([_entry(entity_type="candidate", entity_id="1", action="update")])
+
+        with override_settings(STAFFLINK_AUDIT_MODEL="recruitment.Missing"):
+            self.assertEqual(buffer.flush(), 0)
+        self.assertFalse(models.AuditLog.objects.exists())
+        self.assertEqual(buffer.flush(), 1)
+        self.assertEqual(models.AuditLog.objects.count(), 1)
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from api.v1.recruitment import models
+from api.v1.recruitment.services import blob_service
+from api.v1.recruitment.storage import get_storage_client
+
+
+class BlobServiceTests(TestCase):
+    def setUp(self) -> None:
+        storage_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(storage_dir.cleanup)
+        self.root = Path(storage_dir.name)
+        override = override_settings(
+            STAFFLINK_STORAGE_BACKEND="local",
+            STAFFLINK_STORAGE_BASE_PATH=storage_dir.name,
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+        get_storage_client.cache_clear()
+        self.addCleanup(get_storage_client.cache_clear)
+
+    def _files(self) -> list[Path]:
+        return [path for path in self.root.rglob("*") if path.is_file()]
+
+    def test_duplicates_share_one_blob_until_last_release(self) -> None:
+        content = b"%PDF-1.7 dni escaneado"
+        with self.captureOnCommitCallbacks(execute=True):
+            first = blob_service.store_blob(
+                io.BytesIO(content), content_type="application/pdf"
+            )
+        storage = get_storage_client()
+        with mock.patch.object(
+            storage, "save_file", wraps=storage.save_file
+        ) as save, self.captureOnCommitCallbacks(execute=True):
+            second = blob_service.store_blob(
+                io.BytesIO(content), content_type="application/pdf"
+            )
+        # El duplicado se detecta por hash antes de escribir en el storage
+        save.assert_not_called()
+
+        self.assertEqual(first.sha256, hashlib.sha256(content).hexdigest())
+        self.assertEqual(second.path, first.path)
+        self.assertEqual(second.ref_count, 2)
+        self.assertEqual(self._files(), [Path(first.path)])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertFalse(blob_service.release_blob(first.sha256))
+        self.assertTrue(Path(first.path).exists())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(blob_service.release_blob(first.sha256))
+        self.assertEqual(self._files(), [])
+        self.assertFalse(models.StoredBlob.objects.exists())
+
+    def test_different_content_gets_its_own_blob(self) -> None:
+        a = blob_service.store_blob(io.BytesIO(b"a"), content_type="text/plain")
+        b = blob_service.store_blob(io.BytesIO(b"b"), content_type="text/plain")
+
+        self.assertNotEqual(a.path, b.path)
+        self.assertEqual((a.size, a.ref_count), (1, 1))
+        self.assertEqual(len(self._files()), 2)
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import uuid
+
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from api.v1.recruitment import models
+
+from .utils import create_applicant, create_campaign, create_convocatoria
+
+
+class CandidateBulkUpdateTests(APITestCase):
+    def setUp(self) -> None:
+        self.owner_id = uuid.uuid4()
+        campaign = create_campaign()
+        self.link = create_convocatoria(campaign, owner_id=self.owner_id, grupo="G1")
+        self.other_link = create_convocatoria(campaign, slug="ajena", grupo="G2")
+        self.mine = [
+            create_applicant(self.link, document_number=f"1111111{n}") for n in range(3)
+        ]
+        self.foreign = create_applicant(self.other_link, document_number="22222222")
+        models.LinkCounter.objects.create(link=self.link, postulantes=3)
+        # Sesión IAM real: sin candidates.read, get_queryset limita al dueño
+        self.client.force_authenticate(
+            token={
+                "permissions": ["candidates.process"],
+                "user_id": str(self.owner_id),
+            }
+        )
+
+    def test_bulk_process_respects_ownership_and_reports_per_id(self) -> None:
+        missing = uuid.uuid4()
+        ids = [str(c.pk) for c in self.mine] + [str(self.foreign.pk), str(missing)]
+        response = self.client.patch(
+            reverse("candidates-bulk-process"),
+            {"ids": ids, "data": {"inicio_capacitacion_at": "2025-11-03T09:00:00Z"}},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["updated"], 3)
+        statuses = {item["id"]: item["status"] for item in body["results"]}
+        self.assertEqual(statuses[str(self.foreign.pk)], "not_found")
+        self.assertEqual(statuses[str(missing)], "not_found")
+        processes = models.CandidateProcess.objects.filter(
+            inicio_capacitacion_at__isnull=False
+        )
+        self.assertEqual(
+            set(processes.values_list("candidate_id", flat=True)),
+            {c.pk for c in self.mine},
+        )
+        self.assertTrue(all(p.updated_by == self.owner_id for p in processes))
+        self.assertFalse(
+            models.CandidateProcess.objects.filter(candidate=self.foreign).exists()
+        )
+
+    def test_bulk_documents_by_filter_updates_completos_counter(self) -> None:
+        url = reverse("candidates-bulk-documents")
+        response = self.client.patch(
+            url,
+            {"filter": {"grupo": "G1"}, "data": {"status": "completo"}},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["updated"], 3)
+        counter = models.LinkCounter.objects.get(link=self.link)
+        self.assertEqual(counter.completos, 3)
+
+        self.client.patch(
+            url,
+            {"ids": [str(self.mine[0].pk)], "data": {"status": "observado"}},
+            format="json",
+        )
+        counter.refresh_from_db()
+        self.assertEqual(counter.completos, 2)
+
+    def test_bulk_assignment_copies_link_conditions_to_new_rows(self) -> None:
+        models.Link.objects.filter(pk=self.link.pk).update(
+            razon_social="STAFFLINK SAC", cargo_contractual="ASESOR"
+        )
+        self.client.force_authenticate(
+            token={
+                "permissions": ["candidates.contract"],
+                "user_id": str(self.owner_id),
+            }
+        )
+        response = self.client.patch(
+            reverse("candidates-bulk-assignment"),
+            {"ids": [str(c.pk) for c in self.mine], "data": {"bono_variable": "100"}},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200, response.content)
+        assignments = models.CandidateAssignment.objects.filter(candidate__in=self.mine)
+        self.assertEqual(assignments.count(), 3)
+        for assignment in assignments:
+            self.assertEqual(assignment.razon_social, "STAFFLINK SAC")
+            self.assertEqual(assignment.cargo_contractual, "ASESOR")
+
+    def test_bulk_update_validates_payload(self) -> None:
+        url = reverse("candidates-bulk-assignment")
+        headers = {"HTTP_X_STAFFLINK_PERMISSIONS": "candidates.contract"}
+        both = self.client.patch(
+            url,
+            {"ids": [str(self.mine[0].pk)], "filter": {"grupo": "G1"}, "data": {}},
+            format="json",
+            **headers,
+        )
+        self.assertEqual(both.status_code, 400)
+        invalid = self.client.patch(
+            url,
+            {"ids": [str(self.mine[0].pk)], "data": {"estado": "desconocido"}},
+            format="json",
+            **headers,
+        )
+        self.assertEqual(invalid.status_code, 400)
+        self.assertIn("estado", invalid.json()["data"])
+        forbidden = self.client.patch(
+            url,
+            {"ids": [str(self.mine[0].pk)], "data": {"estado": "cese"}},
+            format="json",
+        )
+        self.assertEqual(forbidden.status_code, 403)
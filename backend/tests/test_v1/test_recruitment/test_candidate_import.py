@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import io
+import zipfile
+from datetime import date
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from api.shared import xlsx
+from api.shared.xlsx import XlsxReadError, iter_xlsx, iter_xlsx_rows
+from api.v1.recruitment import models
+from api.v1.recruitment.services import candidate_import_service
+
+from .utils import create_applicant, create_campaign, create_convocatoria
+
+HEADER = "Tipo de documento;DNI;Apellido paterno;Nombres;Teléfono;Correo electrónico"
+
+
+def _csv(*lines: str) -> bytes:
+    return "\n".join([HEADER, *lines]).encode("utf-8")
+
+
+def _crafted_xlsx(*, first_ref: str = "A1", shared: str | None = None) -> bytes:
+    """XLSX de una celda con la referencia y los strings compartidos indicados."""
+
+    source = zipfile.ZipFile(io.BytesIO(b"".join(iter_xlsx([["DNI"]]))))
+    target = io.BytesIO()
+    with source, zipfile.ZipFile(target, "w") as archive:
+        for name in source.namelist():
+            content = source.read(name)
+            if name == "xl/worksheets/sheet1.xml":
+                content = content.replace(b'r="A1"', f'r="{first_ref}"'.encode())
+            archive.writestr(name, content)
+        if shared is not None:
+            archive.writestr("xl/sharedStrings.xml", shared)
+    return target.getvalue()
+
+
+def _row(numero: str, email: str = "ana@example.com") -> str:
+    return f"DNI;{numero};PEREZ;ANA;999888777;{email}"
+
+
+class CandidateImportTests(APITestCase):
+    def setUp(self) -> None:
+        self.campaign = create_campaign()
+        self.link = create_convocatoria(self.campaign, razon_social="GEA SAC")
+        self.headers = {"HTTP_X_STAFFLINK_PERMISSIONS": "candidates.manage"}
+
+    def _upload(self, content: bytes, name: str = "postulantes.csv"):
+        return self.client.post(
+            reverse("candidates-bulk-import"),
+            {
+                "convocatoria": str(self.link.pk),
+                "archivo": SimpleUploadedFile(name, content),
+            },
+            format="multipart",
+            **self.headers,
+        )
+
+    def test_csv_import_creates_valid_rows_and_reports_the_rest(self) -> None:
+        create_applicant(self.link, document_number="33333333")
+        models.Blacklist.objects.create(dni="44444444", nombres="VETADO")
+        content = _csv(
+            _row("11111111"),
+            _row("1234567"),
+            _row("123"),
+            _row("33333333"),
+            _row("44444444"),
+            _row("11111111"),
+            _row("55555555", email="no-es-correo"),
+            ";;;;;",
+        )
+
+        response = self._upload(content)
+
+        self.assertEqual(response.status_code, 200)
+        report = response.json()
+        self.assertEqual(report["total"], 7)
+        self.assertEqual(report["created"], 2)
+        errors = {error["row"]: error["errors"] for error in report["errors"]}
+        self.assertEqual(sorted(errors), [4, 5, 6, 7, 8])
+        self.assertIn("numero_documento", errors[4])
+        self.assertIn("blacklist", errors[6]["numero_documento"][0])
+        self.assertIn("email", errors[8])
+
+        created = models.Candidate.objects.get(numero_documento="01234567")
+        self.assertEqual(created.assignment.razon_social, "GEA SAC")
+        self.assertTrue(
+            models.CandidateDocuments.objects.filter(candidate=created).exists()
+        )
+        self.assertTrue(
+            models.CandidateProcess.objects.filter(candidate=created).exists()
+        )
+        self.assertEqual(models.LinkCounter.objects.get(link=self.link).postulantes, 3)
+
+    def test_xlsx_import_maps_excel_headers_and_serial_dates(self) -> None:
+        rows = [
+            [
+                "DNI",
+                "Apellido Paterno",
+                "Nombres",
+                "Celular",
+                "Correo",
+                "Fecha de nacimiento",
+                "Sede",
+            ],
+            [12345678, "QUISPE", "LUIS", 999111222, "luis@example.com", 36526, "LIMA"],
+        ]
+        content = b"".join(iter_xlsx(rows))
+
+        response = self._upload(content, name="postulantes.xlsx")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["created"], 1)
+        self.assertEqual(response.json()["ignored_columns"], ["Sede"])
+        candidate = models.Candidate.objects.get(numero_documento="12345678")
+        self.assertEqual(candidate.fecha_nacimiento, date(2000, 1, 1))
+        self.assertEqual(candidate.telefono, "999111222")
+
+    def test_queries_grow_with_batches_not_rows(self) -> None:
+        def run(numbers: range) -> int:
+            content = _csv(*(_row(f"{number:08d}") for number in numbers))
+            with CaptureQueriesContext(connection) as queries:
+                report = candidate_import_service.import_candidates(
+                    link=self.link,
+                    file_obj=io.BytesIO(content),
+                    file_format="csv",
+                    actor_id=None,
+                    batch_size=100,
+                )
+            self.assertFalse(report.errors)
+            return len(queries)
+
+        run(range(1, 2))  # crea el contador del link
+        # Rango chico para que SQLite no parta los INSERT por límite de parámetros
+        self.assertEqual(run(range(2, 5)), run(range(100, 125)))
+
+    def test_cuotas_limit_rows_and_missing_columns_are_rejected(self) -> None:
+        self.link.cuotas = 1
+        self.link.save()
+
+        response = self._upload(_csv(_row("11111111"), _row("22222222")))
+        self.assertEqual(response.json()["created"], 1)
+        self.assertIn(
+            "cuotas", response.json()["errors"][0]["errors"]["non_field_errors"][0]
+        )
+
+        invalid = self._upload(b"DNI;Nombres\n11111111;ANA")
+        self.assertEqual(invalid.status_code, 400)
+        self.assertIn("archivo", invalid.json())
+
+
+class XlsxReaderLimitTests(SimpleTestCase):
+    def test_oversized_cell_reference_is_rejected(self) -> None:
+        for ref in ("ZZZZZZZZ1", "XFE1"):
+            content = _crafted_xlsx(first_ref=ref)
+            with self.subTest(ref=ref), self.assertRaises(XlsxReadError):
+                list(iter_xlsx_rows(io.BytesIO(content)))
+
+        widest = list(iter_xlsx_rows(io.BytesIO(_crafted_xlsx(first_ref="XFD1"))))
+        self.assertEqual(len(widest[0]), xlsx.MAX_COLUMN_INDEX + 1)
+
+    def test_shared_strings_table_is_bounded(self) -> None:
+        shared = (
+            '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            + "<si><t>texto</t></si>" * 3
+            + "</sst>"
+        )
+        content = _crafted_xlsx(shared=shared)
+
+        self.assertEqual(list(iter_xlsx_rows(io.BytesIO(content))), [["DNI"]])
+        with mock.patch.object(xlsx, "MAX_SHARED_STRINGS", 2):
+            with self.assertRaises(XlsxReadError):
+                list(iter_xlsx_rows(io.BytesIO(content)))
@@ -5,6 +5,8 @@ import uuid
 from rest_framework.reverse import reverse
 from rest_framework.test import APITestCase
 
+from api.v1.recruitment import models
+
 from .utils import create_campaign, create_convocatoria
 
 
@@ -84,3 +86,23 @@ class ConvocatoriaViewSetTests(APITestCase):
         self.assertEqual(response.status_code, 200)
         slugs = {item["slug"] for item in response.json()}
         self.assertEqual(slugs, {self.main_link.slug, self.other_link.slug})
+
+    def test_list_exposes_fill_ratio_from_counter(self) -> None:
+        self.main_link.cuotas = 4
+        self.main_link.save(update_fields=["cuotas"])
+        models.LinkCounter.objects.create(link=self.main_link, postulantes=1)
+        url = reverse("convocatorias-list")
+        response = self.client.get(
+            url,
+            **self._auth_headers(
+                user_id=self.owner_id,
+                permissions=["convocatorias.read", "convocatorias.manage"],
+            ),
+        )
+
+        self.assertEqual(response.status_code, 200)
+        items = {item["slug"]: item for item in response.json()["results"]}
+        self.assertEqual(items[self.main_link.slug]["postulantes"], 1)
+        self.assertEqual(items[self.main_link.slug]["fill_ratio"], 0.25)
+        self.assertEqual(items[self.other_link.slug]["postulantes"], 0)
+        self.assertIsNone(items[self.other_link.slug]["fill_ratio"])
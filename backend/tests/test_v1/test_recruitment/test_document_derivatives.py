@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import importlib.util
+import io
+import sys
+import types
+import unittest
+from concurrent.futures import TimeoutError as FutureTimeout
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from rest_framework.reverse import reverse
+
+from api.v1.recruitment import models
+from api.v1.recruitment.services import (
+    blob_service,
+    derivative_service,
+    document_service,
+    outbox_service,
+)
+from integrations.imaging import derivatives
+from integrations.imaging.derivatives import (
+    DerivativeSpec,
+    ImagingError,
+    Rendition,
+    render,
+)
+
+from .test_document_upload import PDF, CandidateStorageTestCase
+
+HAS_PIL = importlib.util.find_spec("PIL") is not None
+
+
+def fake_render(source, content_type, specs):
+    return [
+        Rendition(name=spec.name, data=f"jpeg {spec.name}".encode(), width=10, height=5)
+        for spec in specs
+    ]
+
+
+@override_settings(STAFFLINK_DERIVATIVE_WORKERS=0)
+class DerivativePipelineTests(CandidateStorageTestCase):
+    def _upload_and_relay(self) -> models.CandidateDocumentFile:
+        with self.captureOnCommitCallbacks(execute=True):
+            document = document_service.upload_document(
+                candidate=self.candidate, kind="cv", stream=io.BytesIO(PDF)
+            )
+        with mock.patch.object(derivative_service, "render", side_effect=fake_render):
+            result = outbox_service.relay_pending()
+        self.assertEqual(result.failed, 0)
+        return document
+
+    def test_upload_event_generates_derivatives_once_per_blob(self) -> None:
+        document = self._upload_and_relay()
+
+        derivatives = {d.name: d for d in document.blob.derivatives.all()}
+        self.assertEqual(set(derivatives), {"thumb", "preview"})
+        stored = get_file_bytes(derivatives["thumb"].path)
+        self.assertEqual(stored, b"jpeg thumb")
+
+        with mock.patch.object(derivative_service, "render") as rerender:
+            derivative_service.generate_derivatives(document.blob)
+        rerender.assert_not_called()
+
+    def test_derivatives_are_served_with_immutable_cache_headers(self) -> None:
+        document = self._upload_and_relay()
+        info = self.client.get(
+            reverse("candidates-upload-document", args=[self.candidate.pk, "cv"]),
+            **self.headers,
+        ).json()
+        url = info["previews"]["preview"]
+        self.assertIn(document.blob_id, url)
+
+        response = self.client.get(url, **self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), b"jpeg preview")
+        self.assertEqual(response["Content-Type"], "image/jpeg")
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertIn("max-age=31536000", response["Cache-Control"])
+
+        cached = self.client.get(
+            url, HTTP_IF_NONE_MATCH=response["ETag"], **self.headers
+        )
+        self.assertEqual(cached.status_code, 304)
+
+    def test_releasing_the_blob_removes_its_derivatives(self) -> None:
+        document = self._upload_and_relay()
+        self.assertEqual(len(self._files()), 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            document.delete()
+            blob_service.release_blob(document.blob_id)
+
+        self.assertEqual(self._files(), [])
+        self.assertFalse(models.BlobDerivative.objects.exists())
+
+    def test_unrenderable_files_do_not_retry_the_event(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            document_service.upload_document(
+                candidate=self.candidate, kind="cv", stream=io.BytesIO(PDF)
+            )
+        with mock.patch.object(
+            derivative_service, "render", side_effect=ImagingError("dañado")
+        ):
+            result = outbox_service.relay_pending()
+
+        self.assertEqual((result.retried, result.failed), (0, 0))
+        self.assertFalse(models.BlobDerivative.objects.exists())
+
+    def test_render_timeouts_do_not_retry_the_event(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            document_service.upload_document(
+                candidate=self.candidate, kind="cv", stream=io.BytesIO(PDF)
+            )
+        with mock.patch.object(
+            derivative_service, "_render", side_effect=FutureTimeout()
+        ):
+            result = outbox_service.relay_pending()
+
+        self.assertEqual((result.retried, result.failed), (0, 0))
+        self.assertFalse(models.BlobDerivative.objects.exists())
+
+
+def get_file_bytes(path: str) -> bytes:
+    with derivative_service.get_storage_client().open(path) as handle:
+        return handle.read()
+
+
+class RenderTests(SimpleTestCase):
+    @override_settings(STAFFLINK_DERIVATIVE_WORKERS=1)
+    def test_errors_in_the_process_pool_reach_the_caller(self) -> None:
+        self.addCleanup(derivative_service.shutdown_pool)
+        with self.assertRaises(ImagingError):
+            derivative_service._render(b"texto", "text/plain")
+
+    def test_damaged_pdfs_raise_imaging_errors(self) -> None:
+        class FileDataError(RuntimeError):
+            pass
+
+        def broken_open(**kwargs):
+            raise FileDataError("cannot open broken document")
+
+        fitz = types.SimpleNamespace(open=broken_open)
+        with mock.patch.dict(sys.modules, {"fitz": fitz}):
+            with self.assertRaisesMessage(ImagingError, "PDF ilegible"):
+                derivatives._pdf_first_page(b"%PDF-1.7 roto", 200)
+
+    def test_pdfs_with_an_empty_page_raise_imaging_errors(self) -> None:
+        page = types.SimpleNamespace(rect=types.SimpleNamespace(width=0, height=0))
+        document = mock.MagicMock(page_count=1)
+        document.__enter__.return_value = document
+        document.__getitem__.return_value = page
+        fitz = types.SimpleNamespace(open=lambda **kwargs: document)
+        with mock.patch.dict(sys.modules, {"fitz": fitz}):
+            with self.assertRaisesMessage(ImagingError, "no tiene tamaño"):
+                derivatives._pdf_first_page(b"%PDF-1.7 sin tamano", 200)
+
+    @unittest.skipUnless(HAS_PIL, "requiere Pillow")
+    def test_images_are_downscaled_to_each_spec(self) -> None:
+        from PIL import Image
+
+        buffer = io.BytesIO()
+        Image.new("RGBA", (2000, 1000), (255, 0, 0, 128)).save(buffer, "PNG")
+        renditions = render(
+            buffer.getvalue(),
+            "image/png",
+            [
+                DerivativeSpec(name="thumb", max_side=200, quality=70),
+                DerivativeSpec(name="preview", max_side=800, quality=80),
+            ],
+        )
+
+        sizes = {r.name: (r.width, r.height) for r in renditions}
+        self.assertEqual(sizes, {"preview": (800, 400), "thumb": (200, 100)})
+        self.assertTrue(renditions[0].data.startswith(b"\xff\xd8\xff"))
@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import tempfile
+import uuid
+from pathlib import Path
+
+from django.test import SimpleTestCase, override_settings
+from rest_framework.exceptions import ValidationError
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from api.v1.recruitment import models
+from api.v1.recruitment.services import (
+    blob_service,
+    candidate_service,
+    document_service,
+)
+from api.v1.recruitment.storage import get_storage_client
+from api.v1.recruitment.validators.file_validator import StreamingFileValidator
+
+from .utils import create_applicant, create_campaign, create_convocatoria
+
+PDF = b"%PDF-1.7\n" + b"x" * 4096
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 128
+
+
+class StreamingFileValidatorTests(SimpleTestCase):
+    def test_signature_is_checked_before_reading_the_body(self) -> None:
+        source = io.BytesIO(b"MZ\x90\x00" + b"\x00" * 10_000)
+        reader = StreamingFileValidator(source, max_bytes=1_000_000)
+        with self.assertRaises(ValidationError):
+            reader.sniff()
+        self.assertLessEqual(source.tell(), 8)
+
+    def test_size_limit_is_enforced_while_streaming(self) -> None:
+        reader = StreamingFileValidator(io.BytesIO(PDF), max_bytes=1024)
+        self.assertEqual(reader.sniff(), "application/pdf")
+        with self.assertRaises(ValidationError):
+            while reader.read(256):
+                pass
+        self.assertLessEqual(reader.size, 1024 + 256)
+
+    def test_reads_return_the_full_content(self) -> None:
+        reader = StreamingFileValidator(io.BytesIO(PNG), max_bytes=1024)
+        self.assertEqual(reader.read(), PNG)
+        self.assertEqual(reader.content_type, "image/png")
+
+
+class CandidateStorageTestCase(APITestCase):
+    def setUp(self) -> None:
+        storage_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(storage_dir.cleanup)
+        self.root = Path(storage_dir.name)
+        override = override_settings(
+            STAFFLINK_STORAGE_BACKEND="local",
+            STAFFLINK_STORAGE_BASE_PATH=storage_dir.name,
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+        get_storage_client.cache_clear()
+        self.addCleanup(get_storage_client.cache_clear)
+
+        self.link = create_convocatoria(create_campaign())
+        self.candidate = create_applicant(self.link)
+        models.LinkCounter.objects.create(link=self.link, postulantes=1)
+        self.headers = {
+            "HTTP_X_STAFFLINK_PERMISSIONS": "candidates.process",
+            "HTTP_X_STAFFLINK_USER_ID": str(uuid.uuid4()),
+        }
+
+    def _files(self) -> list[Path]:
+        return [path for path in self.root.rglob("*") if path.is_file()]
+
+
+class DocumentUploadTests(CandidateStorageTestCase):
+    def _upload(self, kind: str, content: bytes, **extra):
+        url = reverse("candidates-upload-document", args=[self.candidate.pk, kind])
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.put(
+                url, content, content_type="application/octet-stream", **extra
+            )
+
+    def test_upload_stores_file_and_marks_checklist(self) -> None:
+        response = self._upload(
+            "cv",
+            PDF,
+            HTTP_CONTENT_DISPOSITION='attachment; filename="cv maria.pdf"',
+            **self.headers,
+        )
+
+        self.assertEqual(response.status_code, 200, response.content)
+        body = response.json()
+        self.assertEqual(body["file"]["sha256"], hashlib.sha256(PDF).hexdigest())
+        self.assertEqual(body["file"]["content_type"], "application/pdf")
+        self.assertEqual(body["file"]["filename"], "cv maria.pdf")
+        self.assertTrue(body["documents"]["cv_entregado"])
+        self.assertFalse(body["documents"]["dni_entregado"])
+        self.assertEqual([p.read_bytes() for p in self._files()], [PDF])
+
+    def test_replacing_a_file_releases_the_previous_blob(self) -> None:
+        self._upload("dni", PDF, **self.headers)
+        self._upload("dni", PNG, **self.headers)
+
+        document = models.CandidateDocumentFile.objects.get(candidate=self.candidate)
+        self.assertEqual(document.content_type, "image/png")
+        self.assertEqual([p.read_bytes() for p in self._files()], [PNG])
+        self.assertEqual(models.StoredBlob.objects.count(), 1)
+
+    def test_invalid_uploads_store_nothing(self) -> None:
+        bad_signature = self._upload("cv", b"GIF89a" + b"\x00" * 64, **self.headers)
+        self.assertEqual(bad_signature.status_code, 400)
+        with override_settings(STAFFLINK_UPLOAD_MAX_SIZE_BYTES=1024):
+            too_big = self._upload("cv", PDF, **self.headers)
+        self.assertEqual(too_big.status_code, 400)
+        unknown_kind = self._upload("pasaporte", PDF, **self.headers)
+        self.assertEqual(unknown_kind.status_code, 404)
+
+        self.assertEqual(self._files(), [])
+        self.assertFalse(models.StoredBlob.objects.exists())
+        self.assertFalse(
+            models.CandidateDocuments.objects.filter(cv_entregado=True).exists()
+        )
+
+    def test_upload_requires_process_permission(self) -> None:
+        response = self._upload(
+            "cv", PDF, HTTP_X_STAFFLINK_PERMISSIONS="candidates.read"
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_public_upload_requires_the_candidate_token(self) -> None:
+        url = reverse(
+            "public:public-candidate-document", args=[self.candidate.pk, "dni"]
+        )
+        token = document_service.make_upload_token(self.candidate)
+        other = document_service.make_upload_token(
+            create_applicant(self.link, document_number="99999999")
+        )
+
+        denied = self.client.put(
+            url, PDF, content_type="application/pdf", HTTP_X_UPLOAD_TOKEN=other
+        )
+        self.assertEqual(denied.status_code, 403)
+        with self.captureOnCommitCallbacks(execute=True):
+            accepted = self.client.put(
+                url, PDF, content_type="application/pdf", HTTP_X_UPLOAD_TOKEN=token
+            )
+        self.assertEqual(accepted.status_code, 200, accepted.content)
+        self.candidate.documents.refresh_from_db()
+        self.assertTrue(self.candidate.documents.dni_entregado)
+
+    def test_deleting_the_candidate_releases_its_files(self) -> None:
+        self._upload("cv", PDF, **self.headers)
+        with self.captureOnCommitCallbacks(execute=True):
+            candidate_service.delete_candidate(candidate=self.candidate)
+
+        self.assertEqual(self._files(), [])
+        self.assertFalse(models.StoredBlob.objects.exists())
+
+
+class DirectUploadTests(CandidateStorageTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.token = document_service.make_upload_token(self.candidate)
+
+    def _public(self, name: str, kind: str = "cv") -> str:
+        return reverse(f"public:{name}", args=[self.candidate.pk, kind])
+
+    def _request_upload(self, content: bytes, **overrides) -> dict:
+        payload = {
+            "size": len(content),
+            "sha256": hashlib.sha256(content).hexdigest(),
+            "content_type": "application/pdf",
+            "filename": "cv.pdf",
+            **overrides,
+        }
+        response = self.client.post(
+            self._public("public-candidate-document-upload-url"),
+            payload,
+            format="json",
+            HTTP_X_UPLOAD_TOKEN=self.token,
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def _put(self, upload: dict, content: bytes):
+        return self.client.generic(
+            upload["method"],
+            upload["url"],
+            content,
+            content_type=upload["headers"]["Content-Type"],
+        )
+
+    def _complete(self, upload: dict):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                self._public("public-candidate-document-complete"),
+                {"ticket": upload["ticket"]},
+                format="json",
+                HTTP_X_UPLOAD_TOKEN=self.token,
+            )
+
+    def test_direct_upload_is_verified_on_completion(self) -> None:
+        upload = self._request_upload(PDF)
+        self.assertTrue(upload["url"].startswith("http://testserver/api/v1/storage/"))
+        self.assertEqual(self._put(upload, PDF).status_code, 200)
+
+        response = self._complete(upload)
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()["sha256"], hashlib.sha256(PDF).hexdigest())
+        self.candidate.documents.refresh_from_db()
+        self.assertTrue(self.candidate.documents.cv_entregado)
+
+        staff_url = reverse(
+            "candidates-upload-document", args=[self.candidate.pk, "cv"]
+        )
+        download = self.client.get(staff_url, **self.headers).json()
+        body = self.client.get(download["url"])
+        self.assertEqual(b"".join(body.streaming_content), PDF)
+        self.assertIn('filename="cv.pdf"', body["Content-Disposition"])
+
+    def test_replayed_completion_keeps_the_stored_file(self) -> None:
+        upload = self._request_upload(PDF)
+        self._put(upload, PDF)
+        first = self._complete(upload)
+
+        replay = self._complete(upload)
+
+        self.assertEqual(replay.status_code, 200, replay.content)
+        self.assertEqual(replay.json()["id"], first.json()["id"])
+        blob = models.StoredBlob.objects.get()
+        self.assertEqual(blob.ref_count, 1)
+        self.assertIn(self.root / blob.path, self._files())
+
+    def test_adopting_the_blob_path_again_does_not_delete_it(self) -> None:
+        upload = self._request_upload(PDF)
+        self._put(upload, PDF)
+        self._complete(upload)
+        blob = models.StoredBlob.objects.get()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            blob_service.adopt_blob(
+                get_storage_client().describe(blob.path),
+                content_type=blob.content_type,
+            )
+
+        blob.refresh_from_db()
+        self.assertEqual(blob.ref_count, 2)
+        self.assertIn(self.root / blob.path, self._files())
+
+    def test_storage_rejects_a_body_that_does_not_match_the_signature(self) -> None:
+        upload = self._request_upload(PDF)
+        self.assertEqual(self._put(upload, PNG).status_code, 400)
+        self.assertEqual(self._complete(upload).status_code, 400)
+        self.assertEqual(self._files(), [])
+
+    def test_upload_urls_write_only_once(self) -> None:
+        upload = self._request_upload(PDF)
+        self.assertEqual(self._put(upload, PDF).status_code, 200)
+        self._complete(upload)
+
+        self.assertEqual(self._put(upload, PDF).status_code, 412)
+        blob = models.StoredBlob.objects.get()
+        self.assertEqual(get_storage_client().describe(blob.path).sha256, blob.sha256)
+        self.assertEqual(len(self._files()), 1)
+
+    def test_upload_urls_refuse_bodies_over_the_signed_size(self) -> None:
+        upload = self._request_upload(PDF)
+
+        response = self._put(upload, PDF + b"relleno")
+
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(self._files(), [])
+
+    def test_completion_rejects_content_of_another_type(self) -> None:
+        content = b"MZ\x90\x00 ejecutable"
+        upload = self._request_upload(content)
+        self._put(upload, content)
+
+        response = self._complete(upload)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self._files(), [])
+        self.assertFalse(models.CandidateDocumentFile.objects.exists())
+
+    def test_tickets_and_urls_are_bound_to_what_was_signed(self) -> None:
+        with override_settings(STAFFLINK_UPLOAD_MAX_SIZE_BYTES=16):
+            too_big = self.client.post(
+                self._public("public-candidate-document-upload-url"),
+                {"size": 17, "sha256": "0" * 64, "content_type": "application/pdf"},
+                format="json",
+                HTTP_X_UPLOAD_TOKEN=self.token,
+            )
+        self.assertEqual(too_big.status_code, 400)
+
+        upload = self._request_upload(PDF)
+        other_kind = self.client.post(
+            self._public("public-candidate-document-complete", kind="dni"),
+            {"ticket": upload["ticket"]},
+            format="json",
+            HTTP_X_UPLOAD_TOKEN=self.token,
+        )
+        self.assertEqual(other_kind.status_code, 400)
+        tampered = self.client.get(upload["url"])
+        self.assertEqual(tampered.status_code, 403)
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import smtplib
+from unittest import mock
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+
+from api.v1.recruitment import models
+from api.v1.recruitment.services import convocatoria_service, outbox_service
+from api.v1.recruitment.services import notification_service
+from integrations.notifications import email_client
+from integrations.notifications.email_client import EmailClient, Recipient
+
+from .utils import create_applicant, create_campaign, create_convocatoria
+
+SUBJECT = "recruitment/email/convocatoria_cerrada_subject.txt"
+BODY = "recruitment/email/convocatoria_cerrada_body.txt"
+
+
+class FlakyBackend(EmailBackend):
+    """locmem que pierde la conexión en los primeros `failures` envíos."""
+
+    def __init__(self, failures: int = 0, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.failures = failures
+        self.opened = 0
+
+    def open(self):
+        self.opened += 1
+        return True
+
+    def send_messages(self, messages):
+        if self.failures:
+            self.failures -= 1
+            raise smtplib.SMTPServerDisconnected("conexión cerrada")
+        return super().send_messages(messages)
+
+
+class RefusingBackend(EmailBackend):
+    """locmem que rechaza una vez a los destinatarios de `refused`."""
+
+    def __init__(self, refused: set[str] = frozenset(), **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.refused = set(refused)
+
+    def send_messages(self, messages):
+        to = messages[0].to[0]
+        if to in self.refused:
+            self.refused.discard(to)
+            raise smtplib.SMTPRecipientsRefused({to: (550, b"buzon lleno")})
+        return super().send_messages(messages)
+
+
+class EmailClientTests(TestCase):
+    def setUp(self) -> None:
+        self.link = create_convocatoria(create_campaign(), titulo="Ventas Lima")
+        self.sleeps: list[float] = []
+
+    def _client(self, **kwargs) -> EmailClient:
+        kwargs.setdefault("rate_per_second", 0)
+        return EmailClient(sleep=self.sleeps.append, **kwargs)
+
+    def test_send_many_reuses_connection_and_compiles_templates_once(self) -> None:
+        backend = FlakyBackend()
+        recipients = [
+            Recipient(email=f"p{n}@example.com", context={"nombres": f"P{n}"})
+            for n in range(3)
+        ]
+        with mock.patch.object(
+            email_client, "get_connection", return_value=backend
+        ), mock.patch.object(
+            email_client, "get_template", wraps=email_client.get_template
+        ) as loader:
+            result = self._client().send_many(
+                recipients,
+                subject_template=SUBJECT,
+                body_template=BODY,
+                context={"convocatoria": self.link},
+            )
+
+        self.assertEqual((result.sent, result.failed), (3, []))
+        self.assertEqual(backend.opened, 1)
+        self.assertEqual(loader.call_count, 2)
+        self.assertEqual(mail.outbox[0].subject, "Convocatoria Ventas Lima cerrada")
+        self.assertIn("Hola P2", mail.outbox[2].body)
+
+    def test_transient_errors_are_retried_with_backoff(self) -> None:
+        backend = FlakyBackend(failures=2)
+        with mock.patch.object(email_client, "get_connection", return_value=backend):
+            result = self._client(max_retries=2, backoff_seconds=0.5).send_many(
+                [Recipient(email="a@example.com"), Recipient(email="b@example.com")],
+                subject_template=SUBJECT,
+                body_template=BODY,
+                context={"convocatoria": self.link},
+            )
+
+        self.assertEqual(result.sent, 2)
+        self.assertEqual(self.sleeps, [0.5, 1.0])
+        self.assertEqual(backend.opened, 3)
+
+        backend.failures = 5
+        with mock.patch.object(email_client, "get_connection", return_value=backend):
+            result = self._client(max_retries=1, backoff_seconds=0).send_many(
+                [Recipient(email="c@example.com")],
+                subject_template=SUBJECT,
+                body_template=BODY,
+                context={"convocatoria": self.link},
+            )
+        self.assertEqual(result.sent, 0)
+        self.assertEqual(result.failed[0][0], "c@example.com")
+
+    def test_only_temporary_failures_are_retried(self) -> None:
+        self.assertTrue(email_client.is_transient(smtplib.SMTPDataError(451, b"")))
+        self.assertTrue(email_client.is_transient(ConnectionResetError()))
+        self.assertFalse(email_client.is_transient(smtplib.SMTPDataError(550, b"")))
+        self.assertFalse(
+            email_client.is_transient(
+                smtplib.SMTPRecipientsRefused({"a@x.com": (550, b"")})
+            )
+        )
+        self.assertFalse(email_client.is_transient(FileNotFoundError()))
+
+        backend = RefusingBackend(refused={"a@example.com"})
+        with mock.patch.object(email_client, "get_connection", return_value=backend):
+            result = self._client(max_retries=3, backoff_seconds=1).send_many(
+                [Recipient(email="a@example.com")],
+                subject_template=SUBJECT,
+                body_template=BODY,
+                context={"convocatoria": self.link},
+            )
+        self.assertEqual(result.failed[0][0], "a@example.com")
+        self.assertEqual(self.sleeps, [])
+
+    def test_rate_limit_spaces_messages(self) -> None:
+        clock = mock.Mock(side_effect=[0.0, 0.1, 0.2])
+        limiter = email_client._RateLimiter(4, clock=clock, sleep=self.sleeps.append)
+        for _ in range(3):
+            limiter.wait()
+        self.assertEqual(self.sleeps, [0.15, 0.3])
+
+    def test_closing_a_convocatoria_notifies_applicants_through_the_outbox(
+        self,
+    ) -> None:
+        create_applicant(self.link, document_number="11111111", email="a@x.com")
+        create_applicant(self.link, document_number="22222222", email="")
+        convocatoria_service.set_status(
+            convocatoria=self.link,
+            estado=models.Link.Estado.REVOCADO,
+            actor_id=None,
+        )
+        self.assertEqual(mail.outbox, [])
+
+        outbox_service.relay_pending()
+
+        self.assertEqual([m.to for m in mail.outbox], [["a@x.com"]])
+
+    @override_settings(STAFFLINK_EMAIL_MAX_RETRIES=0)
+    def test_closing_fans_out_and_retries_only_failed_recipients(self) -> None:
+        for n in range(4):
+            create_applicant(
+                self.link, document_number=f"1111111{n}", email=f"p{n}@x.com"
+            )
+        backend = RefusingBackend(refused={"p1@x.com"})
+        convocatoria_service.set_status(
+            convocatoria=self.link,
+            estado=models.Link.Estado.EXPIRADO,
+            actor_id=None,
+        )
+
+        with mock.patch.object(
+            notification_service, "NOTIFY_CHUNK_SIZE", 2
+        ), mock.patch.object(email_client, "get_connection", return_value=backend):
+            outbox_service.relay_pending()
+            chunks = models.OutboxEvent.objects.filter(
+                event_type=notification_service.CLOSED_NOTIFICATION
+            )
+            self.assertEqual(chunks.count(), 3)
+            retry = chunks.get(status=models.OutboxEvent.Status.PENDIENTE)
+            self.assertEqual(retry.payload["retry"], 1)
+            self.assertEqual(len(retry.payload["candidates"]), 1)
+
+            chunks.update(available_at=retry.created_at)
+            outbox_service.relay_pending()
+
+        sent = sorted(message.to[0] for message in mail.outbox)
+        self.assertEqual(sent, ["p0@x.com", "p1@x.com", "p2@x.com", "p3@x.com"])
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from api.v1.recruitment import models
+from api.v1.recruitment.services import convocatoria_cache
+
+from .utils import create_campaign, create_convocatoria
+
+
+class ExpireConvocatoriasCommandTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        convocatoria_cache.clear_snapshots()
+        self.campaign = create_campaign()
+        past = timezone.now() - timedelta(hours=1)
+        self.due = [
+            create_convocatoria(self.campaign, slug=f"due-{idx}", expires_at=past)
+            for idx in range(3)
+        ]
+        self.open = create_convocatoria(self.campaign, slug="still-open")
+
+    @patch("api.v1.recruitment.services.convocatoria_service.record_audit_many")
+    def test_expires_due_links_in_batches(self, record_audit_many) -> None:
+        convocatoria_cache.get_link_snapshot("due-0")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("expire_convocatorias", batch_size=2, stdout=StringIO())
+
+        estados = dict(models.Link.objects.values_list("slug", "estado"))
+        self.assertEqual(estados["still-open"], models.Link.Estado.ACTIVO)
+        for link in self.due:
+            self.assertEqual(estados[link.slug], models.Link.Estado.EXPIRADO)
+        self.assertEqual(record_audit_many.call_count, 2)
+        audited = [
+            entry["entity_id"]
+            for call in record_audit_many.call_args_list
+            for entry in call.args[0]
+        ]
+        self.assertCountEqual(audited, [str(link.pk) for link in self.due])
+        snapshot = convocatoria_cache.get_link_snapshot("due-0")
+        self.assertEqual(snapshot.estado, models.Link.Estado.EXPIRADO)
@@ -1,8 +1,402 @@
 from __future__ import annotations
 
+import csv
+import gzip
+import hashlib
+import importlib.util
+import io
+import tempfile
 import unittest
+import uuid
+import zipfile
+from datetime import timedelta
+
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from api.v1.recruitment import models
+from api.v1.recruitment.services import export_job_service, export_service
+from api.v1.recruitment.storage import get_storage_client
+from integrations.smart import client as smart_client
+from integrations.smart.client import SmartBatchError, SmartClient
+
+from .utils import create_applicant, create_campaign, create_convocatoria
 
 
 @unittest.skip("Flujo de exportaciones no implementado en el dominio actual")
 class ExportViewSetTests(unittest.TestCase):
     ...
+
+
+class SmartExportTests(APITestCase):
+    def setUp(self) -> None:
+        self.output_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.output_dir.cleanup)
+        override = override_settings(STAFFLINK_EXPORT_OUTPUT_DIR=self.output_dir.name)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.campaign = create_campaign(codigo="CMP1", nombre="Ventas, Lima")
+        self.link = create_convocatoria(self.campaign, periodo="2025-11")
+        create_applicant(self.link, document_number="11111111")
+        create_applicant(
+            self.link,
+            document_number="22222222",
+            apellido_paterno="DE LA CRUZ",
+            nombres_completos="ANA, MARIA",
+        )
+        other = create_convocatoria(
+            create_campaign(codigo="CMP2"), slug="other-link", periodo="2025-12"
+        )
+        create_applicant(other, document_number="33333333")
+
+    def _headers(self, *perms: str) -> dict[str, str]:
+        return {"HTTP_X_STAFFLINK_PERMISSIONS": ",".join(perms)}
+
+    def test_export_writes_quoted_csv_for_campaign(self) -> None:
+        url = reverse("smart-exports-list")
+        response = self.client.post(
+            url,
+            {"campaign_id": str(self.campaign.pk)},
+            format="json",
+            **self._headers("exports.download"),
+        )
+
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assertEqual(data["rows"], 2)
+        self.assertTrue(data["batch_code"].startswith("SMART-CMP1-"))
+        # La API no revela rutas del servidor
+        self.assertNotIn("file_path", data)
+        path = f"{self.output_dir.name}/{data['file_name']}"
+        with open(path, encoding="utf-8", newline="") as handle:
+            rows = list(csv.reader(handle))
+        self.assertIn(["22222222", "DE LA CRUZ USER ANA, MARIA", "Ventas, Lima"], rows)
+        self.assertEqual(len(rows), 2)
+
+    @override_settings(STAFFLINK_SMART_HEADER=True)
+    def test_header_row_is_opt_in(self) -> None:
+        result = export_service.export_smart_batch(campaign_id=self.campaign.pk)
+
+        with open(result.file_path, encoding="utf-8", newline="") as handle:
+            rows = list(csv.reader(handle))
+        self.assertEqual(rows[0], ["document_number", "full_name", "campaign"])
+        client = SmartClient(output_dir=self.output_dir.name)
+        self.assertEqual(client.verify_batch(result.batch_code).rows, 2)
+
+    def test_batches_in_the_same_second_do_not_collide(self) -> None:
+        first = export_service.export_smart_batch(campaign_id=self.campaign.pk)
+        second = export_service.export_smart_batch(campaign_id=self.campaign.pk)
+
+        self.assertNotEqual(first.batch_code, second.batch_code)
+        self.assertNotEqual(first.file_path, second.file_path)
+
+    def test_manifest_matches_written_file(self) -> None:
+        result = export_service.export_smart_batch(campaign_id=self.campaign.pk)
+
+        with open(result.file_path, "rb") as handle:
+            content = handle.read()
+        self.assertEqual(result.bytes, len(content))
+        self.assertEqual(result.sha256, hashlib.sha256(content).hexdigest())
+        client = SmartClient(output_dir=self.output_dir.name)
+        manifest = client.verify_batch(result.batch_code)
+        self.assertEqual(manifest.rows, 2)
+        self.assertIsNone(manifest.compression)
+
+    def test_short_writes_are_completed_before_hashing(self) -> None:
+        class ShortWrites(io.BytesIO):
+            def write(self, data) -> int:
+                return super().write(bytes(data[:3]))
+
+        target = ShortWrites()
+        sink = smart_client._HashingWriter(target)
+        with gzip.GzipFile(fileobj=sink, mode="wb", mtime=0) as stream:
+            stream.write(b"11111111,ANA MARIA\n" * 50)
+
+        content = target.getvalue()
+        self.assertEqual(sink.size, len(content))
+        self.assertEqual(sink.digest.hexdigest(), hashlib.sha256(content).hexdigest())
+        self.assertEqual(gzip.decompress(content), b"11111111,ANA MARIA\n" * 50)
+
+    @override_settings(STAFFLINK_SMART_COMPRESSION="gzip")
+    def test_gzip_batch_verifies_and_detects_truncation(self) -> None:
+        result = export_service.export_smart_batch(periodo="2025-11")
+
+        self.assertTrue(result.file_path.endswith(".csv.gz"))
+        with gzip.open(result.file_path, "rt", encoding="utf-8", newline="") as fh:
+            self.assertEqual(len(list(csv.reader(fh))), 2)
+        client = SmartClient(output_dir=self.output_dir.name)
+        self.assertEqual(client.verify_batch(result.batch_code).rows, 2)
+
+        with open(result.file_path, "r+b") as handle:
+            handle.truncate(result.bytes - 10)
+        with self.assertRaises(SmartBatchError):
+            client.verify_batch(result.batch_code)
+
+    @unittest.skipUnless(
+        importlib.util.find_spec("zstandard"), "zstandard no está instalado"
+    )
+    @override_settings(STAFFLINK_SMART_COMPRESSION="zstd")
+    def test_zstd_batch_round_trip(self) -> None:
+        result = export_service.export_smart_batch(periodo="2025-11")
+
+        self.assertTrue(result.file_path.endswith(".csv.zst"))
+        client = SmartClient(output_dir=self.output_dir.name)
+        self.assertEqual(client.verify_batch(result.batch_code).rows, 2)
+
+    @override_settings(STAFFLINK_SMART_DELTA_LAG_SECONDS=0)
+    def test_incremental_exports_only_changes_since_watermark(self) -> None:
+        def run(code: str):
+            return export_service.export_smart_batch(
+                campaign_id=self.campaign.pk, batch_code=code, incremental=True
+            )
+
+        first = run("D1")
+        self.assertEqual(first.rows, 2)
+        self.assertIsNone(first.since)
+        self.assertEqual(run("D2").rows, 0)
+
+        candidate = models.Candidate.objects.get(numero_documento="11111111")
+        models.CandidateProcess.objects.create(
+            candidate=candidate, status_final="ACTIVO"
+        )
+        third = run("D3")
+        self.assertEqual(third.rows, 1)
+        with open(third.file_path, encoding="utf-8", newline="") as handle:
+            self.assertEqual(list(csv.reader(handle))[0][0], "11111111")
+
+        watermark = models.ExportWatermark.objects.get(
+            target=export_service.smart_target(campaign_id=self.campaign.pk)
+        )
+        self.assertEqual(watermark.last_batch_code, "D3")
+        self.assertEqual(watermark.watermark_at, third.until)
+
+    def test_export_requires_scope_and_permission(self) -> None:
+        url = reverse("smart-exports-list")
+        forbidden = self.client.post(url, {"periodo": "2025-11"}, format="json")
+        self.assertEqual(forbidden.status_code, 403)
+        invalid = self.client.post(
+            url, {}, format="json", **self._headers("exports.download")
+        )
+        self.assertEqual(invalid.status_code, 400)
+
+
+class CandidateGridExportTests(APITestCase):
+    def setUp(self) -> None:
+        self.campaign = create_campaign()
+        self.link = create_convocatoria(self.campaign, grupo="G1")
+        for number in ("11111111", "22222222"):
+            candidate = create_applicant(self.link, document_number=number)
+            models.CandidateProcess.objects.create(
+                candidate=candidate, status_final="ACTIVO"
+            )
+            models.CandidateAssignment.objects.create(
+                candidate=candidate, razon_social="GEA, S.A.C."
+            )
+        other = create_convocatoria(self.campaign, slug="other-link", grupo="G2")
+        create_applicant(other, document_number="33333333")
+        self.headers = {
+            "HTTP_X_STAFFLINK_PERMISSIONS": "candidates.read,exports.download"
+        }
+
+    def test_csv_export_streams_filtered_rows_in_one_query(self) -> None:
+        url = reverse("candidates-export")
+        response = self.client.get(url, {"grupo": "g1"}, **self.headers)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        with self.assertNumQueries(1):
+            body = b"".join(response.streaming_content).decode("utf-8-sig")
+        rows = list(csv.reader(io.StringIO(body)))
+        header = rows[0]
+        self.assertEqual(len(rows), 3)
+        documents = {row[header.index("numero_documento")] for row in rows[1:]}
+        self.assertEqual(documents, {"11111111", "22222222"})
+        self.assertEqual(rows[1][header.index("razon_social")], "GEA, S.A.C.")
+        self.assertEqual(rows[1][header.index("estado_personal")], "ACTIVO")
+
+    def test_csv_export_neutralizes_formulas(self) -> None:
+        models.Candidate.objects.filter(numero_documento="11111111").update(
+            nombres_completos='=HYPERLINK("http://x.test","ver")'
+        )
+        models.CandidateAssignment.objects.update(razon_social="@SUM(1+1)")
+        response = self.client.get(
+            reverse("candidates-export"), {"grupo": "g1"}, **self.headers
+        )
+
+        body = b"".join(response.streaming_content).decode("utf-8-sig")
+        rows = list(csv.reader(io.StringIO(body)))
+        header = rows[0]
+        names = {row[header.index("nombres_completos")] for row in rows[1:]}
+        self.assertIn('\'=HYPERLINK("http://x.test","ver")', names)
+        self.assertEqual(
+            {row[header.index("razon_social")] for row in rows[1:]}, {"'@SUM(1+1)"}
+        )
+        self.assertEqual(export_service.csv_cell(-5), -5)
+
+    def test_xlsx_export_produces_workbook(self) -> None:
+        url = reverse("candidates-export")
+        response = self.client.get(url, {"formato": "xlsx"}, **self.headers)
+
+        self.assertEqual(response.status_code, 200)
+        body = b"".join(response.streaming_content)
+        with zipfile.ZipFile(io.BytesIO(body)) as archive:
+            self.assertIn("xl/workbook.xml", archive.namelist())
+            sheet = archive.read("xl/worksheets/sheet1.xml").decode("utf-8")
+        self.assertIn("33333333", sheet)
+        self.assertEqual(sheet.count("<row "), 4)
+
+    def test_export_rejects_unknown_format(self) -> None:
+        url = reverse("candidates-export")
+        response = self.client.get(url, {"formato": "pdf"}, **self.headers)
+        self.assertEqual(response.status_code, 400)
+
+
+class ExportJobTests(APITestCase):
+    def setUp(self) -> None:
+        self.storage_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.storage_dir.cleanup)
+        override = override_settings(
+            STAFFLINK_STORAGE_BACKEND="local",
+            STAFFLINK_STORAGE_BASE_PATH=self.storage_dir.name,
+            STAFFLINK_EXPORT_JOB_CHUNK_SIZE=2,
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+        get_storage_client.cache_clear()
+        self.addCleanup(get_storage_client.cache_clear)
+
+        self.campaign = create_campaign()
+        self.link = create_convocatoria(self.campaign)
+        for number in ("11111111", "22222222", "33333333", "44444444", "55555555"):
+            create_applicant(self.link, document_number=number)
+        self.user_id = str(uuid.uuid4())
+        self.headers = {
+            "HTTP_X_STAFFLINK_PERMISSIONS": "exports.download,candidates.read",
+            "HTTP_X_STAFFLINK_USER_ID": self.user_id,
+        }
+
+    def _request(self, **filters):
+        return self.client.post(
+            reverse("export-jobs-list"),
+            {"kind": "candidates", **filters},
+            format="json",
+            **self.headers,
+        )
+
+    def test_same_filters_reuse_active_job(self) -> None:
+        first = self._request(campaign_id=str(self.campaign.pk))
+        second = self._request(campaign_id=str(self.campaign.pk))
+        other = self._request(grupo="G9")
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(first.json()["id"], second.json()["id"])
+        self.assertNotEqual(first.json()["id"], other.json()["id"])
+
+    def test_rejects_filters_of_other_kind(self) -> None:
+        response = self._request(periodo="2025-11")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("periodo", response.json())
+
+    def test_candidates_job_requires_candidates_read(self) -> None:
+        self.headers["HTTP_X_STAFFLINK_PERMISSIONS"] = "exports.download"
+        response = self._request(campaign_id=str(self.campaign.pk))
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(models.ExportJob.objects.exists())
+
+    def test_jobs_are_visible_only_to_their_requester(self) -> None:
+        job_id = self._request(campaign_id=str(self.campaign.pk)).json()["id"]
+        other = {**self.headers, "HTTP_X_STAFFLINK_USER_ID": str(uuid.uuid4())}
+        list_url = reverse("export-jobs-list")
+        download_url = reverse("export-jobs-download", args=[job_id])
+
+        self.assertEqual(self.client.get(list_url, **other).json()["count"], 0)
+        self.assertEqual(self.client.get(download_url, **other).status_code, 404)
+        # La misma firma pedida por otro usuario es un job propio
+        again = self.client.post(
+            list_url,
+            {"kind": "candidates", "campaign_id": str(self.campaign.pk)},
+            format="json",
+            **other,
+        )
+        self.assertEqual(again.status_code, 201)
+        self.assertNotEqual(again.json()["id"], job_id)
+
+        admin = {
+            **other,
+            "HTTP_X_STAFFLINK_PERMISSIONS": "exports.download,exports.manage",
+        }
+        self.assertEqual(self.client.get(list_url, **admin).json()["count"], 2)
+
+    def test_stale_worker_stops_at_next_checkpoint(self) -> None:
+        job_id = self._request(campaign_id=str(self.campaign.pk)).json()["id"]
+        stale = export_job_service.claim_next_job()
+        models.ExportJob.objects.filter(pk=job_id).update(
+            heartbeat_at=timezone.now() - timedelta(hours=1)
+        )
+        current = export_job_service.claim_next_job()
+
+        self.assertFalse(export_job_service.process_job(stale))
+        current.refresh_from_db()
+        self.assertEqual(current.parts, 0)
+        self.assertEqual(current.status, models.ExportJob.Status.EN_PROCESO)
+        self.assertTrue(export_job_service.process_job(current))
+        current.refresh_from_db()
+        self.assertEqual(current.rows_written, 5)
+
+    def test_smart_job_is_limited_to_own_convocatorias(self) -> None:
+        own = create_convocatoria(
+            self.campaign, slug="propia", owner_id=uuid.UUID(self.user_id)
+        )
+        create_applicant(own, document_number="99999999")
+        self.headers["HTTP_X_STAFFLINK_PERMISSIONS"] = "exports.download"
+        response = self.client.post(
+            reverse("export-jobs-list"),
+            {"kind": "smart", "campaign_id": str(self.campaign.pk)},
+            format="json",
+            **self.headers,
+        )
+        self.assertEqual(response.status_code, 201)
+        job = models.ExportJob.objects.get(pk=response.json()["id"])
+        self.assertEqual(str(job.owner_id), self.user_id)
+
+        self.assertEqual(export_job_service.run_pending(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, models.ExportJob.Status.COMPLETADO)
+        self.assertEqual(job.rows_written, 1)
+
+    def test_worker_resumes_from_checkpoint_and_download_streams_result(self) -> None:
+        job_id = self._request(campaign_id=str(self.campaign.pk)).json()["id"]
+        download_url = reverse("export-jobs-download", args=[job_id])
+        self.assertEqual(
+            self.client.get(download_url, **self.headers).status_code, 409
+        )
+
+        job = export_job_service.claim_next_job()
+        self.assertFalse(export_job_service.process_job(job, max_chunks=1))
+        # Simula un worker caído: el lease venció y otro worker retoma el job
+        models.ExportJob.objects.filter(pk=job_id).update(
+            heartbeat_at=timezone.now() - timedelta(hours=1)
+        )
+        resumed = export_job_service.claim_next_job()
+        self.assertEqual(str(resumed.pk), job_id)
+        self.assertEqual(resumed.parts, 1)
+        self.assertEqual(resumed.attempts, 2)
+        self.assertTrue(export_job_service.process_job(resumed))
+
+        resumed.refresh_from_db()
+        self.assertEqual(resumed.status, models.ExportJob.Status.COMPLETADO)
+        self.assertEqual(resumed.rows_written, 5)
+        self.assertEqual(resumed.parts, 3)
+
+        response = self.client.get(download_url, **self.headers)
+        self.assertEqual(response.status_code, 200)
+        body = b"".join(response.streaming_content).decode("utf-8-sig")
+        rows = list(csv.reader(io.StringIO(body)))
+        header = rows[0]
+        documents = [row[header.index("numero_documento")] for row in rows[1:]]
+        self.assertEqual(sorted(documents), sorted(set(documents)))
+        self.assertEqual(len(documents), 5)
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from api.v1.recruitment import models
+from api.v1.recruitment.services import candidate_service
+from api.v1.recruitment.services.exceptions import CandidateError
+
+from .utils import create_campaign, create_convocatoria
+
+
+class LinkCounterTests(TestCase):
+    def setUp(self) -> None:
+        self.campaign = create_campaign()
+        self.link = create_convocatoria(self.campaign, slug="counter-link")
+
+    def _create(self, numero: str, link: models.Link | None = None) -> models.Candidate:
+        return candidate_service.create_candidate(
+            link=link or self.link,
+            data={
+                "tipo_documento": "dni",
+                "numero_documento": numero,
+                "apellido_paterno": "PEREZ",
+                "nombres_completos": "JUAN PEREZ",
+                "telefono": "999888777",
+                "email": "juan@example.com",
+            },
+            actor_id=None,
+        )
+
+    def test_service_writes_keep_counters_in_sync(self) -> None:
+        first = self._create("11111111")
+        self._create("22222222")
+        candidate_service.update_documents(
+            candidate=first, data={"status": models.CandidateDocuments.Status.COMPLETO}
+        )
+
+        counter = models.LinkCounter.objects.get(link=self.link)
+        self.assertEqual(counter.postulantes, 2)
+        self.assertEqual(counter.completos, 1)
+        self.assertIsNotNone(counter.ultima_postulacion_at)
+
+        other = create_convocatoria(self.campaign, slug="other-counter-link")
+        candidate_service.update_candidate(
+            candidate=first, data={"link": other}, actor_id=None
+        )
+        counter.refresh_from_db()
+        self.assertEqual((counter.postulantes, counter.completos), (1, 0))
+        moved = models.LinkCounter.objects.get(link=other)
+        self.assertEqual((moved.postulantes, moved.completos), (1, 1))
+
+        candidate_service.delete_candidate(candidate=first)
+        moved.refresh_from_db()
+        self.assertEqual((moved.postulantes, moved.completos), (0, 0))
+
+    @override_settings(STAFFLINK_CUOTAS_AUTO_EXPIRE=True)
+    def test_moving_into_a_full_convocatoria_is_rejected(self) -> None:
+        candidate = self._create("11111111")
+        full = create_convocatoria(self.campaign, slug="full-link", cuotas=2)
+        self._create("22222222", link=full)
+
+        candidate_service.update_candidate(
+            candidate=candidate, data={"link": full}, actor_id=None
+        )
+        full.refresh_from_db()
+        self.assertEqual(models.LinkCounter.objects.get(link=full).postulantes, 2)
+        self.assertEqual(full.estado, models.Link.Estado.EXPIRADO)
+
+        other = self._create("33333333")
+        with self.assertRaises(CandidateError):
+            candidate_service.update_candidate(
+                candidate=other, data={"link": full}, actor_id=None
+            )
+        other.refresh_from_db()
+        self.assertEqual(other.link_id, self.link.pk)
+        self.assertEqual(models.LinkCounter.objects.get(link=full).postulantes, 2)
+        self.assertEqual(models.LinkCounter.objects.get(link=self.link).postulantes, 1)
+
+    def test_reconcile_command_recomputes_counters(self) -> None:
+        candidate = self._create("11111111")
+        candidate_service.update_documents(
+            candidate=candidate,
+            data={"status": models.CandidateDocuments.Status.COMPLETO},
+        )
+        empty_link = create_convocatoria(self.campaign, slug="empty-link")
+        models.LinkCounter.objects.filter(link=self.link).update(
+            postulantes=7, completos=0
+        )
+
+        call_command("reconcile_link_counters", batch_size=1, stdout=StringIO())
+
+        counter = models.LinkCounter.objects.get(link=self.link)
+        self.assertEqual((counter.postulantes, counter.completos), (1, 1))
+        self.assertEqual(counter.ultima_postulacion_at, candidate.created_at)
+        empty = models.LinkCounter.objects.get(link=empty_link)
+        self.assertEqual((empty.postulantes, empty.completos), (0, 0))
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from integrations.storage import local
+from integrations.storage.base import CHUNK_SIZE, StorageError
+from integrations.storage.local import LocalStorageClient, ObjectTooLargeError
+
+
+class _Broken(io.BytesIO):
+    def read(self, size=-1):
+        data = super().read(size)
+        if self.tell() > CHUNK_SIZE:
+            raise ConnectionResetError("cliente desconectado")
+        return data
+
+
+class LocalStorageClientTests(SimpleTestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.storage = LocalStorageClient(str(self.root / "uploads"))
+        self.payload = os.urandom(CHUNK_SIZE * 2 + 123)
+
+    def test_streams_in_chunks_and_reports_size_and_hash(self) -> None:
+        source = io.BytesIO(self.payload)
+        with mock.patch.object(source, "read", wraps=source.read) as read:
+            stored = self.storage.save_file(
+                source, destination="docs/cv.pdf", content_type="application/pdf"
+            )
+
+        self.assertTrue(all(call.args == (CHUNK_SIZE,) for call in read.call_args_list))
+        self.assertEqual(stored.size, len(self.payload))
+        self.assertEqual(stored.sha256, hashlib.sha256(self.payload).hexdigest())
+        self.assertEqual(Path(stored.path).read_bytes(), self.payload)
+
+    def test_real_files_use_kernel_copy_from_current_offset(self) -> None:
+        source_path = self.root / "upload.tmp"
+        source_path.write_bytes(b"HEADER" + self.payload)
+        kernel_copy = mock.Mock(wraps=local._kernel_copy)
+        with source_path.open("rb") as source, mock.patch.object(
+            local, "_kernel_copy", kernel_copy
+        ):
+            source.read(6)
+            path = self.storage.save(
+                source, destination="docs/dni.pdf", content_type="application/pdf"
+            )
+            self.assertEqual(source.read(), b"")
+
+        kernel_copy.assert_called_once()
+        self.assertEqual(Path(path).read_bytes(), self.payload)
+        with open(path, "rb") as copy:
+            stored = self.storage.save_file(
+                copy, destination="copia.pdf", content_type="x"
+            )
+        self.assertEqual(stored.sha256, hashlib.sha256(self.payload).hexdigest())
+
+    def test_failed_copy_keeps_previous_file_and_leaves_no_temp(self) -> None:
+        self.storage.save(
+            io.BytesIO(b"version 1"), destination="docs/cv.pdf", content_type="x"
+        )
+        with self.assertRaises(StorageError):
+            self.storage.save(
+                _Broken(self.payload), destination="docs/cv.pdf", content_type="x"
+            )
+
+        folder = self.root / "uploads" / "docs"
+        self.assertEqual(os.listdir(folder), ["cv.pdf"])
+        self.assertEqual((folder / "cv.pdf").read_bytes(), b"version 1")
+
+    def test_saved_files_follow_the_process_umask(self) -> None:
+        with mock.patch.object(local, "FILE_MODE", 0o640):
+            path = self.storage.save(
+                io.BytesIO(b"privado"), destination="docs/dni.pdf", content_type="x"
+            )
+
+        self.assertEqual(os.stat(path).st_mode & 0o777, 0o640)
+        self.assertEqual(local.FILE_MODE, 0o666 & ~local._current_umask())
+
+    def test_put_object_stops_copying_past_max_size(self) -> None:
+        source = io.BytesIO(self.payload)
+        with self.assertRaises(ObjectTooLargeError):
+            self.storage.put_object(
+                source, destination="docs/grande.bin", max_size=CHUNK_SIZE
+            )
+        self.assertEqual(source.tell(), CHUNK_SIZE + 1)
+
+        real = self.root / "upload.tmp"
+        real.write_bytes(self.payload)
+        with real.open("rb") as handle, self.assertRaises(ObjectTooLargeError):
+            self.storage.put_object(
+                handle, destination="docs/grande.bin", max_size=CHUNK_SIZE
+            )
+        self.assertEqual(os.listdir(self.root / "uploads" / "docs"), [])
+
+        stored = self.storage.put_object(
+            io.BytesIO(self.payload),
+            destination="docs/grande.bin",
+            max_size=len(self.payload),
+        )
+        self.assertEqual(stored.size, len(self.payload))
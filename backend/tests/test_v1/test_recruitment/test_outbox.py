@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import uuid
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from api.v1.recruitment import models, signals
+from api.v1.recruitment.services import candidate_service, outbox_service
+from api.v1.recruitment.services.exceptions import CandidateError
+
+from .utils import create_campaign, create_convocatoria
+
+CANDIDATE = {
+    "tipo_documento": "dni",
+    "numero_documento": "11111111",
+    "apellido_paterno": "PEREZ",
+    "nombres_completos": "JUAN PEREZ",
+    "telefono": "999888777",
+    "email": "juan@example.com",
+}
+
+
+class OutboxTests(TestCase):
+    def setUp(self) -> None:
+        self.link = create_convocatoria(create_campaign(), slug="outbox-link")
+        self.actor_id = str(uuid.uuid4())
+        self.received: list[models.OutboxEvent] = []
+
+    def _register(self, handler, *event_types: str) -> None:
+        signals.register_handler(*event_types)(handler)
+        self.addCleanup(signals.unregister_handler, handler)
+
+    def test_events_are_written_with_the_mutation(self) -> None:
+        candidate = candidate_service.create_candidate(
+            link=self.link, data=dict(CANDIDATE), actor_id=self.actor_id
+        )
+        candidate_service.bulk_update_process(
+            candidate_ids=[candidate.pk],
+            data={"estado_dia0": "APROBADO"},
+            actor_id=self.actor_id,
+        )
+        with self.assertRaises(CandidateError):
+            candidate_service.create_candidate(
+                link=self.link, data=dict(CANDIDATE), actor_id=self.actor_id
+            )
+
+        events = list(models.OutboxEvent.objects.values_list("event_type", flat=True))
+        self.assertEqual(events, ["candidate.create", "candidate.process"])
+        created = models.OutboxEvent.objects.get(event_type="candidate.create")
+        self.assertEqual(created.aggregate_type, "candidate")
+        self.assertEqual(created.aggregate_id, str(candidate.pk))
+        self.assertEqual(created.payload["link"], str(self.link.pk))
+        self.assertEqual(created.payload["actor_id"], self.actor_id)
+
+    def test_relay_dispatches_to_matching_handlers_once(self) -> None:
+        self._register(self.received.append, "candidate.*")
+        outbox_service.publish_event("candidate.update", "a", {"x": 1})
+        outbox_service.publish_event("convocatoria.status", "b")
+
+        result = outbox_service.relay_pending(batch_size=1)
+
+        self.assertEqual(result.published, 2)
+        self.assertEqual([e.aggregate_id for e in self.received], ["a"])
+        self.assertFalse(
+            models.OutboxEvent.objects.exclude(
+                status=models.OutboxEvent.Status.PUBLICADO
+            ).exists()
+        )
+        self.assertEqual(outbox_service.relay_pending().total, 0)
+
+    @override_settings(STAFFLINK_OUTBOX_MAX_ATTEMPTS=2)
+    def test_failing_handler_backs_off_then_gives_up(self) -> None:
+        def broken(event: models.OutboxEvent) -> None:
+            raise RuntimeError("smart caído")
+
+        self._register(broken, "candidate.update")
+        event = outbox_service.publish_event("candidate.update", "a")
+
+        self.assertEqual(outbox_service.relay_batch().retried, 1)
+        event.refresh_from_db()
+        self.assertEqual(event.status, models.OutboxEvent.Status.PENDIENTE)
+        self.assertIn("smart caído", event.last_error)
+        # Aún en backoff: el siguiente ciclo no lo toma
+        self.assertEqual(outbox_service.relay_batch().total, 0)
+
+        models.OutboxEvent.objects.update(available_at=event.created_at)
+        out = StringIO()
+        call_command("relay_outbox", "--once", stdout=out)
+        event.refresh_from_db()
+        self.assertEqual(event.status, models.OutboxEvent.Status.FALLIDO)
+        self.assertEqual(event.attempts, 2)
+        self.assertIn("fallidos: 1", out.getvalue())
+
+    def test_claimed_events_are_leased_while_handlers_run(self) -> None:
+        nested: list[int] = []
+        self._register(
+            lambda event: nested.append(outbox_service.relay_batch().total),
+            "candidate.update",
+        )
+        outbox_service.publish_event("candidate.update", "a")
+
+        self.assertEqual(outbox_service.relay_batch().published, 1)
+        # Otro relay que corre mientras tanto no toma el evento reclamado
+        self.assertEqual(nested, [0])
+
+    def test_outcome_is_not_recorded_after_losing_the_lease(self) -> None:
+        def reclaimed(event: models.OutboxEvent) -> None:
+            models.OutboxEvent.objects.filter(pk=event.pk).update(
+                available_at=event.created_at
+            )
+
+        self._register(reclaimed, "candidate.update")
+        event = outbox_service.publish_event("candidate.update", "a")
+
+        self.assertEqual(outbox_service.relay_batch().published, 0)
+        event.refresh_from_db()
+        self.assertEqual(event.status, models.OutboxEvent.Status.PENDIENTE)
@@ -2,17 +2,21 @@ from __future__ import annotations
 
 from datetime import timedelta
 
+from django.core.cache import cache
 from django.utils import timezone
 from rest_framework.reverse import reverse
 from rest_framework.test import APITestCase
 
 from api.v1.recruitment import models
+from api.v1.recruitment.services import convocatoria_cache, convocatoria_service
 
 from .utils import create_campaign, create_convocatoria
 
 
 class PublicFlowTests(APITestCase):
     def setUp(self) -> None:
+        cache.clear()
+        convocatoria_cache.clear_snapshots()
         self.campaign = create_campaign()
         self.link = create_convocatoria(
             self.campaign,
@@ -43,6 +47,45 @@ class PublicFlowTests(APITestCase):
         self.assertEqual(data["slug"], self.link.slug)
         self.assertEqual(data["titulo"], self.link.titulo)
 
+    def test_public_link_sends_cache_headers(self) -> None:
+        url = reverse(
+            "public:public-convocatoria", kwargs={"slug": self.link.slug}
+        )
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("public", response["Cache-Control"])
+        self.assertIn("max-age=", response["Cache-Control"])
+        etag = response["ETag"]
+
+        cached = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached["ETag"], etag)
+
+    def test_public_link_cache_invalidated_on_update(self) -> None:
+        url = reverse(
+            "public:public-convocatoria", kwargs={"slug": self.link.slug}
+        )
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            convocatoria_service.update_convocatoria(
+                convocatoria=self.link,
+                data={"titulo": "Nuevo título"},
+                actor_id=None,
+            )
+        response = self.client.get(url)
+        self.assertEqual(response.json()["titulo"], "Nuevo título")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            convocatoria_service.set_status(
+                convocatoria=self.link,
+                estado=models.Link.Estado.REVOCADO,
+                actor_id=None,
+            )
+        self.assertEqual(self.client.get(url).status_code, 404)
+
     def test_create_candidate_with_valid_link(self) -> None:
         url = reverse("public:public-candidate")
         payload = {
@@ -62,6 +105,54 @@ class PublicFlowTests(APITestCase):
         self.assertEqual(data["numero_documento"], "87654321")
         self.assertIn("id", data)
 
+    def test_link_snapshot_reused_until_convocatoria_changes(self) -> None:
+        with self.assertNumQueries(1):
+            convocatoria_cache.get_link_snapshot(self.link.slug)
+            snapshot = convocatoria_cache.get_link_snapshot(self.link.slug)
+        self.assertEqual(snapshot.pk, self.link.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            convocatoria_service.set_status(
+                convocatoria=self.link,
+                estado=models.Link.Estado.REVOCADO,
+                actor_id=None,
+            )
+        url = reverse("public:public-candidate")
+        payload = {
+            "convocatoria_slug": self.link.slug,
+            "tipo_documento": models.Candidate.DocumentType.DNI,
+            "numero_documento": "87654321",
+            "apellido_paterno": "LOPEZ",
+            "nombres_completos": "MARIA LOPEZ",
+            "telefono": "999000111",
+            "email": "maria@example.com",
+        }
+        resp = self.client.post(url, payload, format="json")
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("convocatoria_slug", resp.json())
+
+    def test_create_candidate_rejected_when_cuotas_full(self) -> None:
+        limited = create_convocatoria(self.campaign, slug="limited-link", cuotas=1)
+        url = reverse("public:public-candidate")
+        base = {
+            "convocatoria_slug": limited.slug,
+            "tipo_documento": models.Candidate.DocumentType.DNI,
+            "apellido_paterno": "LOPEZ",
+            "nombres_completos": "MARIA LOPEZ",
+            "telefono": "999000111",
+            "email": "maria@example.com",
+        }
+        first = self.client.post(
+            url, {**base, "numero_documento": "11111111"}, format="json"
+        )
+        self.assertEqual(first.status_code, 201)
+        second = self.client.post(
+            url, {**base, "numero_documento": "22222222"}, format="json"
+        )
+        self.assertEqual(second.status_code, 400)
+        self.assertEqual(limited.candidates.count(), 1)
+        self.assertEqual(models.LinkCounter.objects.get(link=limited).postulantes, 1)
+
     def test_create_candidate_with_invalid_link(self) -> None:
         url = reverse("public:public-candidate")
         payload = {
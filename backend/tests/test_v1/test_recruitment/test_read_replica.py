@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import uuid
+from unittest import mock
+
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from rest_framework.reverse import reverse
+
+from api.shared import db_routing
+from api.v1.recruitment import models
+
+from .utils import create_campaign, create_convocatoria
+
+
+@mock.patch.object(db_routing, "replica_configured", return_value=True)
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self) -> None:
+        self.router = db_routing.ReplicaRouter()
+
+    def test_reads_go_to_the_replica_only_inside_read_replica(self, _) -> None:
+        self.assertIsNone(self.router.db_for_read(models.Candidate))
+        with db_routing.read_replica() as alias:
+            self.assertEqual(alias, "replica")
+            self.assertEqual(self.router.db_for_read(models.Candidate), "replica")
+            self.assertEqual(self.router.db_for_write(models.Candidate), "default")
+        self.assertIsNone(self.router.db_for_read(models.Candidate))
+        self.assertFalse(self.router.allow_migrate("replica", "recruitment"))
+
+    def test_pinned_requests_and_transactions_read_the_primary(self, _) -> None:
+        with db_routing.pin_primary(), db_routing.read_replica():
+            self.assertEqual(self.router.db_for_read(models.Candidate), "default")
+        with mock.patch.object(
+            db_routing.connections["default"], "in_atomic_block", True
+        ):
+            self.assertEqual(db_routing.read_db(), "default")
+
+    def test_middleware_pins_after_a_write(self, _) -> None:
+        seen: list[str] = []
+
+        def view(request):
+            seen.append(db_routing.read_db())
+            return HttpResponse(status=200)
+
+        middleware = db_routing.ReplicaStickinessMiddleware(view)
+        factory = RequestFactory()
+
+        first = middleware(factory.get("/"))
+        self.assertNotIn("stafflink_read_primary", first.cookies)
+
+        written = middleware(factory.patch("/"))
+        cookie = written.cookies["stafflink_read_primary"]
+        self.assertEqual(cookie["max-age"], 15)
+        self.assertTrue(cookie["httponly"])
+
+        request = factory.get("/")
+        request.COOKIES["stafflink_read_primary"] = "1"
+        middleware(request)
+        middleware(factory.get("/", HTTP_X_STAFFLINK_READ_PRIMARY="1"))
+
+        self.assertEqual(seen, ["replica", "replica", "default", "default"])
+
+
+class ReplicaNotConfiguredTests(TestCase):
+    def test_listings_use_the_primary_without_a_replica(self) -> None:
+        create_convocatoria(create_campaign())
+        self.assertEqual(db_routing.read_db(), "default")
+        with db_routing.read_replica():
+            self.assertEqual(models.Link.objects.count(), 1)
+
+    def test_successful_write_sets_the_sticky_cookie(self) -> None:
+        owner_id = uuid.uuid4()
+        link = create_convocatoria(create_campaign(), owner_id=owner_id)
+        headers = {
+            "HTTP_X_STAFFLINK_PERMISSIONS": "convocatorias.read,convocatorias.close",
+            "HTTP_X_STAFFLINK_USER_ID": str(owner_id),
+        }
+        response = self.client.post(
+            reverse("convocatorias-expire", args=[link.pk]), **headers
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertIn("stafflink_read_primary", response.cookies)
+
+        listing = self.client.get(reverse("convocatorias-list"), **headers)
+        self.assertEqual(listing.status_code, 200)
+        self.assertNotIn("stafflink_read_primary", listing.cookies)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import io
+import unittest
+
+from django.test import SimpleTestCase
+
+from integrations.storage.base import StorageError
+from integrations.storage.s3 import MIB, S3StorageClient
+
+HAS_MOTO = all(importlib.util.find_spec(name) is not None for name in ("boto3", "moto"))
+
+
+class S3StorageClientTests(SimpleTestCase):
+    def test_keys_are_prefixed_once(self) -> None:
+        storage = S3StorageClient("/uploads/", bucket="stafflink")
+        self.assertEqual(
+            storage.key("exports/1/part.csv"), "uploads/exports/1/part.csv"
+        )
+        self.assertEqual(storage.key("uploads/a.pdf"), "uploads/a.pdf")
+        self.assertEqual(S3StorageClient("", bucket="b").key("/a.pdf"), "a.pdf")
+        with self.assertRaises(StorageError):
+            S3StorageClient("", bucket="")
+
+    @unittest.skipIf(
+        importlib.util.find_spec("boto3") is not None, "boto3 está instalado"
+    )
+    def test_missing_boto3_is_reported_as_storage_error(self) -> None:
+        storage = S3StorageClient("", bucket="stafflink")
+        with self.assertRaisesMessage(StorageError, "boto3"):
+            storage.save(io.BytesIO(b"x"), destination="a", content_type="text/plain")
+
+
+@unittest.skipUnless(HAS_MOTO, "requiere boto3 y moto")
+class S3StorageMotoTests(SimpleTestCase):
+    def setUp(self) -> None:
+        from moto import mock_aws
+
+        mock = mock_aws()
+        mock.start()
+        self.addCleanup(mock.stop)
+        self.storage = S3StorageClient(
+            "uploads", bucket="stafflink", region="us-east-1", part_size=5 * MIB
+        )
+        self.storage.client.create_bucket(Bucket="stafflink")
+
+    def test_large_files_are_uploaded_in_parts_and_streamed_back(self) -> None:
+        payload = bytes(range(256)) * (12 * MIB // 256)
+        key = self.storage.save(
+            io.BytesIO(payload), destination="docs/big.bin", content_type="x/bin"
+        )
+
+        self.assertEqual(key, "uploads/docs/big.bin")
+        head = self.storage.client.head_object(Bucket="stafflink", Key=key)
+        self.assertTrue(head["ETag"].strip('"').endswith("-3"))
+        self.assertEqual(head["ContentType"], "x/bin")
+        with self.storage.open("docs/big.bin") as handle:
+            self.assertEqual(handle.read(), payload)
+
+        self.storage.delete("docs/big.bin")
+        with self.assertRaises(StorageError):
+            self.storage.open("docs/big.bin")
+
+    def test_presigned_put_signs_the_checksum_that_describe_reads_back(self) -> None:
+        content = b"%PDF-1.7 directo"
+        sha256 = hashlib.sha256(content).hexdigest()
+        request = self.storage.presigned_put(
+            "docs/a.pdf", content_type="application/pdf", expires_in=60, sha256=sha256
+        )
+
+        self.assertEqual(request.method, "PUT")
+        self.assertIn("x-amz-checksum-sha256", request.headers)
+        self.assertIn("uploads/docs/a.pdf", request.url)
+
+        self.storage.client.put_object(
+            Bucket="stafflink",
+            Key="uploads/docs/a.pdf",
+            Body=content,
+            ChecksumSHA256=request.headers["x-amz-checksum-sha256"],
+        )
+        stored = self.storage.describe("docs/a.pdf")
+        self.assertEqual((stored.size, stored.sha256), (len(content), sha256))
+        self.assertIn(
+            "response-content-disposition",
+            self.storage.presigned_get_url("docs/a.pdf", expires_in=60, filename="a"),
+        )